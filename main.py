@@ -1,15 +1,21 @@
 from src.research_tool import ResearchTool
 from src.data_loader import YahooFinanceLoader
+from src.financials_cache import FinancialsCache
+from src.price_cache import PriceCache
 
 
 if __name__ == "__main__":
 
-    universe = YahooFinanceLoader.get_top_n_by_marketcap(500, verbose=True, ttl_days=0)
+    universe = YahooFinanceLoader.get_top_n_by_marketcap(
+        500, verbose=True, ttl_days=0, constituents_ttl_days=1
+    )
     print("\nSelected universe:")
     print(universe)
 
-    tool = ResearchTool(universe)
-    tool.load()
+    tool = ResearchTool(
+        universe, financials_cache=FinancialsCache(), price_cache=PriceCache()
+    )
+    tool.load(max_workers=8, timeout=60, batch_kpis=True)
     tool.evaluate()
     tool.export_xlsx("investment_research.xlsx")
 
@@ -1,36 +1,75 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-import yfinance as yf
+import numpy as np
 import pandas as pd
 
+from src.data_loader import YahooFinanceLoader
+from src.data_source import DataSource
+from src.http_session import HttpClient
 from src.models.stock import Stock
+from src.price_cache import PriceCache
+from src.price_store import PriceStore
 
 
 class Backtester:
 
     @staticmethod
     def returns(ticker: str, start: str, end: str) -> pd.Series:
-        hist = yf.Ticker(ticker).history(start=start, end=end)
+        stock = HttpClient.yf_ticker(ticker)
+        hist = HttpClient.yf_call(lambda: stock.history(start=start, end=end))
         return hist["Close"].pct_change().dropna()
 
     @staticmethod
-    def backtest(stocks: List[Stock], index: str = "^GSPC") -> Dict:
+    def returns_frame(
+        tickers: List[str],
+        start: str,
+        end: str,
+        cache: PriceCache | PriceStore | None = None,
+        source: DataSource | None = None,
+    ) -> pd.DataFrame:
+        """Daily returns for many tickers as one wide DataFrame (dates x tickers).
+
+        Prices come from `source` when given, otherwise from a single bulk
+        Yahoo request (see `YahooFinanceLoader.load_prices`); dates where a
+        ticker has no data are NaN.
+        """
+        if source is not None:
+            prices = source.prices(tickers, start, end)
+        else:
+            prices = YahooFinanceLoader.load_prices(tickers, start, end, cache=cache)
+        return prices.pct_change(fill_method=None).dropna(how="all")
+
+    @staticmethod
+    def backtest(
+        stocks: List[Stock],
+        index: str = "^GSPC",
+        cache: PriceCache | PriceStore | None = None,
+        source: DataSource | None = None,
+    ) -> Dict:
         top = sorted(stocks, key=lambda s: s.score, reverse=True)[:10]
         # Collect returns per ticker, skipping tickers with no data and warning
         import warnings
 
+        tickers = [s.ticker for s in top]
+        try:
+            frame = Backtester.returns_frame(
+                tickers + [index],
+                "2019-01-01",
+                "2024-01-01",
+                cache=cache,
+                source=source,
+            )
+        except Exception as e:
+            warnings.warn(f"error retrieving returns; backtest has no data ({e})")
+            frame = pd.DataFrame()
+
         columns = {}
-        for s in top:
-            try:
-                r = Backtester.returns(s.ticker, "2019-01-01", "2024-01-01")
-                if r.empty:
-                    warnings.warn(
-                        f"{s.ticker}: no price data found; skipping from backtest"
-                    )
-                    continue
-                columns[s.ticker] = r
-            except Exception as e:
-                warnings.warn(f"{s.ticker}: error retrieving returns; skipping ({e})")
+        for t in tickers:
+            r = frame[t].dropna() if t in frame else pd.Series(dtype=float)
+            if r.empty:
+                warnings.warn(f"{t}: no price data found; skipping from backtest")
+                continue
+            columns[t] = r
 
         if not columns:
             warnings.warn(
@@ -44,7 +83,7 @@ class Backtester:
         df = df.dropna(axis=1, how="all")
 
         portfolio = df.mean(axis=1)
-        index_ret = Backtester.returns(index, "2019-01-01", "2024-01-01")
+        index_ret = frame[index].dropna() if index in frame else pd.Series(dtype=float)
 
         # Use geometric (cumulative product) approach to compute annualized CAGR
         n_port = len(portfolio)
@@ -65,6 +104,33 @@ class Backtester:
             "index_cagr": float(index_cagr),
         }
 
+    @staticmethod
+    def portfolio_metrics(
+        returns: pd.DataFrame, risk_free: float = 0.0
+    ) -> pd.DataFrame:
+        """Metrics for many return series at once (dates x portfolios).
+
+        Column-wise equivalent of the single-series helpers below: CAGR as in
+        `backtest`, `annualized_volatility`, `sharpe_ratio` and
+        `max_drawdown` (from returns). NaN days are skipped per column.
+        Returns one row per portfolio.
+        """
+        n = returns.count()
+        growth = (1 + returns).prod()
+        cagr = (growth ** (252 / n) - 1).where(n > 0)
+        vol = (returns.std(ddof=0) * (252**0.5)).where(n > 0)
+        sharpe = ((returns.mean() * 252 - risk_free) / vol).where(vol != 0)
+        wealth = (1 + returns.fillna(0.0)).cumprod().where(returns.notna())
+        drawdown = -(wealth / wealth.cummax() - 1).min()
+        return pd.DataFrame(
+            {
+                "cagr": cagr,
+                "volatility": vol,
+                "sharpe": sharpe,
+                "max_drawdown": drawdown.where(n > 0),
+            }
+        )
+
     @staticmethod
     def cumulative_returns(returns: pd.Series) -> pd.Series:
         """Convert a returns series to cumulative returns (decimal).
@@ -110,3 +176,149 @@ class Backtester:
         drawdowns = (1 + cum) / running_max - 1
         max_dd = drawdowns.min()
         return float(-max_dd)
+
+    @staticmethod
+    def _check_window(window: int | None) -> None:
+        if window is not None and window < 1:
+            raise ValueError(f"window must be None or at least 1, got {window}")
+
+    @staticmethod
+    def _window_sums(values: np.ndarray, window: int | None) -> np.ndarray:
+        """Trailing column sums over `window` rows (all rows so far if None)."""
+        sums = np.cumsum(values, axis=0)
+        if window is not None and window < len(sums):
+            sums[window:] = sums[window:] - sums[:-window]
+        return sums
+
+    @staticmethod
+    def _rolling_moments(
+        returns: pd.DataFrame, window: int | None, min_periods: int | None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Trailing mean and population variance of every column.
+
+        Computed from cumulative sums in O(dates x columns) whatever the
+        window. Columns are centered first to limit cancellation, and
+        variances within rounding noise of zero are set to exactly 0.
+        NaN returns are skipped; windows with fewer than `min_periods`
+        returns are NaN.
+        """
+        Backtester._check_window(window)
+        x = returns.to_numpy(dtype=float)
+        valid = np.isfinite(x)
+        count = valid.sum(axis=0)
+        center = np.where(valid, x, 0.0).sum(axis=0) / np.maximum(count, 1)
+        centered = np.where(valid, x - center, 0.0)
+        squares = centered**2
+
+        n = Backtester._window_sums(valid.astype(float), window)
+        s1 = Backtester._window_sums(centered, window)
+        s2 = Backtester._window_sums(squares, window)
+        noise = 1e3 * np.finfo(float).eps * np.cumsum(squares, axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = s1 / n
+            var = s2 / n - mean**2
+            var = np.where(var * n > noise, var, 0.0)
+        if min_periods is None:
+            min_periods = 1 if window is None else window
+        enough = n >= max(min_periods, 1)
+        return (
+            np.where(enough, mean + center, np.nan),
+            np.where(enough, var, np.nan),
+        )
+
+    @staticmethod
+    def rolling_volatility(
+        returns: pd.DataFrame, window: int | None = 63, min_periods: int | None = None
+    ) -> pd.DataFrame:
+        """Trailing `annualized_volatility` of every column (dates x columns).
+
+        `window` is in trading days; `None` gives the expanding version.
+        `min_periods` defaults to the full window (1 when expanding).
+        """
+        _, var = Backtester._rolling_moments(returns, window, min_periods)
+        vol = np.sqrt(var) * (252**0.5)
+        return pd.DataFrame(vol, index=returns.index, columns=returns.columns)
+
+    @staticmethod
+    def rolling_sharpe(
+        returns: pd.DataFrame,
+        window: int | None = 63,
+        risk_free: float = 0.0,
+        min_periods: int | None = None,
+    ) -> pd.DataFrame:
+        """Trailing `sharpe_ratio` of every column; NaN where volatility is 0."""
+        mean, var = Backtester._rolling_moments(returns, window, min_periods)
+        vol = np.sqrt(var) * (252**0.5)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sharpe = np.where(vol > 0, (mean * 252 - risk_free) / vol, np.nan)
+        return pd.DataFrame(sharpe, index=returns.index, columns=returns.columns)
+
+    @staticmethod
+    def rolling_max_drawdown(
+        returns: pd.DataFrame,
+        window: int | None = 252,
+        min_periods: int | None = None,
+    ) -> pd.DataFrame:
+        """Trailing `max_drawdown` (from returns) of every column.
+
+        The expanding version (`window=None`) is a running peak over the
+        wealth curve. Rolling windows use the van Herk/Gil-Werman block trick:
+        the dates are cut into blocks of `window` rows, and each window spans
+        the tail of one block and the head of the next. Prefix and suffix
+        scans within the blocks then give every window's drawdown in
+        O(dates x columns). NaN returns are skipped as in `portfolio_metrics`.
+        """
+        Backtester._check_window(window)
+        x = returns.to_numpy(dtype=float)
+        valid = np.isfinite(x)
+        # Wealth only on days with a return, as in `portfolio_metrics`: a
+        # window that opens in a gap must not see the wealth from before it
+        wealth = np.cumprod(1 + np.where(valid, x, 0.0), axis=0)
+        wealth = np.where(valid, wealth, np.nan)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if window is None:
+                peak = np.fmax.accumulate(wealth, axis=0)
+                drawdown = np.fmax.accumulate(1 - wealth / peak, axis=0)
+            else:
+                drawdown = Backtester._windowed_drawdown(wealth, window)
+
+        count = Backtester._window_sums(valid.astype(float), window)
+        if min_periods is None:
+            min_periods = 1 if window is None else window
+        drawdown = np.where(count >= max(min_periods, 1), drawdown, np.nan)
+        return pd.DataFrame(drawdown, index=returns.index, columns=returns.columns)
+
+    @staticmethod
+    def _windowed_drawdown(wealth: np.ndarray, window: int) -> np.ndarray:
+        """Max drawdown of `wealth` (dates x columns) over trailing windows."""
+        n_rows, n_cols = wealth.shape
+        w = max(1, window)
+        # Leading NaN rows give every date a full window; trailing ones fill
+        # the last block
+        total = -(-(n_rows + w - 1) // w) * w
+        padded = np.full((total, n_cols), np.nan)
+        padded[w - 1 : w - 1 + n_rows] = wealth
+        blocks = padded.reshape(-1, w, n_cols)
+
+        # Head of a block: drawdown and trough from the block start up to t
+        peak = np.fmax.accumulate(blocks, axis=1)
+        head_dd = np.fmax.accumulate(1 - blocks / peak, axis=1).reshape(total, -1)
+        head_min = np.fmin.accumulate(blocks, axis=1).reshape(total, -1)
+
+        # Tail of a block: drawdown and peak from a up to the block end
+        rev = blocks[:, ::-1]
+        trough = np.fmin.accumulate(rev, axis=1)
+        tail_dd = np.fmax.accumulate(1 - trough / rev, axis=1)[:, ::-1]
+        tail_dd = tail_dd.reshape(total, -1)
+        tail_max = np.fmax.accumulate(rev, axis=1)[:, ::-1].reshape(total, -1)
+
+        end = np.arange(w - 1, w - 1 + n_rows)
+        start = end - w + 1
+        across = np.fmax(
+            np.fmax(head_dd[end], tail_dd[start]),
+            1 - head_min[end] / tail_max[start],
+        )
+        # A window that is exactly one block has no tail part
+        whole = (end % w == w - 1)[:, None]
+        return np.where(whole, head_dd[end], across)
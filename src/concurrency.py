@@ -0,0 +1,113 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+
+def imap_bounded(
+    fn: Callable[[Any], Any],
+    items: Sequence[Any],
+    max_workers: int = 8,
+    timeout: float | None = None,
+) -> Iterator[Tuple[int, Any, Optional[BaseException]]]:
+    """Run `fn` over `items` on a bounded set of threads, yielding as tasks finish.
+
+    Yields `(position, result, error)` tuples in completion order. At most
+    `max_workers` calls are in flight at any time; items are started as
+    slots free up and results are released once yielded, so a slow consumer
+    holds at most a handful of them. When `timeout` (seconds) is set, a call
+    still running that long after it was started is abandoned and reported
+    with a `TimeoutError`. Its thread cannot be killed, so it is left to
+    finish in the background (its result is discarded) and a fresh thread
+    takes over its slot: even calls that hang forever only delay the batch
+    by `timeout`.
+    """
+    if not items:
+        return
+
+    finished: queue.Queue = queue.Queue()
+
+    def _run(pos: int, item: Any) -> None:
+        try:
+            finished.put((pos, fn(item), None))
+        except BaseException as exc:
+            finished.put((pos, None, exc))
+
+    source = iter(enumerate(items))
+    # Deadline (or None) of every call still counted against `max_workers`
+    deadlines: dict = {}
+
+    def _start_next() -> None:
+        nxt = next(source, None)
+        if nxt is None:
+            return
+        deadlines[nxt[0]] = None if timeout is None else time.monotonic() + timeout
+        threading.Thread(target=_run, args=nxt, daemon=True).start()
+
+    for _ in range(max(1, max_workers)):
+        _start_next()
+    while deadlines:
+        wait_for = None
+        if timeout is not None:
+            wait_for = max(0.0, min(deadlines.values()) - time.monotonic())
+        try:
+            pos, result, exc = finished.get(timeout=wait_for)
+        except queue.Empty:
+            now = time.monotonic()
+            for pos, deadline in list(deadlines.items()):
+                if deadline <= now:
+                    del deadlines[pos]
+                    _start_next()
+                    yield pos, None, TimeoutError(
+                        f"call for item {items[pos]!r} exceeded {timeout}s"
+                    )
+            continue
+        if pos not in deadlines:
+            continue  # late result of an abandoned call
+        del deadlines[pos]
+        _start_next()
+        yield pos, result, exc
+
+
+def map_bounded(
+    fn: Callable[[Any], Any],
+    items: Sequence[Any],
+    max_workers: int = 8,
+    timeout: float | None = None,
+) -> List[Tuple[Any, Optional[BaseException]]]:
+    """Like `imap_bounded` but returns `(result, error)` pairs in input order."""
+    results: List[Tuple[Any, Optional[BaseException]]] = [(None, None)] * len(items)
+    for pos, result, exc in imap_bounded(fn, items, max_workers, timeout):
+        results[pos] = (result, exc)
+    return results
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` acquisitions per second.
+
+    Up to `burst` tokens can accumulate while idle, so short bursts go
+    through immediately and sustained load is smoothed to `rate`.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
@@ -0,0 +1,90 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class CovarianceEstimator:
+    """Covariance matrices of a shared returns matrix at rebalance dates.
+
+    For a date, the estimate uses the `lookback` rows strictly before it.
+    Tickers with fewer than `min_periods` returns in that window get NaN
+    rows and columns. The others are demeaned, and their missing days count
+    as zero deviations. Each `(date, method)` estimate is computed once and
+    cached, so weighting schemes evaluated on the same rebalance share it.
+
+    Methods: `sample` (population covariance), `ledoit_wolf` (shrinkage
+    towards a scaled identity, Ledoit & Wolf 2004) and `ewma` (exponentially
+    weighted with the given `halflife` in days).
+    """
+
+    METHODS = ("sample", "ledoit_wolf", "ewma")
+
+    def __init__(
+        self,
+        returns: pd.DataFrame,
+        lookback: int = 252,
+        min_periods: int = 60,
+        halflife: float = 63.0,
+    ):
+        self.returns = returns
+        self.lookback = lookback
+        self.min_periods = min_periods
+        self.halflife = halflife
+        self._values = returns.to_numpy(dtype=float)
+        self._cache: Dict[Tuple[int, str], pd.DataFrame] = {}
+
+    def at(self, date, method: str = "ledoit_wolf") -> pd.DataFrame:
+        """Covariance (tickers x tickers) known before `date`."""
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown covariance method: {method}")
+        pos = int(self.returns.index.searchsorted(pd.Timestamp(date), side="left"))
+        key = (pos, method)
+        if key not in self._cache:
+            self._cache[key] = self._estimate(pos, method)
+        return self._cache[key]
+
+    def _estimate(self, pos: int, method: str) -> pd.DataFrame:
+        window = self._values[max(0, pos - self.lookback) : pos]
+        valid = np.isfinite(window)
+        keep = valid.sum(axis=0) >= max(self.min_periods, 2)
+        n = self._values.shape[1]
+        out = np.full((n, n), np.nan)
+        if keep.any():
+            x, ok = window[:, keep], valid[:, keep]
+            mean = np.where(ok, x, 0.0).sum(axis=0) / ok.sum(axis=0)
+            centered = np.where(ok, x - mean, 0.0)
+            estimate = getattr(CovarianceEstimator, method)
+            if method == "ewma":
+                cov = estimate(centered, self.halflife)
+            else:
+                cov = estimate(centered)
+            out[np.ix_(keep, keep)] = cov
+        columns = self.returns.columns
+        return pd.DataFrame(out, index=columns, columns=columns)
+
+    @staticmethod
+    def sample(x: np.ndarray) -> np.ndarray:
+        """Population covariance of demeaned returns `x` (dates x tickers)."""
+        return x.T @ x / len(x)
+
+    @staticmethod
+    def ledoit_wolf(x: np.ndarray) -> np.ndarray:
+        """Sample covariance shrunk towards `mu * I` with the optimal intensity."""
+        t, n = x.shape
+        cov = x.T @ x / t
+        mu = np.trace(cov) / n
+        squares = x**2
+        beta = (squares.T @ squares).sum() / t - (cov**2).sum()
+        beta /= n * t
+        delta = ((cov - mu * np.eye(n)) ** 2).sum() / n
+        beta = min(beta, delta)
+        shrinkage = 0.0 if beta == 0 else beta / delta
+        return (1 - shrinkage) * cov + shrinkage * mu * np.eye(n)
+
+    @staticmethod
+    def ewma(x: np.ndarray, halflife: float = 63.0) -> np.ndarray:
+        """Covariance with weights halving every `halflife` rows back in time."""
+        decay = 0.5 ** (np.arange(len(x))[::-1] / halflife)
+        decay /= decay.sum()
+        return (x * decay[:, None]).T @ x
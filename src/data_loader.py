@@ -1,27 +1,175 @@
 from io import StringIO
 import yfinance as yf
 import pandas as pd
-from typing import List
+from typing import Dict, List
 from pathlib import Path
 import json
 from datetime import datetime, timedelta, timezone
 import warnings
-import requests
 import re
 
+from src.cache_utils import atomic_write_json, parse_utc, utc_now_iso
+from src.concurrency import map_bounded
+from src.financials_cache import FinancialsCache
+from src.http_session import HttpClient
+from src.line_items import LineItems
 from src.models.financials import Financials
+from src.price_cache import PriceCache
+from src.price_store import PriceStore
+
+STATEMENT_ATTRS = {
+    "income": "financials",
+    "balance": "balance_sheet",
+    "cashflow": "cashflow",
+    "info": "info",
+}
+
+
+class _NotModified(Exception):
+    """Raised internally when the constituents page answered 304."""
 
 
 class YahooFinanceLoader:
+    # Market caps and constituents are cached here when no `cache_dir` is given
+    DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / ".cache"
+
+    @staticmethod
+    def load_financials(
+        ticker: str, cache: FinancialsCache | None = None
+    ) -> Financials:
+        """Load statements and info for `ticker`.
+
+        With a `cache`, fresh cached statements are reused and only the
+        missing or expired ones are fetched from Yahoo (and written back,
+        unless Yahoo returned nothing, so they are retried next time).
+        Statement line items are normalized to canonical names (`LineItems`);
+        the cache keeps the raw frames.
+        """
+        if cache is None:
+            stock = HttpClient.yf_ticker(ticker)
+            return LineItems.normalize_financials(
+                Financials(
+                    **{
+                        statement: HttpClient.yf_call(lambda a=attr: getattr(stock, a))
+                        for statement, attr in STATEMENT_ATTRS.items()
+                    }
+                )
+            )
+
+        parts = cache.get(ticker)
+        missing = [k for k in FinancialsCache.STATEMENTS if k not in parts]
+        if missing:
+            # Only touch the network for statements the cache cannot serve
+            stock = HttpClient.yf_ticker(ticker)
+            for statement in missing:
+                attr = STATEMENT_ATTRS[statement]
+                value = HttpClient.yf_call(lambda: getattr(stock, attr))
+                parts[statement] = value
+                # Throttled or failed responses come back empty; caching them
+                # would hide the ticker's data for the whole TTL
+                if not YahooFinanceLoader._is_empty(value):
+                    cache.put(ticker, statement, value)
+        return LineItems.normalize_financials(Financials(**parts))
+
     @staticmethod
-    def load_financials(ticker: str) -> Financials:
-        stock = yf.Ticker(ticker)
-        return Financials(
-            income=stock.financials,
-            balance=stock.balance_sheet,
-            cashflow=stock.cashflow,
-            info=stock.info,
+    def _is_empty(value) -> bool:
+        """True for a missing statement frame or `info` payload."""
+        if value is None:
+            return True
+        if isinstance(value, pd.DataFrame):
+            return value.empty
+        return isinstance(value, dict) and not value
+
+    @staticmethod
+    def _download_close(tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        """Fetch daily closes for many tickers in one bulk request."""
+        raw = HttpClient.yf_call(
+            lambda: yf.download(
+                tickers,
+                start=start,
+                end=end,
+                auto_adjust=True,
+                progress=False,
+                group_by="column",
+                **HttpClient.yf_kwargs(),
+            )
         )
+        if raw is None or raw.empty:
+            return pd.DataFrame(columns=tickers, dtype=float)
+        if isinstance(raw.columns, pd.MultiIndex):
+            close = raw["Close"]
+        else:
+            close = raw[["Close"]].rename(columns={"Close": tickers[0]})
+        if getattr(close.index, "tz", None) is not None:
+            close.index = close.index.tz_localize(None)
+        return close.reindex(columns=tickers)
+
+    @staticmethod
+    def _settled_end(end: str) -> str:
+        """`end`, clamped to today (UTC) so today's session is never covered."""
+        today = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d")
+        return min(end, today, key=pd.Timestamp)
+
+    @staticmethod
+    def load_prices(
+        tickers: List[str],
+        start: str,
+        end: str,
+        cache: PriceCache | PriceStore | None = None,
+    ) -> pd.DataFrame:
+        """Return daily close prices as a wide DataFrame (dates x tickers).
+
+        All tickers are fetched with a single bulk `yf.download` call. With a
+        `cache`, only the date ranges not yet cached are downloaded; tickers
+        sharing the same missing range are fetched together and written back
+        with one `cache.write` per download. Only tickers that came back
+        with at least one price count as covered: in a bulk download, an
+        all-NaN column is how a failed or throttled ticker looks, so it is
+        retried on the next call. A ticker that did return prices but only
+        from a later date (listed inside the range) is covered from the
+        requested start, so the days before its listing are not downloaded
+        again. Coverage ends at today at the latest: days that have not
+        finished trading yet are fetched again on later calls.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if cache is None:
+            return YahooFinanceLoader._download_close(tickers, start, end)
+
+        groups: Dict[tuple, List[str]] = {}
+        for t in tickers:
+            for rng in cache.missing(t, start, end):
+                groups.setdefault(rng, []).append(t)
+
+        for (s, e), group in groups.items():
+            close = YahooFinanceLoader._download_close(group, s, e)
+            close = close.reindex(columns=group).dropna(axis=1, how="all")
+            close = close.dropna(how="all")
+            if close.empty:
+                continue
+            settled = YahooFinanceLoader._settled_end(e)
+            if pd.Timestamp(settled) > pd.Timestamp(s):
+                cache.write(close, coverage=(s, settled))
+            else:
+                cache.write(close)
+
+        return cache.frame(tickers, start, end)
+
+    @staticmethod
+    def fetch_market_cap(ticker: str, fast: bool = True) -> float | None:
+        """Return the market cap of `ticker`, or None if unavailable.
+
+        With `fast`, the light `fast_info` lookup is tried first and the full
+        `info` payload is only requested when it yields nothing.
+        """
+        stock = HttpClient.yf_ticker(ticker)
+        if fast:
+            try:
+                cap = HttpClient.yf_call(lambda: stock.fast_info["market_cap"])
+                if cap is not None and cap == cap:
+                    return cap
+            except Exception:
+                pass
+        return HttpClient.yf_call(lambda: stock.info).get("marketCap")
 
     @staticmethod
     def get_top_n_by_marketcap(
@@ -30,6 +178,10 @@ class YahooFinanceLoader:
         ttl_days: int = 7,
         verbose: bool = False,
         min_tickers: int = 100,
+        max_workers: int = 8,
+        fast: bool = True,
+        constituents_ttl_days: float = 0,
+        offline: bool = False,
     ) -> List[str]:
         """Return top `n` tickers by market capitalization.
 
@@ -38,52 +190,65 @@ class YahooFinanceLoader:
         tickers sorted by market cap (descending).
 
         Caching:
-        - If `cache_dir` is provided (or default `.cache/` in repo root), a
-          JSON cache file `market_caps.json` will be stored.
+        - A JSON cache file `market_caps.json` is stored in `cache_dir`, or in
+          `DEFAULT_CACHE_DIR` (`.cache/` in the repo root) when none is given.
         - Cache entries expire after `ttl_days` days.
+        - The constituents list is stored in `constituents.json` and reused
+          without a request for `constituents_ttl_days` days. Once stale it is
+          revalidated with `If-None-Match`/`If-Modified-Since`, so an unchanged
+          page costs a 304 instead of a download and parse.
+        - With `offline`, no network request is made at all: cached
+          constituents and market caps are used as they are.
+
+        Refresh:
+        - Market caps are fetched on a pool of `max_workers` threads. Requests
+          go through `HttpClient`, whose shared limiter throttles them (see
+          `HttpClient.configure(rate_limit=...)`).
+        - A ticker whose refresh fails keeps its stale cached cap (and its old
+          fetch time, so the next call retries it); without one it is left out.
+        - With `fast`, only the market cap is looked up (`fetch_market_cap`)
+          instead of downloading the full `info` payload.
         """
 
-        repo_root = Path(__file__).resolve().parents[1]
-        cache_path = Path(cache_dir) if cache_dir else repo_root / ".cache"
+        cache_path = (
+            Path(cache_dir) if cache_dir else YahooFinanceLoader.DEFAULT_CACHE_DIR
+        )
         cache_path.mkdir(parents=True, exist_ok=True)
         cache_file = cache_path / "market_caps.json"
 
-        def _load_cache() -> dict:
-            if not cache_file.exists():
+        def _load_json(path: Path) -> dict:
+            if not path.exists():
                 return {}
             try:
-                with cache_file.open("r", encoding="utf-8") as fh:
+                with path.open("r", encoding="utf-8") as fh:
                     return json.load(fh)
             except Exception:
                 return {}
 
-        def _save_cache(data: dict) -> None:
-            # Use an offset-aware UTC timestamp so parsing is unambiguous
+        def _save_cache(data: dict, fetched: dict) -> None:
+            # Use offset-aware UTC timestamps so parsing is unambiguous. The
+            # write goes through a temp file + rename so a crash cannot leave
+            # a truncated cache behind.
             payload = {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": utc_now_iso(),
                 "data": data,
+                "fetched": fetched,
             }
-            with cache_file.open("w", encoding="utf-8") as fh:
-                json.dump(payload, fh)
+            atomic_write_json(cache_file, payload)
 
-        cache = _load_cache()
+        cache = _load_json(cache_file)
         cached_timestamp = None
         cached_data = {}
+        cached_fetched = {}
         if cache:
             try:
-                ts = cache.get("timestamp")
-                if ts:
-                    parsed = datetime.fromisoformat(ts)
-                    # Normalize parsed timestamp to an aware UTC datetime
-                    if parsed.tzinfo is None:
-                        parsed = parsed.replace(tzinfo=timezone.utc)
-                    else:
-                        parsed = parsed.astimezone(timezone.utc)
-                    cached_timestamp = parsed
+                cached_timestamp = parse_utc(cache.get("timestamp"))
                 cached_data = cache.get("data", {})
+                cached_fetched = cache.get("fetched", {}) or {}
             except Exception:
                 cached_timestamp = None
                 cached_data = {}
+                cached_fetched = {}
 
         # Helper: expose cache contents optionally via attribute (useful for debugging)
         YahooFinanceLoader._last_cache_path = cache_file
@@ -93,112 +258,175 @@ class YahooFinanceLoader:
         # Get S&P 500 list from Wikipedia (fetch via requests with a timeout, then parse locally)
         parsed_successfully = False
         tickers = []
-        try:
-            url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-            headers = {
-                "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
-            }
-            resp = requests.get(url, timeout=10, headers=headers)
-            resp.raise_for_status()
+        etag = None
+        last_modified = None
+        not_modified = False
 
-            # Prefer pandas fast parsing; if it fails (e.g. missing parser),
-            # fall back to cached data if available instead of attempting
-            # fragile regex parsing on the live HTML.
-            try:
-                # pandas will warn in future if given raw HTML text; wrap in StringIO
-                tables = pd.read_html(StringIO(resp.text))
-                df = tables[0]
-                tickers = df["Symbol"].astype(str).tolist()
-                parsed_successfully = True
-            except Exception:
-                # If pandas can't parse the HTML and a specific `cache_dir` was
-                # provided (explicit request to use a local cache), prefer the
-                # cache; otherwise re-raise so the lighter fallback parser can
-                # attempt to extract tickers from the HTML.
-                if cached_data and cache_dir is not None:
-                    tickers = list(cached_data.keys())
-                    parsed_successfully = False
-                else:
-                    # propagate to trigger the existing fallback logic below
-                    raise
-        except Exception:
-            # Try a lightweight fallback using requests + regex to extract the 'Symbol' column
+        # Constituents list cache: reused without any request while younger
+        # than `constituents_ttl_days` (or always in `offline` mode)
+        constituents_file = cache_path / "constituents.json"
+        constituents = _load_json(constituents_file)
+        cached_constituents = constituents.get("tickers") or []
+        constituents_ts = parse_utc(constituents.get("timestamp"))
+        constituents_fresh = (
+            bool(cached_constituents)
+            and constituents_ts is not None
+            and datetime.now(timezone.utc) - constituents_ts
+            <= timedelta(days=constituents_ttl_days)
+        )
+
+        if constituents_fresh or (offline and cached_constituents):
+            tickers = list(cached_constituents)
+            parsed_successfully = True
+        elif offline:
+            if not cached_data:
+                raise RuntimeError(
+                    "Offline mode: no cached constituents list or market caps available "
+                    f"in {cache_path}."
+                )
+            tickers = list(cached_data.keys())
+        else:
             try:
                 url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
                 headers = {
                     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
                 }
+                # Revalidate a stale constituents list with a conditional request
+                if cached_constituents:
+                    if constituents.get("etag"):
+                        headers["If-None-Match"] = constituents["etag"]
+                    if constituents.get("last_modified"):
+                        headers["If-Modified-Since"] = constituents["last_modified"]
+                resp = HttpClient.get(url, timeout=10, headers=headers)
+                if getattr(resp, "status_code", None) == 304 and cached_constituents:
+                    raise _NotModified()
+                resp.raise_for_status()
+                resp_headers = getattr(resp, "headers", None) or {}
+                etag = resp_headers.get("ETag")
+                last_modified = resp_headers.get("Last-Modified")
 
-                # Do not pass headers here to remain compatible with tests that
-                # monkeypatch requests.get with a simple callable accepting
-                # (url, timeout=10).
-                resp = requests.get(url, timeout=10)
-
-                tickers = []
-                if resp.status_code != 200:
-                    # Try a second source (raw GitHub dataset)
-                    gh_url = "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/master/data/constituents.csv"
-                    gh_resp = requests.get(gh_url, timeout=10, headers=headers)
-                    if gh_resp.status_code == 200:
-                        try:
-                            df2 = pd.read_csv(StringIO(gh_resp.text))
-                            tickers = df2["Symbol"].astype(str).tolist()
-                            parsed_successfully = True
-                        except Exception:
-                            tickers = []
+                # Prefer pandas fast parsing; if it fails (e.g. missing parser),
+                # fall back to cached data if available instead of attempting
+                # fragile regex parsing on the live HTML.
+                try:
+                    # pandas will warn in future if given raw HTML text; wrap in StringIO
+                    tables = pd.read_html(StringIO(resp.text))
+                    df = tables[0]
+                    tickers = df["Symbol"].astype(str).tolist()
+                    parsed_successfully = True
+                except Exception:
+                    # If pandas can't parse the HTML and a specific `cache_dir` was
+                    # provided (explicit request to use a local cache), prefer the
+                    # cache; otherwise re-raise so the lighter fallback parser can
+                    # attempt to extract tickers from the HTML.
+                    if cached_data and cache_dir is not None:
+                        tickers = list(cached_data.keys())
+                        parsed_successfully = False
                     else:
-                        raise RuntimeError(
-                            f"HTTP {resp.status_code} fetching {url}; GitHub fallback returned {gh_resp.status_code}"
-                        )
-                else:
-                    html = resp.text
-                    # find the first table containing the header 'Symbol'
-                    table_match = None
-                    tables = re.findall(
-                        r"<table.*?>.*?</table>", html, flags=re.DOTALL | re.IGNORECASE
-                    )
-                    for t in tables:
-                        if re.search(r">\s*Symbol\s*<", t, flags=re.IGNORECASE):
-                            table_match = t
-                            break
-
-                    if table_match:
-                        # Extract rows
-                        rows = re.findall(
-                            r"<tr.*?>.*?</tr>",
-                            table_match,
+                        # propagate to trigger the existing fallback logic below
+                        raise
+            except _NotModified:
+                tickers = list(cached_constituents)
+                parsed_successfully = True
+                not_modified = True
+            except Exception:
+                # Try a lightweight fallback using requests + regex to extract the 'Symbol' column
+                try:
+                    url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+                    headers = {
+                        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
+                    }
+
+                    # Do not pass headers here to remain compatible with tests that
+                    # monkeypatch HttpClient.get with a simple callable accepting
+                    # (url, timeout=10).
+                    resp = HttpClient.get(url, timeout=10)
+
+                    tickers = []
+                    if resp.status_code != 200:
+                        # Try a second source (raw GitHub dataset)
+                        gh_url = "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/master/data/constituents.csv"
+                        gh_resp = HttpClient.get(gh_url, timeout=10, headers=headers)
+                        if gh_resp.status_code == 200:
+                            try:
+                                df2 = pd.read_csv(StringIO(gh_resp.text))
+                                tickers = df2["Symbol"].astype(str).tolist()
+                                parsed_successfully = True
+                            except Exception:
+                                tickers = []
+                        else:
+                            raise RuntimeError(
+                                f"HTTP {resp.status_code} fetching {url}; GitHub fallback returned {gh_resp.status_code}"
+                            )
+                    else:
+                        html = resp.text
+                        # find the first table containing the header 'Symbol'
+                        table_match = None
+                        tables = re.findall(
+                            r"<table.*?>.*?</table>",
+                            html,
                             flags=re.DOTALL | re.IGNORECASE,
                         )
-                        for r in rows[1:]:
-                            cols = re.findall(
-                                r"<t[dh].*?>\s*(.*?)\s*</t[dh]>",
-                                r,
+                        for t in tables:
+                            if re.search(r">\s*Symbol\s*<", t, flags=re.IGNORECASE):
+                                table_match = t
+                                break
+
+                        if table_match:
+                            # Extract rows
+                            rows = re.findall(
+                                r"<tr.*?>.*?</tr>",
+                                table_match,
                                 flags=re.DOTALL | re.IGNORECASE,
                             )
-                            if cols:
-                                sym = re.sub(r"<.*?>", "", cols[0]).strip()
-                                if sym:
-                                    tickers.append(sym)
-                        # remove duplicates while preserving order
-                        seen = set()
-                        uniq = []
-                        for s in tickers:
-                            if s not in seen:
-                                seen.add(s)
-                                uniq.append(s)
-                        tickers = uniq
-                        if tickers:
-                            parsed_successfully = True
-            except Exception as e:
-                # If fallback fails and cache exists, use cached tickers
-                if cached_data:
-                    tickers = list(cached_data.keys())
-                    parsed_successfully = False
-                else:
-                    raise RuntimeError(
-                        f"Unable to retrieve S&P 500 list (pd.read_html failed) and no cached market caps available. "
-                        f"Error: {e}. Install 'lxml' or 'beautifulsoup4' and 'requests', or provide a `cache_dir` with `market_caps.json`."
+                            for r in rows[1:]:
+                                cols = re.findall(
+                                    r"<t[dh].*?>\s*(.*?)\s*</t[dh]>",
+                                    r,
+                                    flags=re.DOTALL | re.IGNORECASE,
+                                )
+                                if cols:
+                                    sym = re.sub(r"<.*?>", "", cols[0]).strip()
+                                    if sym:
+                                        tickers.append(sym)
+                            # remove duplicates while preserving order
+                            seen = set()
+                            uniq = []
+                            for s in tickers:
+                                if s not in seen:
+                                    seen.add(s)
+                                    uniq.append(s)
+                            tickers = uniq
+                            if tickers:
+                                parsed_successfully = True
+                except Exception as e:
+                    # If fallback fails and cache exists, use cached tickers
+                    if cached_data:
+                        tickers = list(cached_data.keys())
+                        parsed_successfully = False
+                    else:
+                        raise RuntimeError(
+                            f"Unable to retrieve S&P 500 list (pd.read_html failed) and no cached market caps available. "
+                            f"Error: {e}. Install 'lxml' or 'beautifulsoup4' and 'requests', or provide a `cache_dir` with `market_caps.json`."
+                        )
+
+            if parsed_successfully:
+                try:
+                    atomic_write_json(
+                        constituents_file,
+                        {
+                            "timestamp": utc_now_iso(),
+                            "tickers": tickers,
+                            "etag": constituents.get("etag") if not_modified else etag,
+                            "last_modified": (
+                                constituents.get("last_modified")
+                                if not_modified
+                                else last_modified
+                            ),
+                        },
                     )
+                except Exception:
+                    pass
 
         # If an explicit cache dir was supplied, try to read that cache
         # directly to make behavior deterministic for callers that pass
@@ -242,46 +470,61 @@ class YahooFinanceLoader:
         tickers = [t.replace(".", "-") for t in tickers]
 
         now = datetime.now(tz=timezone.utc)
-        needs_refresh = (cached_timestamp is None) or (
-            now - cached_timestamp > timedelta(days=ttl_days)
-        )
+        ttl = timedelta(days=ttl_days)
+
+        def _is_stale(t: str) -> bool:
+            if cached_data.get(t) is None:
+                return True
+            # Entries written before per-ticker timestamps inherit the file timestamp
+            fetched_at = parse_utc(cached_fetched.get(t)) or cached_timestamp
+            return fetched_at is None or now - fetched_at > ttl
 
         caps = []
+        # Offline mode serves whatever is cached, stale or not
+        to_fetch = [] if offline else [t for t in tickers if _is_stale(t)]
 
-        # If cache is fresh, use cached values for tickers present there; only fetch missing/expired ones.
-        if not needs_refresh:
-            for t in tickers:
-                val = cached_data.get(t)
-                if val is not None:
-                    caps.append((t, val))
-            # If cache contained all tickers, return sorted top N
-            if len(caps) == len(tickers):
-                caps.sort(key=lambda x: x[1], reverse=True)
-                if verbose:
-                    warnings.warn(
-                        f"get_top_n_by_marketcap: returning {len(caps)} tickers (source: fresh cache). Cache path: {cache_file}"
-                    )
-                return [t for t, _ in caps][:n]
+        # If every entry is fresh, return the cached values without any lookups
+        if not to_fetch:
+            caps = [
+                (t, cached_data[t]) for t in tickers if cached_data.get(t) is not None
+            ]
+            caps.sort(key=lambda x: x[1], reverse=True)
+            if verbose:
+                warnings.warn(
+                    f"get_top_n_by_marketcap: returning {len(caps)} tickers (source: fresh cache). Cache path: {cache_file}"
+                )
+            return [t for t, _ in caps][:n]
 
-        # Otherwise, fetch market caps for tickers (use cache where available)
+        # Otherwise, refresh only the stale/missing entries
         updated = dict(cached_data)
+        updated_fetched = {t: cached_fetched[t] for t in updated if t in cached_fetched}
+        if cached_timestamp is not None:
+            for t in updated:
+                updated_fetched.setdefault(t, cached_timestamp.isoformat())
+
+        def _fetch(t: str):
+            return YahooFinanceLoader.fetch_market_cap(t, fast=fast)
+
+        fetched = dict(
+            zip(to_fetch, map_bounded(_fetch, to_fetch, max_workers=max_workers))
+        )
+        fetched_at = now.isoformat()
         for t in tickers:
-            if t in updated and not needs_refresh:
+            if t not in fetched:
                 caps.append((t, updated[t]))
                 continue
-            try:
-                info = yf.Ticker(t).info
-                cap = info.get("marketCap")
-                if cap is not None:
-                    caps.append((t, cap))
-                    updated[t] = cap
-            except Exception:
-                # skip tickers that fail
-                continue
+            cap, exc = fetched[t]
+            if exc is None and cap is not None:
+                caps.append((t, cap))
+                updated[t] = cap
+                updated_fetched[t] = fetched_at
+            elif updated.get(t) is not None:
+                # Refresh failed: fall back to the stale cached value
+                caps.append((t, updated[t]))
 
         # Save updated cache
         try:
-            _save_cache(updated)
+            _save_cache(updated, updated_fetched)
         except Exception:
             pass
 
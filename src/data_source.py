@@ -0,0 +1,179 @@
+from abc import ABC, abstractmethod
+import json
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import pandas as pd
+
+from src.data_loader import YahooFinanceLoader
+from src.financials_cache import FinancialsCache
+from src.http_session import HttpClient
+from src.line_items import LineItems
+from src.models.financials import Financials
+from src.price_cache import PriceCache
+from src.price_store import PriceStore
+
+
+class DataSource(ABC):
+    """Where the pipeline gets its data from.
+
+    Implementations provide statements + info per ticker, daily close prices
+    as a wide dates x tickers frame, and the universe constituents.
+    """
+
+    @abstractmethod
+    def financials(self, ticker: str) -> Financials: ...
+
+    def info(self, ticker: str) -> Dict:
+        return self.financials(ticker).info
+
+    @abstractmethod
+    def prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame: ...
+
+    @abstractmethod
+    def constituents(self, n: int | None = None) -> List[str]:
+        """Universe tickers, largest market cap first (at most `n`)."""
+
+
+class YahooDataSource(DataSource):
+    """The default source: Yahoo Finance via `YahooFinanceLoader`."""
+
+    def __init__(
+        self,
+        financials_cache: FinancialsCache | None = None,
+        price_cache: PriceCache | PriceStore | None = None,
+        cache_dir: str | None = None,
+    ):
+        self.financials_cache = financials_cache
+        self.price_cache = price_cache
+        self.cache_dir = cache_dir
+
+    def financials(self, ticker: str) -> Financials:
+        if self.financials_cache is None:
+            return YahooFinanceLoader.load_financials(ticker)
+        return YahooFinanceLoader.load_financials(ticker, cache=self.financials_cache)
+
+    def info(self, ticker: str) -> Dict:
+        if self.financials_cache is not None:
+            return self.financials(ticker).info
+        stock = HttpClient.yf_ticker(ticker)
+        return HttpClient.yf_call(lambda: stock.info)
+
+    def prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        return YahooFinanceLoader.load_prices(
+            tickers, start, end, cache=self.price_cache
+        )
+
+    def constituents(self, n: int | None = None) -> List[str]:
+        return YahooFinanceLoader.get_top_n_by_marketcap(
+            n if n is not None else 10_000, cache_dir=self.cache_dir
+        )
+
+
+class FileDataSource(DataSource):
+    """Offline source backed by a directory of CSV (or Parquet) fixtures.
+
+    Layout under `root`::
+
+        constituents.csv                       Symbol[,marketCap]
+        prices.csv | prices.parquet            Date index, one close column per ticker
+        financials/<TICKER>/income.csv         line items x periods
+        financials/<TICKER>/balance.csv
+        financials/<TICKER>/cashflow.csv
+        financials/<TICKER>/info.json
+
+    Missing statement files load as empty frames. Parquet files are used
+    when present (this requires `pyarrow`).
+    """
+
+    STATEMENTS = ("income", "balance", "cashflow")
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._prices: pd.DataFrame | None = None
+
+    def _read_frame(self, path: Path, index_col=0) -> pd.DataFrame:
+        parquet = path.with_suffix(".parquet")
+        if parquet.exists():
+            return pd.read_parquet(parquet)
+        if path.exists():
+            return pd.read_csv(path, index_col=index_col)
+        return pd.DataFrame()
+
+    @staticmethod
+    def _parse_period_columns(df: pd.DataFrame) -> pd.DataFrame:
+        # Statement periods round-trip through CSV as strings; restore dates
+        if df.empty:
+            return df
+        periods = pd.to_datetime(pd.Index(df.columns), errors="coerce")
+        if not periods.isna().any():
+            df.columns = periods
+        return df
+
+    def financials(self, ticker: str) -> Financials:
+        folder = self.root / "financials" / ticker
+        if not folder.exists():
+            raise KeyError(f"No fixture financials for {ticker} in {folder}")
+        statements = {
+            name: self._parse_period_columns(self._read_frame(folder / f"{name}.csv"))
+            for name in self.STATEMENTS
+        }
+        return LineItems.normalize_financials(
+            Financials(**statements, info=self.info(ticker))
+        )
+
+    def info(self, ticker: str) -> Dict:
+        path = self.root / "financials" / ticker / "info.json"
+        if not path.exists():
+            return {}
+        with path.open("r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        if self._prices is None:
+            frame = self._read_frame(self.root / "prices.csv")
+            frame.index = pd.to_datetime(frame.index)
+            self._prices = frame.sort_index()
+        frame = self._prices
+        mask = (frame.index >= pd.Timestamp(start)) & (frame.index < pd.Timestamp(end))
+        return frame.loc[mask].reindex(columns=list(dict.fromkeys(tickers)))
+
+    def constituents(self, n: int | None = None) -> List[str]:
+        df = self._read_frame(self.root / "constituents.csv", index_col=None)
+        if "marketCap" in df.columns:
+            df = df.sort_values("marketCap", ascending=False, kind="stable")
+        tickers = df["Symbol"].astype(str).tolist()
+        return tickers if n is None else tickers[:n]
+
+    @staticmethod
+    def export(
+        root: str,
+        source: DataSource,
+        tickers: List[str],
+        start: str,
+        end: str,
+        market_caps: Dict[str, float] | None = None,
+        benchmarks: Sequence[str] = ("^GSPC",),
+    ) -> "FileDataSource":
+        """Write `tickers` from `source` into a fixture directory at `root`.
+
+        Prices are exported for `tickers` plus the `benchmarks`.
+        """
+        base = Path(root)
+        (base / "financials").mkdir(parents=True, exist_ok=True)
+        for t in tickers:
+            fin = source.financials(t)
+            folder = base / "financials" / t
+            folder.mkdir(parents=True, exist_ok=True)
+            for name in FileDataSource.STATEMENTS:
+                getattr(fin, name).to_csv(folder / f"{name}.csv")
+            with (folder / "info.json").open("w", encoding="utf-8") as fh:
+                json.dump(fin.info, fh, default=str)
+
+        prices = source.prices(list(tickers) + list(benchmarks), start, end)
+        prices.to_csv(base / "prices.csv")
+        constituents = pd.DataFrame({"Symbol": tickers})
+        if market_caps:
+            constituents["marketCap"] = [market_caps.get(t) for t in tickers]
+        constituents.to_csv(base / "constituents.csv", index=False)
+        return FileDataSource(root)
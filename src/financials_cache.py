@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+from pathlib import Path
+import pickle
+import threading
+from typing import Dict
+
+from src.cache_utils import (
+    atomic_write_bytes,
+    atomic_write_json,
+    parse_utc,
+    utc_now_iso,
+)
+
+
+class FinancialsCache:
+    """Persistent on-disk cache for the parts of a `Financials` object.
+
+    Layout under `cache_dir`::
+
+        financials/index.json             ticker -> statement -> {fetched, sha256}
+        financials/<TICKER>/<statement>.pkl
+
+    Statements (`income`, `balance`, `cashflow`, `info`) are pickled
+    individually and expire independently according to `ttl_days`. The index
+    records a SHA-256 of each file so corrupted or externally modified files
+    are treated as misses, and unchanged content is not rewritten on refresh.
+
+    Index updates are kept in memory until `flush()` is called.
+    """
+
+    STATEMENTS = ("income", "balance", "cashflow", "info")
+
+    DEFAULT_TTL_DAYS = {
+        "income": 30,
+        "balance": 30,
+        "cashflow": 30,
+        "info": 1,
+    }
+
+    def __init__(
+        self, cache_dir: str | None = None, ttl_days: Dict[str, float] | None = None
+    ):
+        repo_root = Path(__file__).resolve().parents[1]
+        base = Path(cache_dir) if cache_dir else repo_root / ".cache"
+        self.root = base / "financials"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.root / "index.json"
+        self.ttl_days = dict(self.DEFAULT_TTL_DAYS)
+        if ttl_days:
+            self.ttl_days.update(ttl_days)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._index = self._load_index()
+
+    def _load_index(self) -> dict:
+        if not self.index_file.exists():
+            return {}
+        try:
+            with self.index_file.open("r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except Exception:
+            return {}
+
+    def _path(self, ticker: str, statement: str) -> Path:
+        safe = ticker.replace("/", "_")
+        return self.root / safe / f"{statement}.pkl"
+
+    def get(self, ticker: str) -> Dict:
+        """Return the fresh, intact cached statements for `ticker`.
+
+        The result maps statement name to its value and only contains
+        statements that are present and within their TTL.
+        """
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entries = dict(self._index.get(ticker, {}))
+
+        out = {}
+        for statement, entry in entries.items():
+            fetched = parse_utc(entry.get("fetched"))
+            ttl = self.ttl_days.get(statement)
+            if fetched is None or ttl is None or now - fetched > timedelta(days=ttl):
+                continue
+            try:
+                data = self._path(ticker, statement).read_bytes()
+            except OSError:
+                continue
+            if hashlib.sha256(data).hexdigest() != entry.get("sha256"):
+                continue
+            try:
+                out[statement] = pickle.loads(data)
+            except Exception:
+                continue
+        return out
+
+    def put(self, ticker: str, statement: str, value) -> None:
+        """Store one statement for `ticker` and mark it freshly fetched."""
+        if statement not in self.STATEMENTS:
+            raise ValueError(f"Unknown statement type: {statement}")
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(ticker, statement)
+
+        with self._lock:
+            previous = self._index.get(ticker, {}).get(statement, {})
+        if previous.get("sha256") != digest or not path.exists():
+            atomic_write_bytes(path, data)
+
+        with self._lock:
+            self._index.setdefault(ticker, {})[statement] = {
+                "fetched": utc_now_iso(),
+                "sha256": digest,
+            }
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Persist the index file if it changed since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.loads(json.dumps(self._index))
+            self._dirty = False
+        atomic_write_json(self.index_file, snapshot)
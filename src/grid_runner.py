@@ -0,0 +1,131 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import os
+from pathlib import Path
+import tempfile
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backtest_engine import Backtester
+from src.models.kpi_table import KPITable
+from src.score_engine import ScoringEngine
+from src.weight_sweep import KPIS, WeightSweep
+
+# Per-process state set up by `GridRunner._init_worker`
+_WORKER: Dict = {}
+
+
+class GridRunner:
+    """Run a grid of backtest configurations across a process pool.
+
+    A configuration is a KPI weighting, a top-N cutoff and a `[start, end)`
+    date window. The returns matrix is written once to a `.npy` file that
+    every worker maps read-only (`numpy.load(mmap_mode="r")`), so it is
+    never pickled per task; only the small percentile matrix travels to the
+    workers, once each. Configurations are sent in chunks and each chunk is
+    evaluated with `WeightSweep`'s matrix products, grouped by cutoff and
+    window. Results come back as one tidy frame, one row per configuration.
+    """
+
+    @staticmethod
+    def grid(
+        configs=None,
+        top_n: Iterable[int] = (10,),
+        windows: Iterable[Tuple[str, str]] = (("2019-01-01", "2024-01-01"),),
+    ) -> pd.DataFrame:
+        """Cartesian product of weightings, cutoffs and date windows.
+
+        `configs` accepts anything `WeightSweep.configs_frame` does and
+        defaults to the current `ScoringEngine.KPI_WEIGHTS`.
+        """
+        if configs is None:
+            configs = [ScoringEngine.KPI_WEIGHTS]
+        weights = WeightSweep.configs_frame(configs).reset_index(drop=True)
+        rows = [
+            {**weights.iloc[i].to_dict(), "top_n": n, "start": s, "end": e}
+            for i, n, (s, e) in product(range(len(weights)), top_n, windows)
+        ]
+        return pd.DataFrame(rows, columns=[*KPIS, "top_n", "start", "end"])
+
+    @staticmethod
+    def _init_worker(path: str, dates, tickers: List[str], percentiles) -> None:
+        values = np.load(path, mmap_mode="r")
+        _WORKER["returns"] = pd.DataFrame(
+            values, index=dates, columns=tickers, copy=False
+        )
+        _WORKER["percentiles"] = percentiles
+
+    @staticmethod
+    def _run_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+        """Metrics for a chunk of configurations (rows keep `chunk`'s index)."""
+        returns = _WORKER["returns"]
+        percentiles = _WORKER["percentiles"]
+        parts = []
+        for (n, start, end), group in chunk.groupby(
+            ["top_n", "start", "end"], sort=False
+        ):
+            window = returns[
+                (returns.index >= pd.Timestamp(start))
+                & (returns.index < pd.Timestamp(end))
+            ]
+            values = percentiles.to_numpy() @ group[KPIS].to_numpy().T
+            values = np.where(np.isfinite(values), values, 0.0)
+            scores = pd.DataFrame(values, index=percentiles.index, columns=group.index)
+            daily = WeightSweep.portfolio_returns(scores, window, int(n))
+            parts.append(Backtester.portfolio_metrics(daily))
+        return pd.concat(parts)
+
+    @staticmethod
+    def run(
+        table: KPITable,
+        returns: pd.DataFrame,
+        configs: pd.DataFrame,
+        max_workers: int | None = None,
+        chunk_size: int | None = None,
+        tmp_dir: str | None = None,
+    ) -> pd.DataFrame:
+        """Backtest every row of `configs` (see `grid`) against `returns`.
+
+        `returns` is dates x tickers and should cover the whole universe of
+        `table` and every window. Returns `configs` with the
+        `Backtester.portfolio_metrics` columns appended. With
+        `max_workers=1` the grid runs in this process.
+        """
+        configs = configs.reset_index(drop=True)
+        percentiles = WeightSweep.percentiles(table)
+        percentiles.index = table.frame["ticker"]
+        returns = returns.reindex(columns=percentiles.index)
+        workers = max_workers or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(configs) // (workers * 4)))
+        chunks = [
+            configs.iloc[i : i + chunk_size] for i in range(0, len(configs), chunk_size)
+        ]
+
+        fd, path = tempfile.mkstemp(suffix=".npy", dir=tmp_dir)
+        os.close(fd)
+        try:
+            np.save(path, returns.to_numpy(dtype=float))
+            initargs = (path, returns.index, list(returns.columns), percentiles)
+            if workers <= 1:
+                GridRunner._init_worker(*initargs)
+                try:
+                    results = [GridRunner._run_chunk(c) for c in chunks]
+                finally:
+                    _WORKER.clear()
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=GridRunner._init_worker,
+                    initargs=initargs,
+                ) as pool:
+                    results = list(pool.map(GridRunner._run_chunk, chunks))
+        finally:
+            Path(path).unlink(missing_ok=True)
+
+        if not results:
+            return configs
+        metrics = pd.concat(results).reindex(configs.index)
+        return pd.concat([configs, metrics], axis=1)
@@ -0,0 +1,145 @@
+import threading
+import time
+from typing import Any, Callable, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import yfinance as yf
+
+from src.concurrency import RateLimiter
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    """Process-wide HTTP layer shared by all loaders.
+
+    - Plain HTTP (`get`) goes through one `requests.Session` with a pooled
+      keep-alive adapter that retries 429/5xx responses with exponential
+      backoff (honouring `Retry-After`).
+    - Yahoo calls go through `yf_call`, which applies the same global token
+      bucket and retries rate-limit errors with exponential backoff. yfinance
+      already keeps one process-wide session; `configure(yf_session=...)`
+      injects a specific one into every `yf.Ticker`/`yf.download` call.
+
+    Settings are class-level; call `configure()` once at start-up to change them.
+    """
+
+    pool_size: int = 16
+    retries: int = 3
+    backoff_factor: float = 0.5
+    rate_limit: float | None = 20.0
+    burst: int = 40
+    yf_session: Any = None
+
+    _session: requests.Session | None = None
+    _limiter: RateLimiter | None = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(
+        cls,
+        pool_size: int | None = None,
+        retries: int | None = None,
+        backoff_factor: float | None = None,
+        rate_limit: float | None = ...,
+        burst: int | None = None,
+        yf_session: Any = ...,
+    ) -> None:
+        """Update settings; the session and limiter are rebuilt on next use.
+
+        Pass `rate_limit=None` to disable throttling.
+        """
+        with cls._lock:
+            if pool_size is not None:
+                cls.pool_size = pool_size
+            if retries is not None:
+                cls.retries = retries
+            if backoff_factor is not None:
+                cls.backoff_factor = backoff_factor
+            if rate_limit is not ...:
+                cls.rate_limit = rate_limit
+            if burst is not None:
+                cls.burst = burst
+            if yf_session is not ...:
+                cls.yf_session = yf_session
+            if cls._session is not None:
+                cls._session.close()
+            cls._session = None
+            cls._limiter = None
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        with cls._lock:
+            if cls._session is None:
+                # Only 429/5xx responses are retried; connection errors fail
+                # fast so callers can fall back to cached data
+                retry = Retry(
+                    total=cls.retries,
+                    connect=0,
+                    read=0,
+                    status=cls.retries,
+                    backoff_factor=cls.backoff_factor,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset({"GET", "HEAD"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=cls.pool_size,
+                    pool_maxsize=cls.pool_size,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                cls._session = session
+            return cls._session
+
+    @classmethod
+    def throttle(cls) -> None:
+        """Block until the global rate limiter grants a request."""
+        with cls._lock:
+            if cls._limiter is None and cls.rate_limit:
+                cls._limiter = RateLimiter(cls.rate_limit, cls.burst)
+            limiter = cls._limiter
+        if limiter is not None:
+            limiter.acquire()
+
+    @classmethod
+    def get(cls, url: str, timeout: float = 10, headers: Dict | None = None):
+        cls.throttle()
+        return cls.session().get(url, timeout=timeout, headers=headers)
+
+    @staticmethod
+    def _is_rate_limited(exc: BaseException) -> bool:
+        rate_limit_error = getattr(
+            getattr(yf, "exceptions", None), "YFRateLimitError", None
+        )
+        if rate_limit_error is not None and isinstance(exc, rate_limit_error):
+            return True
+        text = str(exc)
+        return "429" in text or "Too Many Requests" in text
+
+    @classmethod
+    def yf_call(cls, fn: Callable[[], Any]) -> Any:
+        """Run one Yahoo request (`fn`) throttled, retrying when rate limited."""
+        for attempt in range(cls.retries + 1):
+            cls.throttle()
+            try:
+                return fn()
+            except Exception as exc:
+                if attempt >= cls.retries or not cls._is_rate_limited(exc):
+                    raise
+                time.sleep(cls.backoff_factor * (2**attempt))
+
+    @classmethod
+    def yf_ticker(cls, ticker: str):
+        if cls.yf_session is None:
+            return yf.Ticker(ticker)
+        return yf.Ticker(ticker, session=cls.yf_session)
+
+    @classmethod
+    def yf_kwargs(cls) -> Dict:
+        return {} if cls.yf_session is None else {"session": cls.yf_session}
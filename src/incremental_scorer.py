@@ -0,0 +1,116 @@
+from typing import Dict, Hashable, Iterable, List, Set
+import warnings
+
+import numpy as np
+
+from src.models.kpi_table import KPITable
+from src.percentile_index import PercentileIndex
+from src.score_engine import ScoringEngine
+
+
+class IncrementalScorer:
+    """Keep a `KPITable` scored and rescore only the sectors that change.
+
+    The sector KPI values live in a `PercentileIndex` (sorted NumPy arrays).
+    `update()` swaps a ticker's old values for its new ones in that index
+    (a binary search and one shift each) and recomputes percentiles with
+    `searchsorted` for the affected sectors only. Scores are identical
+    to `ScoringEngine.score_table` on the whole table.
+    """
+
+    def __init__(self, table: KPITable):
+        self.table = table
+        self.index = PercentileIndex()
+        self._members: Dict[Hashable, List[int]] = {}
+        self._positions: Dict[str, int] = {}
+        self.rebuild()
+
+    @staticmethod
+    def _finite(value) -> float:
+        return ScoringEngine._as_float(None if value is None else float(value))
+
+    def rebuild(self) -> None:
+        """Index the whole table from scratch and score every row."""
+        frame = self.table.frame
+        self._positions = {t: i for i, t in enumerate(frame["ticker"])}
+        self._members = {}
+        for i, sector in enumerate(frame["sector"]):
+            self._members.setdefault(PercentileIndex.sector_key(sector), []).append(i)
+        self.index = PercentileIndex.from_table(self.table)
+        self._rescore(self._members)
+
+    def _append_row(self, ticker: str) -> int:
+        frame = self.table.frame
+        pos = len(frame)
+        frame.loc[pos] = {
+            "ticker": ticker,
+            "name": ticker,
+            "sector": "Unknown",
+            **{k: np.nan for k in ScoringEngine.KPI_WEIGHTS},
+            "score": 0.0,
+        }
+        self._positions[ticker] = pos
+        self._members.setdefault("Unknown", []).append(pos)
+        return pos
+
+    def update(self, changes: Dict[str, Dict]) -> Set[Hashable]:
+        """Apply new values for changed tickers and rescore their sectors.
+
+        `changes` maps ticker -> {column: value} for `name`, `sector` and any
+        KPI column (None means missing). Unknown tickers are appended to the
+        table. Returns the set of sectors that were rescored.
+        """
+        frame = self.table.frame
+        kpis = list(ScoringEngine.KPI_WEIGHTS)
+        affected: Set[Hashable] = set()
+        for ticker, values in changes.items():
+            pos = self._positions.get(ticker)
+            if pos is None:
+                pos = self._append_row(ticker)
+
+            old_sector = PercentileIndex.sector_key(frame["sector"].iat[pos])
+            new_sector = PercentileIndex.sector_key(values.get("sector", old_sector))
+            old = {k: self._finite(frame[k].iat[pos]) for k in kpis}
+            new = {k: self._finite(values[k]) if k in values else old[k] for k in kpis}
+
+            for k in kpis:
+                if new_sector != old_sector or old[k] != new[k]:
+                    self.index.remove(old_sector, k, old[k])
+                    self.index.insert(new_sector, k, new[k])
+            if new_sector != old_sector:
+                self._members[old_sector].remove(pos)
+                self._members.setdefault(new_sector, []).append(pos)
+
+            for column, value in values.items():
+                if column in kpis:
+                    value = np.nan if value is None else float(value)
+                frame.iat[pos, frame.columns.get_loc(column)] = value
+            affected.update({old_sector, new_sector})
+
+            # Missing as in `ScoringEngine._warn_missing`: None, NaN or inf
+            missing = sum(
+                1 for k in kpis if not np.isfinite(self._finite(frame[k].iat[pos]))
+            )
+            if missing >= len(kpis) / 2:
+                warnings.warn(
+                    f"Stock {ticker} has {missing} missing KPI(s); score may be unreliable."
+                )
+
+        self._rescore(affected)
+        return affected
+
+    def _rescore(self, sectors: Iterable[Hashable]) -> None:
+        frame = self.table.frame
+        score_col = frame.columns.get_loc("score")
+        for sector in sectors:
+            rows = np.asarray(self._members.get(sector, []), dtype=int)
+            if not len(rows):
+                continue
+            scores = np.zeros(len(rows))
+            for kpi, weight in ScoringEngine.KPI_WEIGHTS.items():
+                values = frame[kpi].to_numpy(dtype=float)[rows]
+                pct = self.index.percentile(sector, kpi, values)
+                if kpi in ScoringEngine.INVERSE_KPIS:
+                    pct = 1 - pct
+                scores += np.nan_to_num(pct * weight, nan=0.0)
+            frame.iloc[rows, score_col] = np.where(np.isfinite(scores), scores, 0.0)
@@ -1,6 +1,12 @@
-from typing import Optional
+from typing import Dict, Optional
 import math
+
+import numpy as np
+import pandas as pd
+
+from src.line_items import LineItems
 from src.models.financials import Financials
+from src.models.kpi_table import KPI_COLUMNS
 
 
 class KPICalculator:
@@ -11,30 +17,25 @@ class KPICalculator:
             income = fin.income
             tax_rate = fin.info.get("taxRate", 0.21)
 
-            # Try common labels for EBIT/operating profit
-            ebit = None
-            for key in ["Ebit", "EBIT", "Operating Income", "OperatingIncome"]:
-                if key in income.index:
-                    ebit = income.loc[key].iloc[0]
-                    break
+            # EBIT/operating profit under any of its known labels
+            ebit_row = LineItems.find(income, "EBIT")
+            ebit = ebit_row.iloc[0] if ebit_row is not None else None
 
             # Fallback: compute EBIT from Net Income and Interest Expense if available
             if ebit is None:
-                if "Net Income" in income.index:
-                    net_income = income.loc["Net Income"].iloc[0]
-                    interest = (
-                        income.loc["Interest Expense"].iloc[0]
-                        if "Interest Expense" in income.index
-                        else 0.0
-                    )
+                net_income_row = LineItems.find(income, "Net Income")
+                if net_income_row is not None:
+                    net_income = net_income_row.iloc[0]
+                    interest_row = LineItems.find(income, "Interest Expense")
+                    interest = interest_row.iloc[0] if interest_row is not None else 0.0
                     # Net Income = (EBIT - Interest) * (1 - tax_rate)
                     ebit = net_income / (1 - tax_rate) + interest
                 else:
                     raise KeyError("EBIT not found in income statement")
 
             nopat = ebit * (1 - tax_rate)
-            debt = fin.balance.loc["Long Term Debt"].iloc[0]
-            equity = fin.balance.loc["Stockholders Equity"].iloc[0]
+            debt = LineItems.get(fin.balance, "Long Term Debt").iloc[0]
+            equity = LineItems.get(fin.balance, "Stockholders Equity").iloc[0]
             debt = float(debt)
             equity = float(equity)
             if not math.isfinite(debt) or not math.isfinite(equity):
@@ -48,8 +49,8 @@ class KPICalculator:
     @staticmethod
     def roe(fin: Financials) -> Optional[float]:
         try:
-            net_income = fin.income.loc["Net Income"].iloc[0]
-            equity = fin.balance.loc["Stockholders Equity"].iloc[0]
+            net_income = LineItems.get(fin.income, "Net Income").iloc[0]
+            equity = LineItems.get(fin.balance, "Stockholders Equity").iloc[0]
             net_income = float(net_income)
             equity = float(equity)
             if not math.isfinite(net_income) or not math.isfinite(equity):
@@ -63,7 +64,7 @@ class KPICalculator:
     @staticmethod
     def fcf_yield(fin: Financials) -> Optional[float]:
         try:
-            fcf = fin.cashflow.loc["Free Cash Flow"].iloc[0]
+            fcf = LineItems.get(fin.cashflow, "Free Cash Flow").iloc[0]
             market_cap = fin.info.get("marketCap")
             fcf = float(fcf)
             market_cap = float(market_cap) if market_cap is not None else float("nan")
@@ -78,7 +79,7 @@ class KPICalculator:
     @staticmethod
     def revenue_cagr(fin: Financials, years: int = 3) -> Optional[float]:
         try:
-            rev = fin.income.loc["Total Revenue"].iloc[: years + 1]
+            rev = LineItems.get(fin.income, "Total Revenue").iloc[: years + 1]
             return (rev.iloc[0] / rev.iloc[-1]) ** (1 / years) - 1
         except Exception:
             return None
@@ -86,8 +87,8 @@ class KPICalculator:
     @staticmethod
     def debt_to_equity(fin: Financials) -> Optional[float]:
         try:
-            debt = fin.balance.loc["Long Term Debt"].iloc[0]
-            equity = fin.balance.loc["Stockholders Equity"].iloc[0]
+            debt = LineItems.get(fin.balance, "Long Term Debt").iloc[0]
+            equity = LineItems.get(fin.balance, "Stockholders Equity").iloc[0]
             # Ensure numeric and finite values to avoid extreme ratios from tiny denominators
             debt = float(debt)
             equity = float(equity)
@@ -99,3 +100,174 @@ class KPICalculator:
             return debt / equity
         except Exception:
             return None
+
+    # Canonical line items used by the KPIs, per statement
+    BATCH_ITEMS = {
+        "income": ["EBIT", "Net Income", "Interest Expense", "Total Revenue"],
+        "balance": ["Long Term Debt", "Stockholders Equity"],
+        "cashflow": ["Free Cash Flow"],
+    }
+
+    @staticmethod
+    def long_format(
+        fins: Dict[str, Financials], periods: int | None = 4
+    ) -> pd.DataFrame:
+        """Align many tickers' statements into one long frame.
+
+        Returns columns `ticker`, `statement`, `item`, `position`, `period`
+        and `value`, restricted to the line items the KPIs use and to the
+        `periods` most recent columns (`position` 0 is the latest). Statements
+        are normalized with `LineItems.normalize`, so `item` holds canonical
+        names; duplicated labels keep their first row. Values are coerced to
+        float (NaN when not numeric).
+        """
+        parts = []
+        for ticker, fin in fins.items():
+            for statement, items in KPICalculator.BATCH_ITEMS.items():
+                df = getattr(fin, statement, None)
+                if not isinstance(df, pd.DataFrame) or df.empty:
+                    continue
+                df = LineItems.normalize(df)
+                sub = df.loc[df.index.isin(items)].iloc[:, :periods]
+                sub = sub[~sub.index.duplicated(keep="first")]
+                if sub.empty or sub.shape[1] == 0:
+                    continue
+                n_rows, n_cols = sub.shape
+                parts.append(
+                    pd.DataFrame(
+                        {
+                            "ticker": ticker,
+                            "statement": statement,
+                            "item": np.repeat(sub.index.to_numpy(), n_cols),
+                            "position": np.tile(np.arange(n_cols), n_rows),
+                            "period": np.tile(sub.columns.to_numpy(), n_rows),
+                            "value": sub.to_numpy().ravel(),
+                        }
+                    )
+                )
+        if not parts:
+            return pd.DataFrame(
+                columns=["ticker", "statement", "item", "position", "period", "value"]
+            )
+        long = pd.concat(parts, ignore_index=True)
+        long["value"] = pd.to_numeric(long["value"], errors="coerce").astype(float)
+        return long
+
+    # Info fields used by the KPIs and their defaults when absent
+    INFO_FIELDS = {"taxRate": 0.21, "marketCap": None}
+
+    @staticmethod
+    def info_frame(fins: Dict[str, Financials]) -> pd.DataFrame:
+        """`INFO_FIELDS` of every ticker as a numeric frame indexed by ticker."""
+        tickers = list(fins)
+        infos = [getattr(fins[t], "info", None) or {} for t in tickers]
+        return pd.DataFrame(
+            {
+                field: pd.to_numeric(
+                    pd.Series(
+                        [v.get(field, default) for v in infos],
+                        index=tickers,
+                        dtype=object,
+                    ),
+                    errors="coerce",
+                )
+                for field, default in KPICalculator.INFO_FIELDS.items()
+            },
+            index=tickers,
+        )
+
+    @staticmethod
+    def batch(fins: Dict[str, Financials], years: int = 3) -> pd.DataFrame:
+        """Compute all KPIs for many tickers with vectorized column operations.
+
+        Returns a float DataFrame indexed by ticker with one column per KPI,
+        matching the per-ticker methods (a `None` result there is NaN here).
+        """
+        if not fins:
+            return pd.DataFrame(columns=KPI_COLUMNS, dtype=float)
+        long = KPICalculator.long_format(fins, periods=years + 1)
+        return KPICalculator.from_long(long, KPICalculator.info_frame(fins), years)
+
+    @staticmethod
+    def from_long(
+        long: pd.DataFrame, info: pd.DataFrame, years: int = 3
+    ) -> pd.DataFrame:
+        """KPIs from a `long_format` frame and an `info_frame` (one row per ticker).
+
+        `position` 0 must be each statement's latest period; positions beyond
+        `years` are ignored. Tickers are taken from the index of `info`.
+        """
+        tickers = list(info.index)
+        if not tickers:
+            return pd.DataFrame(columns=KPI_COLUMNS, dtype=float)
+
+        long = long[long["position"] <= years]
+        key = long["statement"] + "/" + long["item"]
+
+        # Latest value per (ticker, line item); `present` tracks labels that
+        # exist even when their value is NaN, as the per-ticker fallbacks do
+        latest = long[long["position"] == 0].assign(key=key, flag=True)
+        wide = latest.pivot(index="ticker", columns="key", values="value")
+        wide = wide.reindex(index=tickers)
+        flags = latest.pivot(index="ticker", columns="key", values="flag")
+        flags = flags.reindex(index=tickers).notna()
+
+        def col(statement: str, item: str) -> pd.Series:
+            name = f"{statement}/{item}"
+            if name in wide:
+                return wide[name]
+            return pd.Series(np.nan, index=wide.index)
+
+        def present(statement: str, item: str) -> pd.Series:
+            name = f"{statement}/{item}"
+            if name in flags:
+                return flags[name]
+            return pd.Series(False, index=wide.index)
+
+        def ratio(num: pd.Series, den: pd.Series) -> pd.Series:
+            ok = np.isfinite(num) & np.isfinite(den) & (den.abs() >= 1e-6)
+            return (num / den).where(ok)
+
+        debt = col("balance", "Long Term Debt")
+        equity = col("balance", "Stockholders Equity")
+        net_income = col("income", "Net Income")
+
+        # ROIC: EBIT when reported, else derive it from net income
+        tax_rate = info["taxRate"]
+        found = present("income", "EBIT")
+        ebit = col("income", "EBIT")
+        interest = col("income", "Interest Expense").where(
+            present("income", "Interest Expense"), 0.0
+        )
+        derived = net_income / (1 - tax_rate) + interest
+        fallback = ~found & present("income", "Net Income")
+        ebit = ebit.where(~fallback, derived)
+        invested = debt + equity
+        roic = (ebit * (1 - tax_rate) / invested).where(
+            (found | fallback)
+            & np.isfinite(debt)
+            & np.isfinite(equity)
+            & (invested.abs() >= 1e-6)
+        )
+
+        # Revenue CAGR between the latest and the oldest of `years + 1` periods
+        rev = long[(long["statement"] == "income") & (long["item"] == "Total Revenue")]
+        rev = rev.sort_values(["ticker", "position"]).groupby("ticker")
+        first = rev.head(1).set_index("ticker")["value"].reindex(tickers)
+        last = rev.tail(1).set_index("ticker")["value"].reindex(tickers)
+        with np.errstate(all="ignore"):
+            revenue_cagr = (first / last) ** (1 / years) - 1
+
+        result = pd.DataFrame(
+            {
+                "roic": roic,
+                "roe": ratio(net_income, equity),
+                "fcf_yield": ratio(
+                    col("cashflow", "Free Cash Flow"), info["marketCap"]
+                ),
+                "revenue_cagr": revenue_cagr,
+                "debt_to_equity": ratio(debt, equity),
+            },
+            index=tickers,
+        )
+        return result.astype(float)
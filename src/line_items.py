@@ -0,0 +1,102 @@
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from src.models.financials import Financials
+
+# Canonical line item -> known source labels, highest priority first. The
+# canonical name is always the first label.
+LINE_ITEM_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "EBIT": (
+        "EBIT",
+        "Ebit",
+        "Operating Income",
+        "OperatingIncome",
+        "Total Operating Income As Reported",
+    ),
+    "Net Income": (
+        "Net Income",
+        "NetIncome",
+        "Net Income Common Stockholders",
+        "Net Income From Continuing Operation Net Minority Interest",
+    ),
+    "Interest Expense": (
+        "Interest Expense",
+        "InterestExpense",
+        "Interest Expense Non Operating",
+    ),
+    "Total Revenue": ("Total Revenue", "TotalRevenue", "Operating Revenue"),
+    "Long Term Debt": (
+        "Long Term Debt",
+        "LongTermDebt",
+        "Long Term Debt And Capital Lease Obligation",
+    ),
+    "Stockholders Equity": (
+        "Stockholders Equity",
+        "StockholdersEquity",
+        "Total Stockholder Equity",
+        "Common Stock Equity",
+    ),
+    "Free Cash Flow": ("Free Cash Flow", "FreeCashFlow"),
+}
+
+# Source label -> (canonical item, priority); built once at import
+LABEL_INDEX: Dict[str, Tuple[str, int]] = {
+    label: (canonical, rank)
+    for canonical, labels in LINE_ITEM_SYNONYMS.items()
+    for rank, label in enumerate(labels)
+}
+
+
+class LineItems:
+    """Resolve statement line items by canonical name.
+
+    `normalize` renames, per canonical item, the highest-priority source label
+    present in a statement to the canonical name (other synonyms keep their
+    labels). It is idempotent, and on a normalized frame `get`/`find` are a
+    single index lookup; raw frames fall back to probing the synonyms.
+    """
+
+    @staticmethod
+    def normalize(df: pd.DataFrame) -> pd.DataFrame:
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            return df
+        best: Dict[str, Tuple[int, str]] = {}
+        for label in df.index:
+            hit = LABEL_INDEX.get(label) if isinstance(label, str) else None
+            if hit is None:
+                continue
+            canonical, rank = hit
+            if canonical not in best or rank < best[canonical][0]:
+                best[canonical] = (rank, label)
+        renames = {
+            label: canonical
+            for canonical, (_, label) in best.items()
+            if label != canonical
+        }
+        return df.rename(index=renames) if renames else df
+
+    @staticmethod
+    def normalize_financials(fin: Financials) -> Financials:
+        return Financials(
+            income=LineItems.normalize(fin.income),
+            balance=LineItems.normalize(fin.balance),
+            cashflow=LineItems.normalize(fin.cashflow),
+            info=fin.info,
+        )
+
+    @staticmethod
+    def find(df: pd.DataFrame, item: str) -> pd.Series | None:
+        """Row for canonical `item` (or a plain label), or None when absent."""
+        for label in LINE_ITEM_SYNONYMS.get(item, (item,)):
+            if label in df.index:
+                return df.loc[label]
+        return None
+
+    @staticmethod
+    def get(df: pd.DataFrame, item: str) -> pd.Series:
+        """Like `find` but raises `KeyError` when the item is absent."""
+        row = LineItems.find(df, item)
+        if row is None:
+            raise KeyError(f"{item} not found in statement")
+        return row
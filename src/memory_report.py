@@ -0,0 +1,58 @@
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from src.data_source import DataSource
+from src.research_tool import ResearchTool
+
+
+class MemoryReport:
+    """Compare the memory footprint of the full and lean load paths."""
+
+    @staticmethod
+    def measure(fn: Callable[[], object]) -> Tuple[object, int, int, float]:
+        """Run `fn` under tracemalloc; return `(result, current, peak, seconds)`.
+
+        `current` is what is still allocated when `fn` returns (and its
+        result is alive); `peak` is the high-water mark during the call.
+        """
+        tracemalloc.start()
+        try:
+            t0 = time.perf_counter()
+            result = fn()
+            seconds = time.perf_counter() - t0
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return result, current, peak, seconds
+
+    @staticmethod
+    def compare(source: DataSource, tickers: List[str]) -> pd.DataFrame:
+        """Memory of the full vs lean path for `tickers` loaded from `source`.
+
+        Columns (MiB): `held_mb` is the memory of keeping every ticker's
+        fetched record at once (what a batch load holds) and `load_peak_mb`
+        the peak of `ResearchTool.load(batch_kpis=True)`.
+        """
+        rows: List[Dict] = []
+        mib = 1024 * 1024
+        for mode, lean in (("full", False), ("lean", True)):
+            tool = ResearchTool(tickers, source=source)
+            fetch = tool.fetcher(lean)
+            _, held, _, _ = MemoryReport.measure(lambda: [fetch(t) for t in tickers])
+
+            tool = ResearchTool(tickers, source=source)
+            _, _, peak, seconds = MemoryReport.measure(
+                lambda: tool.load(batch_kpis=True, lean=lean)
+            )
+            rows.append(
+                {
+                    "mode": mode,
+                    "held_mb": held / mib,
+                    "load_peak_mb": peak / mib,
+                    "load_seconds": seconds,
+                }
+            )
+        return pd.DataFrame(rows).set_index("mode")
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+@dataclass
+class BacktestResult:
+    """Output of `PortfolioEngine.run` for one or many portfolios.
+
+    `returns` and `cumulative` are dates x portfolios; `metrics` has one row
+    per portfolio (see `Backtester.portfolio_metrics`). `weights` holds the
+    target weights at each rebalance (dates x tickers) when the engine
+    derived them itself, e.g. in a walk-forward run. `turnover` is the
+    traded fraction of each portfolio at every rebalance date.
+    """
+
+    returns: pd.DataFrame
+    cumulative: pd.DataFrame
+    metrics: pd.DataFrame
+    weights: pd.DataFrame | None = None
+    turnover: pd.DataFrame | None = None
@@ -0,0 +1,134 @@
+from dataclasses import fields
+import math
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from src.models.kpis import KPIs
+from src.models.stock import Stock
+
+KPI_COLUMNS = [f.name for f in fields(KPIs)]
+
+
+class StockView:
+    """Thin `Stock`-like view onto one row of a `KPITable`.
+
+    Reading attributes goes to the table columns; assigning `score` writes
+    back into the table, so code written against `Stock` objects keeps working.
+    """
+
+    __slots__ = ("_table", "_pos")
+
+    def __init__(self, table: "KPITable", pos: int):
+        self._table = table
+        self._pos = pos
+
+    def _get(self, column: str):
+        return self._table.frame[column].iat[self._pos]
+
+    @property
+    def ticker(self) -> str:
+        return self._get("ticker")
+
+    @property
+    def name(self) -> str | None:
+        return self._get("name")
+
+    @property
+    def sector(self) -> str:
+        return self._get("sector")
+
+    @property
+    def kpis(self) -> KPIs:
+        values = {}
+        for k in KPI_COLUMNS:
+            v = float(self._get(k))
+            values[k] = None if math.isnan(v) else v
+        return KPIs(**values)
+
+    @property
+    def score(self) -> float:
+        return float(self._get("score"))
+
+    @score.setter
+    def score(self, value: float) -> None:
+        frame = self._table.frame
+        frame.iat[self._pos, frame.columns.get_loc("score")] = float(value)
+
+    def __repr__(self) -> str:
+        return (
+            f"StockView(ticker={self.ticker!r}, sector={self.sector!r}, "
+            f"score={self.score!r})"
+        )
+
+
+class KPITable:
+    """Columnar universe representation: one row per stock.
+
+    Columns are `ticker`, `name`, `sector`, one float column per KPI (NaN
+    when missing) and `score`. Scoring, ranking and exports operate on the
+    columns directly; iterating yields `StockView` rows for code that expects
+    `Stock` objects.
+    """
+
+    COLUMNS = ["ticker", "name", "sector", *KPI_COLUMNS, "score"]
+
+    def __init__(self, frame: pd.DataFrame | None = None):
+        if frame is None:
+            frame = pd.DataFrame(columns=self.COLUMNS)
+        frame = frame.reindex(columns=self.COLUMNS).reset_index(drop=True)
+        for k in KPI_COLUMNS:
+            frame[k] = pd.to_numeric(frame[k], errors="coerce").astype(float)
+        frame["score"] = frame["score"].fillna(0.0).astype(float)
+        self.frame = frame
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Iterable]) -> "KPITable":
+        return cls(pd.DataFrame({k: list(v) for k, v in columns.items()}))
+
+    @classmethod
+    def from_stocks(cls, stocks: List[Stock]) -> "KPITable":
+        columns: Dict[str, list] = {c: [] for c in cls.COLUMNS}
+        for s in stocks:
+            columns["ticker"].append(s.ticker)
+            columns["name"].append(s.name)
+            columns["sector"].append(s.sector)
+            columns["score"].append(s.score)
+            for k in KPI_COLUMNS:
+                v = getattr(s.kpis, k, None)
+                columns[k].append(v if isinstance(v, (int, float)) else np.nan)
+        return cls.from_columns(columns)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __iter__(self) -> Iterator[StockView]:
+        return (StockView(self, i) for i in range(len(self.frame)))
+
+    def views(self) -> List[StockView]:
+        return list(self)
+
+    def kpi_matrix(self) -> pd.DataFrame:
+        """KPI columns as a float matrix with non-finite values set to NaN."""
+        matrix = self.frame[KPI_COLUMNS]
+        return matrix.where(np.isfinite(matrix))
+
+    def ranked(self) -> pd.DataFrame:
+        """Rows sorted by score, highest first (ties keep universe order)."""
+        return self.frame.sort_values("score", ascending=False, kind="stable")
+
+    def ranked_views(self) -> List[StockView]:
+        return [StockView(self, i) for i in self.ranked().index]
+
+    def to_stocks(self) -> List[Stock]:
+        return [
+            Stock(
+                ticker=v.ticker,
+                name=v.name,
+                sector=v.sector,
+                kpis=v.kpis,
+                score=v.score,
+            )
+            for v in self
+        ]
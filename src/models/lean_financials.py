@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.line_items import LineItems
+from src.models.financials import Financials
+
+# Info fields the pipeline reads (name, sector, market cap, tax rate and the
+# share count / quote `WalkForward` uses for historical market caps)
+LEAN_INFO_KEYS = (
+    "longName",
+    "shortName",
+    "sector",
+    "marketCap",
+    "taxRate",
+    "sharesOutstanding",
+    "currentPrice",
+)
+
+
+@dataclass(slots=True)
+class LeanFinancials:
+    """Compact stand-in for `Financials` with only the fields the KPIs use.
+
+    Each statement is kept as `(items, periods, values)` with a float array
+    of the selected canonical line items over the most recent periods, and
+    `info` holds only `LEAN_INFO_KEYS`. `income`, `balance` and `cashflow`
+    rebuild small DataFrames on access, so KPI code works unchanged.
+    """
+
+    info: Dict
+    statements: Dict[str, Tuple[Tuple, Tuple, np.ndarray]]
+
+    @classmethod
+    def from_financials(
+        cls, fin: Financials, items: Dict[str, List[str]], periods: int | None = 4
+    ) -> "LeanFinancials":
+        """Keep `items` (statement -> canonical line items) of `fin`.
+
+        Only the `periods` most recent periods are kept; None keeps them all.
+        """
+        statements = {}
+        for name, wanted in items.items():
+            df = getattr(fin, name, None)
+            if not isinstance(df, pd.DataFrame) or df.empty:
+                statements[name] = ((), (), np.empty((0, 0)))
+                continue
+            df = LineItems.normalize(df)
+            sub = df.loc[df.index.isin(wanted)].iloc[:, :periods]
+            sub = sub[~sub.index.duplicated(keep="first")]
+            values = pd.to_numeric(pd.Series(sub.to_numpy().ravel()), errors="coerce")
+            statements[name] = (
+                tuple(sub.index),
+                tuple(sub.columns),
+                values.to_numpy(dtype=float).reshape(sub.shape),
+            )
+        info = fin.info or {}
+        return cls(
+            info={k: info[k] for k in LEAN_INFO_KEYS if k in info},
+            statements=statements,
+        )
+
+    def _frame(self, name: str) -> pd.DataFrame:
+        index, columns, values = self.statements.get(name, ((), (), None))
+        if not index:
+            return pd.DataFrame()
+        return pd.DataFrame(values, index=list(index), columns=list(columns))
+
+    @property
+    def income(self) -> pd.DataFrame:
+        return self._frame("income")
+
+    @property
+    def balance(self) -> pd.DataFrame:
+        return self._frame("balance")
+
+    @property
+    def cashflow(self) -> pd.DataFrame:
+        return self._frame("cashflow")
@@ -0,0 +1,128 @@
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.kpi_table import KPITable
+from src.score_engine import ScoringEngine
+
+
+class PercentileIndex:
+    """Sorted per-(sector, KPI) value arrays for percentile lookups.
+
+    Built once from a KPI matrix in O(n log n); each lookup is two
+    `searchsorted` calls, so ranking all stocks of a sector costs
+    O(n log n) instead of rescanning the values per stock. Queries need not
+    be part of the index, which makes it usable for scoring hypothetical or
+    new tickers against an existing universe without rebuilding it.
+
+    Percentiles follow `scipy.stats.percentileofscore(..., kind="rank") / 100`.
+    Missing sectors (None/NaN) form one group; non-finite values are ignored
+    when building and map to NaN when queried.
+    """
+
+    def __init__(self, kpis: Iterable[str] | None = None):
+        self.kpis: List[str] = list(ScoringEngine.KPI_WEIGHTS if kpis is None else kpis)
+        self._sorted: Dict[Tuple[Hashable, str], np.ndarray] = {}
+
+    @staticmethod
+    def sector_key(sector) -> Hashable:
+        return None if pd.isna(sector) else sector
+
+    @staticmethod
+    def _groups(sectors) -> Dict[Hashable, np.ndarray]:
+        """Row positions per sector key."""
+        groups: Dict[Hashable, List[int]] = {}
+        for i, sector in enumerate(sectors):
+            groups.setdefault(PercentileIndex.sector_key(sector), []).append(i)
+        return {k: np.asarray(v, dtype=int) for k, v in groups.items()}
+
+    @classmethod
+    def build(cls, matrix: pd.DataFrame, sectors) -> "PercentileIndex":
+        """Index the columns of `matrix` (stocks x KPIs) grouped by `sectors`."""
+        index = cls(matrix.columns)
+        for sector, rows in cls._groups(sectors).items():
+            for kpi in index.kpis:
+                values = matrix[kpi].to_numpy(dtype=float)[rows]
+                index._sorted[(sector, kpi)] = np.sort(values[np.isfinite(values)])
+        return index
+
+    @classmethod
+    def from_table(cls, table: KPITable) -> "PercentileIndex":
+        matrix = table.kpi_matrix()[list(ScoringEngine.KPI_WEIGHTS)]
+        return cls.build(matrix, table.frame["sector"])
+
+    def to_records(self) -> List[Dict]:
+        """JSON-friendly `[{sector, kpi, values}]` dump of the index."""
+        return [
+            {"sector": sector, "kpi": kpi, "values": arr.tolist()}
+            for (sector, kpi), arr in self._sorted.items()
+        ]
+
+    @classmethod
+    def from_records(
+        cls, records: List[Dict], kpis: Iterable[str] | None = None
+    ) -> "PercentileIndex":
+        index = cls(kpis)
+        for rec in records:
+            values = np.sort(np.asarray(rec["values"], dtype=float))
+            index._sorted[(cls.sector_key(rec["sector"]), rec["kpi"])] = values
+        return index
+
+    def sectors(self) -> set:
+        return {sector for sector, _ in self._sorted}
+
+    def values(self, sector, kpi: str) -> np.ndarray:
+        """Sorted finite values of `kpi` in `sector` (empty if unknown)."""
+        return self._sorted.get((self.sector_key(sector), kpi), np.empty(0))
+
+    def insert(self, sector, kpi: str, value: float) -> None:
+        if np.isfinite(value):
+            key = (self.sector_key(sector), kpi)
+            arr = self._sorted.get(key, np.empty(0))
+            self._sorted[key] = np.insert(arr, np.searchsorted(arr, value), value)
+
+    def remove(self, sector, kpi: str, value: float) -> None:
+        """Remove one occurrence of `value` (which must be indexed)."""
+        if np.isfinite(value):
+            key = (self.sector_key(sector), kpi)
+            arr = self._sorted[key]
+            self._sorted[key] = np.delete(arr, np.searchsorted(arr, value))
+
+    @staticmethod
+    def rank(sorted_values: np.ndarray, values) -> np.ndarray:
+        """Percentile ranks (0-1] of `values` within `sorted_values`."""
+        values = np.asarray(values, dtype=float)
+        out = np.full(values.shape, np.nan)
+        n = len(sorted_values)
+        finite = np.isfinite(values)
+        if n and finite.any():
+            left = np.searchsorted(sorted_values, values[finite], side="left")
+            right = np.searchsorted(sorted_values, values[finite], side="right")
+            out[finite] = (left + right + (right > left)) / (2.0 * n)
+        return out
+
+    def percentile(self, sector, kpi: str, values) -> np.ndarray:
+        return self.rank(self.values(sector, kpi), values)
+
+    def percentile_matrix(self, matrix: pd.DataFrame, sectors) -> pd.DataFrame:
+        """Percentiles of each row of `matrix` within its sector's index.
+
+        Same layout as `ScoringEngine.percentile_matrix` (inverse KPIs
+        flipped), but ranked against the indexed universe instead of the
+        rows themselves.
+        """
+        out = np.full((len(matrix), len(self.kpis)), np.nan)
+        for sector, rows in self._groups(sectors).items():
+            for j, kpi in enumerate(self.kpis):
+                values = matrix[kpi].to_numpy(dtype=float)[rows]
+                out[rows, j] = self.percentile(sector, kpi, values)
+        pct = pd.DataFrame(out, index=matrix.index, columns=self.kpis)
+        for kpi in ScoringEngine.INVERSE_KPIS & set(pct.columns):
+            pct[kpi] = 1 - pct[kpi]
+        return pct
+
+    def score(self, matrix: pd.DataFrame, sectors) -> np.ndarray:
+        """Weighted scores of `matrix` rows against the index (0 if not finite)."""
+        scores = ScoringEngine._weighted_sum(self.percentile_matrix(matrix, sectors))
+        return np.where(np.isfinite(scores), scores, 0.0)
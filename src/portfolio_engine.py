@@ -0,0 +1,212 @@
+from typing import List, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backtest_engine import Backtester
+from src.models.backtest_result import BacktestResult
+
+
+class PortfolioEngine:
+    """Vectorized backtests of many weighted portfolios over a returns matrix.
+
+    `returns` is dates x tickers (NaN where a ticker has no return that
+    day). Target weights are rebalanced to on the first trading day of every
+    `rebalance` period ("D", "W", "M", "Q", "Y", or None for buy-and-hold)
+    and drift with prices in between. At each rebalance, tickers without a
+    return that day are dropped and the remaining targets renormalized, so
+    daily rebalancing of equal weights reproduces `Backtester.backtest`.
+    Turnover is tracked at every rebalance and can be charged with
+    basis-point trading costs and slippage (see `simulate`).
+
+    Work is vectorized over portfolios and tickers; the only Python loop is
+    over rebalance periods.
+    """
+
+    @staticmethod
+    def rebalance_positions(index: pd.Index, rebalance: str | None) -> np.ndarray:
+        """Row positions of the first trading day of each rebalance period."""
+        if len(index) == 0:
+            return np.empty(0, dtype=int)
+        if rebalance is None:
+            return np.array([0])
+        if rebalance == "D":
+            return np.arange(len(index))
+        if not isinstance(index, pd.DatetimeIndex):
+            raise ValueError("periodic rebalancing needs a DatetimeIndex")
+        periods = index.to_period(rebalance)
+        changes = np.r_[True, periods[1:] != periods[:-1]]
+        return np.flatnonzero(changes)
+
+    @staticmethod
+    def equal_weights(
+        selections: Mapping[str, List[str]], tickers: List[str] | None = None
+    ) -> pd.DataFrame:
+        """Static equal-weight targets (portfolios x tickers) from ticker lists."""
+        if tickers is None:
+            tickers = sorted({t for sel in selections.values() for t in sel})
+        frame = pd.DataFrame(0.0, index=list(selections), columns=tickers)
+        for name, selected in selections.items():
+            selected = [t for t in dict.fromkeys(selected) if t in frame.columns]
+            if selected:
+                frame.loc[name, selected] = 1.0 / len(selected)
+        return frame
+
+    @staticmethod
+    def _targets(
+        weights, index: pd.Index, tickers: List[str], positions: np.ndarray
+    ) -> tuple[List[str], np.ndarray]:
+        """Target weights at each rebalance: (names, K x portfolios x tickers).
+
+        `weights` is either static targets (a portfolios x tickers frame, or a
+        Series for one portfolio) or schedules: a dates x tickers frame for
+        one portfolio, or a mapping name -> such frame. A schedule row applies
+        from the first trading day on or after its date; before the first
+        row the portfolio is not invested.
+        """
+        if isinstance(weights, pd.Series):
+            weights = weights.to_frame(weights.name or "portfolio").T
+        if isinstance(weights, pd.DataFrame) and not isinstance(
+            weights.index, pd.DatetimeIndex
+        ):
+            static = weights.reindex(columns=tickers).fillna(0.0).to_numpy(float)
+            return list(weights.index), np.broadcast_to(
+                static, (len(positions), *static.shape)
+            )
+
+        schedules = weights if isinstance(weights, Mapping) else {"portfolio": weights}
+        names = list(schedules)
+        targets = np.zeros((len(positions), len(names), len(tickers)))
+        dates = index[positions]
+        for j, name in enumerate(names):
+            schedule = schedules[name].sort_index()
+            values = schedule.reindex(columns=tickers).fillna(0.0).to_numpy(float)
+            rows = np.searchsorted(schedule.index, dates, side="right") - 1
+            active = rows >= 0
+            targets[active, j] = values[rows[active]]
+        return names, targets
+
+    @staticmethod
+    def _schedule_positions(weights, index: pd.Index) -> np.ndarray:
+        if isinstance(weights, pd.DataFrame) and isinstance(
+            weights.index, pd.DatetimeIndex
+        ):
+            dates = [weights.index]
+        elif isinstance(weights, Mapping):
+            dates = [w.index for w in weights.values()]
+        else:
+            return np.empty(0, dtype=int)
+        pos = np.concatenate([np.searchsorted(index, d, side="left") for d in dates])
+        return pos[pos < len(index)]
+
+    @staticmethod
+    def simulate(
+        returns: pd.DataFrame,
+        weights,
+        rebalance: str | None = "M",
+        cost_bps: float = 0.0,
+        slippage_bps: float = 0.0,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Daily returns (dates x portfolios) and turnover per rebalance.
+
+        Between rebalances the holdings drift with prices. At each rebalance
+        the turnover is `sum(|target - drifted|)` over tickers, so entering
+        the market from cash counts as 1. Trading costs of `cost_bps +
+        slippage_bps` per unit of turnover are taken out of the portfolio
+        value at the rebalance. When a portfolio leaves the market, its
+        liquidation is charged to the last day it was invested.
+        """
+        tickers = list(returns.columns)
+        positions = np.union1d(
+            PortfolioEngine.rebalance_positions(returns.index, rebalance),
+            PortfolioEngine._schedule_positions(weights, returns.index),
+        ).astype(int)
+        names, targets = PortfolioEngine._targets(
+            weights, returns.index, tickers, positions
+        )
+        rate = (cost_bps + slippage_bps) / 1e4
+
+        values = returns.to_numpy(dtype=float)
+        valid = np.isfinite(values)
+        growth_rates = 1.0 + np.where(valid, values, 0.0)
+        out = np.full((len(returns), len(names)), np.nan)
+        turnover = np.zeros((len(positions), len(names)))
+        # Weights held going into the next rebalance (zero when in cash)
+        drifted = np.zeros((len(names), len(tickers)))
+
+        bounds = np.r_[positions, len(returns)]
+        for k, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            w = targets[k] * valid[start]
+            total = w.sum(axis=1)
+            invested = total > 0
+            w[invested] /= total[invested, None]
+            w[~invested] = 0.0
+            turnover[k] = np.abs(w - drifted).sum(axis=1)
+            charge = rate * turnover[k]
+
+            exiting = ~invested & (charge > 0)
+            if start > 0 and exiting.any():
+                last = out[start - 1, exiting]
+                out[start - 1, exiting] = (1 + last) * (1 - charge[exiting]) - 1
+
+            drifted = np.zeros_like(drifted)
+            if not invested.any():
+                continue
+            held = w[invested]
+            # Value of each portfolio over the period, starting at 1
+            growth = np.cumprod(growth_rates[start:stop], axis=0)
+            value = growth @ held.T
+            drifted[invested] = held * growth[-1] / value[-1][:, None]
+            value = value * (1 - charge[invested])
+            previous = np.vstack([np.ones((1, value.shape[1])), value[:-1]])
+            out[start:stop, invested] = value / previous - 1
+
+        return (
+            pd.DataFrame(out, index=returns.index, columns=names),
+            pd.DataFrame(turnover, index=returns.index[positions], columns=names),
+        )
+
+    @staticmethod
+    def portfolio_returns(
+        returns: pd.DataFrame,
+        weights,
+        rebalance: str | None = "M",
+        cost_bps: float = 0.0,
+        slippage_bps: float = 0.0,
+    ) -> pd.DataFrame:
+        """Daily returns (dates x portfolios) of the weighted portfolios."""
+        daily, _ = PortfolioEngine.simulate(
+            returns, weights, rebalance, cost_bps, slippage_bps
+        )
+        return daily
+
+    @staticmethod
+    def run(
+        returns: pd.DataFrame,
+        weights,
+        rebalance: str | None = "M",
+        risk_free: float = 0.0,
+        cost_bps: float = 0.0,
+        slippage_bps: float = 0.0,
+    ) -> BacktestResult:
+        """Backtest every portfolio in `weights` against `returns`.
+
+        See the class docstring for the accepted `weights` shapes and the
+        rebalancing rules, and `simulate` for costs. Metrics use
+        `Backtester.portfolio_metrics`, plus `turnover` per year. The annual
+        figure leaves out each portfolio's initial build from cash, so buy
+        and hold reports 0; `result.turnover` still records it.
+        """
+        daily, turnover = PortfolioEngine.simulate(
+            returns, weights, rebalance, cost_bps, slippage_bps
+        )
+        metrics = Backtester.portfolio_metrics(daily, risk_free=risk_free)
+        years = daily.count() / 252
+        traded = turnover.where(turnover.ne(0).cumsum().gt(1), 0.0)
+        metrics["turnover"] = (traded.sum() / years).where(years > 0)
+        return BacktestResult(
+            returns=daily,
+            cumulative=Backtester.cumulative_returns(daily),
+            metrics=metrics,
+            turnover=turnover,
+        )
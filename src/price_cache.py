@@ -0,0 +1,120 @@
+import json
+from pathlib import Path
+import pickle
+import threading
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from src.cache_utils import atomic_write_bytes, atomic_write_json
+
+
+class PriceCache:
+    """Local cache of daily close prices keyed by ticker and covered date range.
+
+    Each ticker has one pickled close series under `prices/<TICKER>.pkl` and
+    an entry in `prices/index.json` recording the contiguous `[start, end)`
+    range that has already been requested from the provider. `missing()`
+    returns the sub-ranges of a request that still need fetching, so repeated
+    or extended backtests only download the new days.
+    """
+
+    def __init__(self, cache_dir: str | None = None):
+        repo_root = Path(__file__).resolve().parents[1]
+        base = Path(cache_dir) if cache_dir else repo_root / ".cache"
+        self.root = base / "prices"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict:
+        if not self.index_file.exists():
+            return {}
+        try:
+            with self.index_file.open("r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except Exception:
+            return {}
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.replace('/', '_')}.pkl"
+
+    def _read(self, ticker: str) -> pd.Series:
+        try:
+            with self._path(ticker).open("rb") as fh:
+                return pickle.load(fh)
+        except Exception:
+            return pd.Series(dtype=float)
+
+    def missing(self, ticker: str, start: str, end: str) -> List[Tuple[str, str]]:
+        """Return the `[start, end)` ranges not yet covered for `ticker`.
+
+        Gaps between the cached range and the request are included so the
+        cached range stays contiguous.
+        """
+        entry = self._index.get(ticker)
+        if not entry or not self._path(ticker).exists():
+            return [(start, end)]
+        return PriceCache.uncovered(entry, start, end)
+
+    @staticmethod
+    def uncovered(entry: Dict, start: str, end: str) -> List[Tuple[str, str]]:
+        """Parts of `[start, end)` outside the covered range `entry`."""
+        req_start, req_end = pd.Timestamp(start), pd.Timestamp(end)
+        cov_start, cov_end = pd.Timestamp(entry["start"]), pd.Timestamp(entry["end"])
+        out = []
+        if req_start < cov_start:
+            out.append((start, entry["start"]))
+        if req_end > cov_end:
+            out.append((entry["end"], end))
+        return out
+
+    def get(self, ticker: str, start: str, end: str) -> pd.Series:
+        series = self._read(ticker)
+        if series.empty:
+            return series
+        mask = (series.index >= pd.Timestamp(start)) & (
+            series.index < pd.Timestamp(end)
+        )
+        return series[mask]
+
+    def frame(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        """Cached prices of `tickers` in `[start, end)` (dates x tickers)."""
+        return pd.DataFrame({t: self.get(t, start, end) for t in tickers}).reindex(
+            columns=tickers
+        )
+
+    def update(self, ticker: str, series: pd.Series, start: str, end: str) -> None:
+        """Merge newly fetched prices for `[start, end)` into the cache."""
+        self.write(series.rename(ticker).to_frame(), coverage=(start, end))
+
+    def write(
+        self, prices: pd.DataFrame, coverage: Tuple[str, str] | None = None
+    ) -> None:
+        """Merge every column of `prices` (dates x tickers) into the cache.
+
+        With `coverage`, the `[start, end)` range is recorded as fetched for
+        every column, including columns without any price in it. The index
+        is saved once per call.
+        """
+        with self._lock:
+            for ticker in prices.columns:
+                existing = self._read(ticker)
+                parts = [p for p in (existing, prices[ticker].dropna()) if not p.empty]
+                merged = pd.concat(parts) if parts else pd.Series(dtype=float)
+                merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+                merged.name = ticker
+                atomic_write_bytes(
+                    self._path(ticker),
+                    pickle.dumps(merged, protocol=pickle.HIGHEST_PROTOCOL),
+                )
+
+                if coverage is not None:
+                    start, end = coverage
+                    entry = self._index.get(ticker)
+                    if entry:
+                        start = min(start, entry["start"], key=pd.Timestamp)
+                        end = max(end, entry["end"], key=pd.Timestamp)
+                    self._index[ticker] = {"start": start, "end": end}
+            atomic_write_json(self.index_file, self._index)
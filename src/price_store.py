@@ -0,0 +1,261 @@
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.cache_utils import atomic_write_bytes, atomic_write_json
+from src.price_cache import PriceCache
+
+
+class PriceStore:
+    """Memory-mapped local store of daily prices (dates x tickers per field).
+
+    Layout under `price_store/`::
+
+        index.json      tickers (column order), column capacity, fields,
+                        file generation and the covered [start, end) range
+                        per ticker
+        dates.i8        int64 nanosecond timestamps, one per row, ascending
+        <field>.f64     float64 matrix, row-major, rows = dates,
+                        columns = `capacity` ticker slots (NaN = no price)
+
+    Files of generation `g > 0` are named `dates.<g>.i8` / `<field>.<g>.f64`.
+
+    Reads map the field file with `numpy.memmap` and slice it, so loading a
+    window for a contiguous block of tickers copies nothing. New trading days
+    after the last stored date are appended to the end of each file; new
+    tickers fill spare column slots. Only out-of-order dates or running out
+    of slots rewrite the files (capacity then doubles). A rewrite goes to
+    files of the next generation, which `index.json` switches to in one
+    atomic replace; the old generation is deleted afterwards, so a crash at
+    any point leaves an index that matches the files it names.
+
+    Offers the `PriceCache` interface (`missing`, `get`, `update`, `write`,
+    `frame`), so it can be passed as `cache` to
+    `YahooFinanceLoader.load_prices` and `Backtester.returns_frame`.
+    """
+
+    def __init__(self, cache_dir: str | None = None, capacity: int = 64):
+        repo_root = Path(__file__).resolve().parents[1]
+        base = Path(cache_dir) if cache_dir else repo_root / ".cache"
+        self.root = base / "price_store"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._index = self._load_index(capacity)
+        self._columns = {t: i for i, t in enumerate(self._index["tickers"])}
+        self._rebuilt = False
+
+    def _load_index(self, capacity: int) -> Dict:
+        empty = {"capacity": capacity, "tickers": [], "fields": [], "coverage": {}}
+        if not self.index_file.exists():
+            return empty
+        try:
+            with self.index_file.open("r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except Exception:
+            return empty
+
+    def _suffix(self, generation: int | None = None) -> str:
+        if generation is None:
+            generation = self._index.get("generation", 0)
+        return f".{generation}" if generation else ""
+
+    def _field_path(self, field: str, generation: int | None = None) -> Path:
+        return self.root / f"{field}{self._suffix(generation)}.f64"
+
+    @property
+    def dates_file(self) -> Path:
+        return self.root / f"dates{self._suffix()}.i8"
+
+    @property
+    def capacity(self) -> int:
+        return self._index["capacity"]
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self._index["tickers"])
+
+    def dates(self) -> pd.DatetimeIndex:
+        if not self.dates_file.exists():
+            return pd.DatetimeIndex([])
+        return pd.DatetimeIndex(np.fromfile(self.dates_file, dtype="<i8"))
+
+    def matrix(self, field: str = "close", n_dates: int | None = None) -> np.ndarray:
+        """Read-only memmap of `field` (dates x capacity)."""
+        n = len(self.dates()) if n_dates is None else n_dates
+        path = self._field_path(field)
+        if n == 0 or field not in self._index["fields"] or not path.exists():
+            return np.full((n, self.capacity), np.nan)
+        return np.memmap(path, dtype="<f8", mode="r", shape=(n, self.capacity))
+
+    def frame(
+        self, tickers: List[str], start: str, end: str, field: str = "close"
+    ) -> pd.DataFrame:
+        """Prices of `tickers` in `[start, end)` (dates x tickers).
+
+        Dates where none of `tickers` has a price are left out. The frame is
+        backed by the memmap (no copy) when the tickers occupy consecutive
+        slots in store order and no rows are dropped.
+        """
+        dates = self.dates()
+        lo = dates.searchsorted(pd.Timestamp(start), side="left")
+        hi = dates.searchsorted(pd.Timestamp(end), side="left")
+        block = self.matrix(field, len(dates))[lo:hi]
+
+        cols = np.array([self._columns.get(t, -1) for t in tickers], dtype=int)
+        if len(cols) and (cols >= 0).all() and (np.diff(cols) == 1).all():
+            values = block[:, cols[0] : cols[-1] + 1]
+        else:
+            values = np.full((len(block), len(cols)), np.nan)
+            known = cols >= 0
+            values[:, known] = block[:, cols[known]]
+        index = dates[lo:hi]
+        empty = np.isnan(values).all(axis=1)
+        if empty.any():
+            values, index = values[~empty], index[~empty]
+        return pd.DataFrame(values, index=index, columns=list(tickers), copy=False)
+
+    def get(self, ticker: str, start: str, end: str, field: str = "close") -> pd.Series:
+        return self.frame([ticker], start, end, field)[ticker].dropna()
+
+    def missing(self, ticker: str, start: str, end: str) -> List[Tuple[str, str]]:
+        """Return the `[start, end)` ranges not yet covered for `ticker`."""
+        entry = self._index["coverage"].get(ticker)
+        if not entry:
+            return [(start, end)]
+        return PriceCache.uncovered(entry, start, end)
+
+    def update(
+        self,
+        ticker: str,
+        series: pd.Series,
+        start: str,
+        end: str,
+        field: str = "close",
+    ) -> None:
+        """Merge newly fetched prices for `[start, end)` into the store."""
+        self.write(series.rename(ticker).to_frame(), field, coverage=(start, end))
+
+    def write(
+        self,
+        prices: pd.DataFrame,
+        field: str = "close",
+        coverage: Tuple[str, str] | None = None,
+    ) -> None:
+        """Store `prices` (dates x tickers); NaN never overwrites a price.
+
+        With `coverage`, the `[start, end)` range is recorded as fetched for
+        every column of `prices`.
+        """
+        index = pd.DatetimeIndex(prices.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        index = index.as_unit("ns")
+        with self._lock:
+            self._add_tickers(list(prices.columns))
+            self._add_field(field)
+            dates = self._add_dates(index)
+
+            rows = dates.get_indexer(index)
+            values = prices.to_numpy(dtype=float)
+            mm = np.memmap(
+                self._field_path(field),
+                dtype="<f8",
+                mode="r+",
+                shape=(len(dates), self.capacity),
+            )
+            for j, ticker in enumerate(prices.columns):
+                finite = np.isfinite(values[:, j])
+                mm[rows[finite], self._columns[ticker]] = values[finite, j]
+            mm.flush()
+            del mm
+
+            if coverage is not None:
+                for ticker in prices.columns:
+                    start, end = coverage
+                    entry = self._index["coverage"].get(ticker)
+                    if entry:
+                        start = min(start, entry["start"], key=pd.Timestamp)
+                        end = max(end, entry["end"], key=pd.Timestamp)
+                    self._index["coverage"][ticker] = {"start": start, "end": end}
+            atomic_write_json(self.index_file, self._index)
+            if self._rebuilt:
+                self._remove_stale_files()
+                self._rebuilt = False
+
+    def _add_tickers(self, tickers: List[str]) -> None:
+        new = [t for t in dict.fromkeys(tickers) if t not in self._columns]
+        if not new:
+            return
+        needed = len(self._columns) + len(new)
+        if needed > self.capacity:
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            self._rebuild(self.dates(), capacity)
+        for t in new:
+            self._columns[t] = len(self._index["tickers"])
+            self._index["tickers"].append(t)
+
+    def _add_field(self, field: str) -> None:
+        if field in self._index["fields"]:
+            return
+        blank = np.full((len(self.dates()), self.capacity), np.nan, dtype="<f8")
+        atomic_write_bytes(self._field_path(field), blank.tobytes())
+        self._index["fields"].append(field)
+
+    def _add_dates(self, index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        """Make room for the dates of `index`; returns the stored dates."""
+        dates = self.dates()
+        extra = index.unique().difference(dates).sort_values()
+        if extra.empty:
+            return dates
+        if len(dates) and extra[0] <= dates[-1]:
+            return self._rebuild(dates.union(extra), self.capacity)
+
+        # Append-only: NaN rows at the end of every field, then the dates
+        row_bytes = self.capacity * 8
+        blank = np.full((len(extra), self.capacity), np.nan, dtype="<f8").tobytes()
+        for field in self._index["fields"]:
+            path = self._field_path(field)
+            with path.open("r+b") as fh:
+                fh.truncate(len(dates) * row_bytes)  # drop any torn append
+                fh.seek(0, os.SEEK_END)
+                fh.write(blank)
+        with self.dates_file.open("ab") as fh:
+            fh.write(extra.asi8.astype("<i8").tobytes())
+        return dates.append(extra)
+
+    def _rebuild(self, dates: pd.DatetimeIndex, capacity: int) -> pd.DatetimeIndex:
+        """Rewrite every field for new `dates` and/or column `capacity`.
+
+        The rewrite goes to the next generation's files; the in-memory index
+        points at them, and they take effect when `write` saves it.
+        """
+        old_dates = self.dates()
+        rows = dates.get_indexer(old_dates)
+        generation = self._index.get("generation", 0) + 1
+        for field in self._index["fields"]:
+            old = self.matrix(field, len(old_dates))
+            new = np.full((len(dates), capacity), np.nan, dtype="<f8")
+            new[rows, : old.shape[1]] = old
+            del old
+            atomic_write_bytes(self._field_path(field, generation), new.tobytes())
+        self._index["generation"] = generation
+        atomic_write_bytes(self.dates_file, dates.asi8.astype("<i8").tobytes())
+        self._index["capacity"] = capacity
+        self._rebuilt = True
+        return dates
+
+    def _remove_stale_files(self) -> None:
+        """Delete data files of any generation but the indexed one."""
+        current = {self.dates_file}
+        current.update(self._field_path(f) for f in self._index["fields"])
+        for path in [*self.root.glob("*.f64"), *self.root.glob("*.i8")]:
+            if path not in current:
+                path.unlink(missing_ok=True)
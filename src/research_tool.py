@@ -1,49 +1,353 @@
-from typing import List
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+import warnings
 
 import pandas as pd
 
 from src.backtest_engine import Backtester
-from src.data_loader import YahooFinanceLoader
+from src.concurrency import imap_bounded, map_bounded
+from src.data_source import DataSource, YahooDataSource
+from src.financials_cache import FinancialsCache
+from src.grid_runner import GridRunner
+from src.incremental_scorer import IncrementalScorer
 from src.kpi_calculator import KPICalculator
-from src.models.kpis import KPIs
+from src.models.backtest_result import BacktestResult
+from src.models.financials import Financials
+from src.models.kpi_table import KPI_COLUMNS, KPITable, StockView
+from src.models.lean_financials import LeanFinancials
 from src.models.stock import Stock
+from src.price_cache import PriceCache
 from src.score_engine import ScoringEngine
+from src.score_snapshot import ScoreSnapshot
+from src.walk_forward import WalkForward
+from src.weight_sweep import WeightSweep
+from src.weighting import Weighting
 
 
 class ResearchTool:
 
-    def __init__(self, tickers: List[str]):
+    def __init__(
+        self,
+        tickers: List[str],
+        financials_cache: FinancialsCache | None = None,
+        price_cache: PriceCache | None = None,
+        source: DataSource | None = None,
+    ):
+        """`source` defaults to Yahoo Finance using the given caches."""
         self.tickers = tickers
-        self.stocks: List[Stock] = []
-
-    def load(self):
-        for t in self.tickers:
-            fin = YahooFinanceLoader.load_financials(t)
-            kpis = KPIs(
-                roic=KPICalculator.roic(fin),
-                roe=KPICalculator.roe(fin),
-                fcf_yield=KPICalculator.fcf_yield(fin),
-                revenue_cagr=KPICalculator.revenue_cagr(fin),
-                debt_to_equity=KPICalculator.debt_to_equity(fin),
-            )
-            company_name = fin.info.get("longName") or fin.info.get("shortName") or t
-            self.stocks.append(
-                Stock(
-                    ticker=t,
-                    name=company_name,
-                    sector=fin.info.get("sector", "Unknown"),
-                    kpis=kpis,
-                )
+        self.financials_cache = financials_cache
+        self.price_cache = price_cache
+        self.source = source or YahooDataSource(
+            financials_cache=financials_cache, price_cache=price_cache
+        )
+        self.table = KPITable()
+        self._scorer: IncrementalScorer | None = None
+
+    @property
+    def stocks(self) -> Tuple[StockView, ...]:
+        """Row views onto `table`, kept for code written against `Stock` lists.
+
+        Read-only: a fresh tuple of views is built on every access, so the
+        universe cannot be edited through it (assigning a view's `score`
+        still writes to `table`). Assign a list of `Stock` objects to
+        `stocks` to replace the universe.
+        """
+        return tuple(self.table.views())
+
+    @stocks.setter
+    def stocks(self, stocks: List[Stock]) -> None:
+        self.table = KPITable.from_stocks(stocks)
+
+    def load(
+        self,
+        max_workers: int = 1,
+        timeout: float | None = None,
+        batch_kpis: bool = False,
+        streaming: bool = False,
+        lean: bool = False,
+    ):
+        """Fetch financials for all tickers and compute their KPIs.
+
+        Parameters
+        - max_workers: number of tickers fetched concurrently. The default of 1
+          loads sequentially and propagates loader errors.
+        - timeout: per-ticker timeout in seconds, counted from the start of the
+          fetch (concurrent mode only). A hung fetch is abandoned and its
+          slot handed to the next ticker.
+        - batch_kpis: compute the KPIs for all loaded tickers at once with
+          `KPICalculator.batch` instead of ticker by ticker. This keeps every
+          statement in memory until the fetch completes.
+        - streaming: run through `stream()`, which reduces each ticker to its
+          KPI row as soon as its financials arrive and drops the statements,
+          so peak memory is bounded by the KPI rows rather than the universe's
+          statements. Errors are skipped with a warning as in concurrent mode.
+        - lean: reduce each fetched `Financials` to a `LeanFinancials` record
+          (name, sector, market cap, tax rate and the KPI statement rows)
+          inside the fetch, so full statements and info payloads are never
+          held across tickers. Combines with the other modes.
+
+        In concurrent mode, tickers that fail or time out are skipped with a
+        warning, and the resulting rows keep the universe order. KPI rows are
+        collected column-wise and appended to `table` in one step.
+        """
+        columns: Dict[str, list] = {c: [] for c in KPITable.COLUMNS}
+        try:
+            if streaming:
+                # Rows arrive in completion order; restore the universe order
+                for _, row in sorted(self.stream(max_workers, timeout, lean)):
+                    self._append(columns, row)
+                return
+
+            fetched = self._fetch(max_workers, timeout, lean)
+            if not batch_kpis:
+                for t, fin in fetched:
+                    self._append(columns, self._kpi_row(t, fin))
+                return
+
+            loaded = list(fetched)
+            kpis = KPICalculator.batch(dict(loaded))
+            for t, fin in loaded:
+                row = self._info_row(t, fin)
+                row.update({k: kpis.at[t, k] for k in KPI_COLUMNS})
+                self._append(columns, row)
+        finally:
+            if self.financials_cache is not None and not streaming:
+                self.financials_cache.flush()
+            if columns["ticker"]:
+                loaded = KPITable.from_columns(columns).frame
+                frames = [f for f in (self.table.frame, loaded) if not f.empty]
+                self.table = KPITable(pd.concat(frames, ignore_index=True))
+
+    def fetcher(
+        self, lean: bool = False, periods: int | None = 4
+    ) -> Callable[[str], Financials | LeanFinancials]:
+        """Per-ticker fetch used by `load`; with `lean` it returns `LeanFinancials`.
+
+        Lean records keep the `periods` most recent periods (None: all).
+        """
+        if not lean:
+            return self.source.financials
+
+        def fetch(ticker: str) -> LeanFinancials:
+            fin = self.source.financials(ticker)
+            return LeanFinancials.from_financials(
+                fin, KPICalculator.BATCH_ITEMS, periods=periods
             )
 
+        return fetch
+
+    def _fetch(
+        self,
+        max_workers: int,
+        timeout: float | None,
+        lean: bool = False,
+        periods: int | None = 4,
+    ) -> Iterator[Tuple[str, Financials | LeanFinancials]]:
+        """Yield `(ticker, financials)` in universe order (see `load`)."""
+        fetch = self.fetcher(lean, periods)
+        if max_workers <= 1 and timeout is None:
+            for t in self.tickers:
+                yield t, fetch(t)
+            return
+
+        results = map_bounded(
+            fetch,
+            self.tickers,
+            max_workers=max_workers,
+            timeout=timeout,
+        )
+        for t, (fin, exc) in zip(self.tickers, results):
+            if exc is not None:
+                warnings.warn(f"{t}: error loading financials; skipping ({exc})")
+                continue
+            yield t, fin
+
+    def stream(
+        self, max_workers: int = 8, timeout: float | None = None, lean: bool = False
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Fetch tickers and reduce each one to a KPI row as it arrives.
+
+        Yields `(universe position, row)` in completion order, where `row`
+        maps `KPITable.COLUMNS` to values. Fetches overlap with KPI extraction
+        on a bounded pool, and each ticker's statements are released as soon
+        as its row is built. Failing or timed-out tickers are skipped with a
+        warning; the financials cache is flushed when the stream ends. With
+        `lean`, statements are reduced to `LeanFinancials` inside the fetch.
+        """
+        try:
+            for pos, fin, exc in imap_bounded(
+                self.fetcher(lean), self.tickers, max_workers, timeout
+            ):
+                t = self.tickers[pos]
+                if exc is not None:
+                    warnings.warn(f"{t}: error loading financials; skipping ({exc})")
+                    continue
+                row = self._kpi_row(t, fin)
+                del fin
+                yield pos, row
+        finally:
+            if self.financials_cache is not None:
+                self.financials_cache.flush()
+
+    @staticmethod
+    def _append(columns: Dict[str, list], row: Dict) -> None:
+        for k, v in row.items():
+            columns[k].append(v)
+
+    @staticmethod
+    def _info_row(t: str, fin) -> Dict:
+        return {
+            "ticker": t,
+            "name": fin.info.get("longName") or fin.info.get("shortName") or t,
+            "sector": fin.info.get("sector", "Unknown"),
+            "score": 0.0,
+        }
+
+    @staticmethod
+    def _kpi_row(t: str, fin) -> Dict:
+        row = ResearchTool._info_row(t, fin)
+        row["roic"] = KPICalculator.roic(fin)
+        row["roe"] = KPICalculator.roe(fin)
+        row["fcf_yield"] = KPICalculator.fcf_yield(fin)
+        row["revenue_cagr"] = KPICalculator.revenue_cagr(fin)
+        row["debt_to_equity"] = KPICalculator.debt_to_equity(fin)
+        return row
+
     def evaluate(self):
-        ScoringEngine.score(self.stocks)
+        ScoringEngine.score(self.table)
+
+    def refresh(self, tickers: List[str]) -> Set:
+        """Reload `tickers` and rescore only the sectors they belong to.
+
+        Meant for updates after a full `evaluate()`: an `IncrementalScorer`
+        is kept on `table` and reused across calls. Tickers not yet in the
+        table are added. Returns the rescored sectors.
+        """
+        if self._scorer is None or self._scorer.table is not self.table:
+            self._scorer = IncrementalScorer(self.table)
+        changes = {}
+        for t in tickers:
+            row = self._kpi_row(t, self.source.financials(t))
+            del row["ticker"], row["score"]
+            changes[t] = row
+        if self.financials_cache is not None:
+            self.financials_cache.flush()
+        return self._scorer.update(changes)
+
+    def snapshot(self) -> ScoreSnapshot:
+        """Freeze the current universe for scoring new tickers against it."""
+        return ScoreSnapshot.freeze(self.table)
+
+    def sweep(
+        self,
+        configs,
+        backtest: bool = False,
+        top_n: int = 10,
+        start: str = "2019-01-01",
+        end: str = "2024-01-01",
+    ) -> pd.DataFrame:
+        """Rank KPI weight configurations (see `WeightSweep.rank`).
+
+        With `backtest`, returns are loaded once for the union of all
+        configurations' top-`top_n` tickers and each configuration's
+        portfolio is evaluated from them. `configs` may be anything
+        `WeightSweep.configs_frame` accepts, including a generator; it is
+        read once and the scores are computed once.
+        """
+        configs = WeightSweep.configs_frame(configs)
+        returns = scores = None
+        if backtest:
+            scores = WeightSweep.scores(self.table, configs)
+            tickers = WeightSweep.selected_tickers(scores, top_n)
+            returns = Backtester.returns_frame(tickers, start, end, source=self.source)
+        return WeightSweep.rank(
+            self.table, configs, returns=returns, top_n=top_n, scores=scores
+        )
+
+    def grid(
+        self,
+        configs=None,
+        top_n: Iterable[int] = (10,),
+        windows: Iterable[Tuple[str, str]] = (("2019-01-01", "2024-01-01"),),
+        max_workers: int | None = None,
+    ) -> pd.DataFrame:
+        """Backtest a grid of weightings, cutoffs and windows in parallel.
+
+        Returns for the whole universe are loaded once over the span of all
+        windows and shared with the workers (see `GridRunner.run`).
+        """
+        grid = GridRunner.grid(configs, top_n, windows)
+        start, end = grid["start"].min(), grid["end"].max()
+        tickers = list(self.table.frame["ticker"])
+        returns = Backtester.returns_frame(tickers, start, end, source=self.source)
+        return GridRunner.run(self.table, returns, grid, max_workers=max_workers)
+
+    def walk_forward(
+        self,
+        start: str = "2019-01-01",
+        end: str = "2024-01-01",
+        rebalance: str = "Q",
+        top_n: int = 10,
+        max_workers: int = 1,
+        cost_bps: float = 0.0,
+        slippage_bps: float = 0.0,
+        weighting: str | Sequence[str] = "equal",
+        covariance: str = "ledoit_wolf",
+        lookback: int = 252,
+    ) -> BacktestResult:
+        """Point-in-time backtest of the universe (see `WalkForward.run`).
+
+        Statements are fetched once per ticker (reduced to `LeanFinancials`
+        with every reported period, so early rebalances see their history)
+        and prices once for the whole universe; every rebalance reuses them.
+        For covariance-based `weighting`, prices start early enough to cover
+        `lookback` trading days before `start`.
+        """
+        fins = dict(self._fetch(max_workers, None, lean=True, periods=None))
+        if self.financials_cache is not None:
+            self.financials_cache.flush()
+        schemes = {weighting} if isinstance(weighting, str) else set(weighting)
+        fetch_start = start
+        if schemes & Weighting.NEEDS_COVARIANCE:
+            # Trading days -> calendar days, with room for exchange holidays
+            days = int(lookback * 365 / 252 * 1.1) + 7
+            history = pd.Timestamp(start) - pd.Timedelta(days=days)
+            fetch_start = history.strftime("%Y-%m-%d")
+        prices = self.source.prices(list(fins), fetch_start, end)
+        return WalkForward.run(
+            fins,
+            prices,
+            start,
+            end,
+            rebalance=rebalance,
+            top_n=top_n,
+            cost_bps=cost_bps,
+            slippage_bps=slippage_bps,
+            weighting=weighting,
+            covariance=covariance,
+            lookback=lookback,
+        )
 
     def backtest(self):
-        return Backtester.backtest(self.stocks)
+        return Backtester.backtest(self.stocks, source=self.source)
 
-    def ranking(self) -> List[Stock]:
-        return sorted(self.stocks, key=lambda s: s.score, reverse=True)
+    def ranking(self) -> List[StockView]:
+        return self.table.ranked_views()
+
+    def _export_frame(self) -> pd.DataFrame:
+        ranked = self.table.ranked()
+        return pd.DataFrame(
+            {
+                "ticker": ranked["ticker"],
+                "name": ranked["name"].fillna(""),
+                "sector": ranked["sector"],
+                "score": ranked["score"].round(4),
+                "roic": ranked["roic"],
+                "roe": ranked["roe"],
+                "fcf_yield": ranked["fcf_yield"],
+                "revenue_cagr": ranked["revenue_cagr"],
+                "debt_to_equity": ranked["debt_to_equity"],
+            }
+        )
 
     def export_csv(
         self, path: str = "research_output.csv", sep: str = ",", decimal: str = "."
@@ -55,25 +359,7 @@ class ResearchTool:
         - sep: field separator (use ';' for locales where comma is decimal separator)
         - decimal: decimal point character (default '.')
         """
-        rows = []
-        for s in self.ranking():
-            rows.append(
-                {
-                    "ticker": s.ticker,
-                    "name": s.name or "",
-                    "sector": s.sector,
-                    "score": round(s.score, 4),
-                    "roic": s.kpis.roic,
-                    "roe": s.kpis.roe,
-                    "fcf_yield": s.kpis.fcf_yield,
-                    "revenue_cagr": s.kpis.revenue_cagr,
-                    "debt_to_equity": s.kpis.debt_to_equity,
-                }
-            )
-
-        rows.sort(key=lambda r: r["score"], reverse=True)
-
-        df = pd.DataFrame(rows)
+        df = self._export_frame()
         df.to_csv(path, index=False, sep=sep, decimal=decimal)
 
     def export_xlsx(self, path: str = "research_output.xlsx") -> None:
@@ -82,23 +368,7 @@ class ResearchTool:
         This avoids CSV locale/decimal ambiguity and preserves numeric types in
         the spreadsheet as native numeric cells.
         """
-        rows = []
-        for s in self.ranking():
-            rows.append(
-                {
-                    "ticker": s.ticker,
-                    "name": s.name or "",
-                    "sector": s.sector,
-                    "score": round(s.score, 4),
-                    "roic": s.kpis.roic,
-                    "roe": s.kpis.roe,
-                    "fcf_yield": s.kpis.fcf_yield,
-                    "revenue_cagr": s.kpis.revenue_cagr,
-                    "debt_to_equity": s.kpis.debt_to_equity,
-                }
-            )
-        rows.sort(key=lambda r: r["score"], reverse=True)
-        df = pd.DataFrame(rows)
+        df = self._export_frame()
         # Use pandas to_excel which will write numeric columns as numbers when
         # openpyxl is installed. If openpyxl is missing, pandas will raise a
         # helpful ImportError.
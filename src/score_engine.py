@@ -1,9 +1,11 @@
-from collections import defaultdict
 from typing import List
-from scipy.stats import percentileofscore
 import math
 import warnings
 
+import numpy as np
+import pandas as pd
+
+from src.models.kpi_table import KPITable
 from src.models.stock import Stock
 
 
@@ -20,58 +22,96 @@ class ScoringEngine:
     INVERSE_KPIS = {"debt_to_equity"}
 
     @staticmethod
-    def score(stocks: List[Stock]) -> None:
+    def _as_float(value) -> float:
+        # Only finite int/float values take part in scoring; anything else is NaN
+        if (
+            value is None
+            or not isinstance(value, (int, float))
+            or not math.isfinite(value)
+        ):
+            return float("nan")
+        return float(value)
+
+    @staticmethod
+    def kpi_matrix(stocks: List[Stock]) -> pd.DataFrame:
+        """Build a stocks x KPIs float matrix (NaN for missing/non-finite values)."""
+        kpis = list(ScoringEngine.KPI_WEIGHTS)
+        rows = [
+            [ScoringEngine._as_float(getattr(s.kpis, k, None)) for k in kpis]
+            for s in stocks
+        ]
+        return pd.DataFrame(rows, columns=kpis, dtype=float)
+
+    @staticmethod
+    def percentile_matrix(matrix: pd.DataFrame, sectors) -> pd.DataFrame:
+        """Per-sector percentile ranks (0-1] of each KPI column.
+
+        Equivalent to `scipy.stats.percentileofscore(values, v) / 100` (the
+        default "rank" kind averages ties) computed against the finite values
+        of the same sector. NaN inputs stay NaN; inverse KPIs are flipped.
+        """
+        pct = matrix.groupby(
+            pd.Series(list(sectors), index=matrix.index), dropna=False
+        ).rank(method="average", pct=True)
+        for kpi in ScoringEngine.INVERSE_KPIS & set(pct.columns):
+            pct[kpi] = 1 - pct[kpi]
+        return pct
+
+    @staticmethod
+    def _weighted_sum(pct: pd.DataFrame) -> np.ndarray:
+        # Accumulate weighted percentiles KPI by KPI; missing values add nothing
+        scores = np.zeros(len(pct))
+        for kpi, weight in ScoringEngine.KPI_WEIGHTS.items():
+            scores += np.nan_to_num(pct[kpi].to_numpy() * weight, nan=0.0)
+        return scores
+
+    @staticmethod
+    def score(stocks: List[Stock] | KPITable) -> None:
+        if isinstance(stocks, KPITable):
+            ScoringEngine.score_table(stocks)
+            return
+
         # Reset scores before computing to avoid accumulation across runs
         for s in stocks:
             s.score = 0.0
 
-        grouped = defaultdict(list)
+        if not stocks:
+            return
 
-        for stock in stocks:
-            grouped[stock.sector].append(stock)
+        matrix = ScoringEngine.kpi_matrix(stocks)
+        pct = ScoringEngine.percentile_matrix(matrix, (s.sector for s in stocks))
+        scores = ScoringEngine._weighted_sum(pct)
 
-        for kpi, weight in ScoringEngine.KPI_WEIGHTS.items():
-            for sector, sector_stocks in grouped.items():
-                # Exclude None/NaN/inf values from percentile calculations
-                values = [
-                    v
-                    for v in (getattr(s.kpis, kpi) for s in sector_stocks)
-                    if v is not None
-                    and isinstance(v, (int, float))
-                    and math.isfinite(v)
-                ]
-
-                if not values:
-                    continue
-
-                for s in sector_stocks:
-                    value = getattr(s.kpis, kpi)
-                    if (
-                        value is None
-                        or not isinstance(value, (int, float))
-                        or not math.isfinite(value)
-                    ):
-                        continue
-
-                    pct = percentileofscore(values, value) / 100
-                    if kpi in ScoringEngine.INVERSE_KPIS:
-                        pct = 1 - pct
-
-                    # Guard against NaN propagation
-                    if not math.isfinite(pct):
-                        continue
-
-                    s.score += pct * weight
+        for s, value in zip(stocks, scores):
+            s.score = float(value)
 
         # After scoring, warn about stocks with many missing KPI values and ensure finite scores
+        ScoringEngine._warn_missing((s.ticker for s in stocks), matrix)
         for s in stocks:
-            missing = sum(
-                1 for k in ScoringEngine.KPI_WEIGHTS if getattr(s.kpis, k) is None
-            )
-            if missing >= len(ScoringEngine.KPI_WEIGHTS) / 2:
-                warnings.warn(
-                    f"Stock {s.ticker} has {missing} missing KPI(s); score may be unreliable."
-                )
-
             if not math.isfinite(s.score):
                 s.score = 0.0
+
+    @staticmethod
+    def score_table(table: KPITable) -> None:
+        """Score a `KPITable` in place, working on its columns directly."""
+        frame = table.frame
+        if frame.empty:
+            return
+
+        matrix = table.kpi_matrix()
+        pct = ScoringEngine.percentile_matrix(matrix, frame["sector"])
+        scores = ScoringEngine._weighted_sum(pct)
+        frame["score"] = np.where(np.isfinite(scores), scores, 0.0)
+
+        ScoringEngine._warn_missing(frame["ticker"], matrix)
+
+    @staticmethod
+    def _warn_missing(tickers, matrix: pd.DataFrame) -> None:
+        # A KPI counts as missing when it cannot be scored: None, NaN or inf
+        kpis = list(ScoringEngine.KPI_WEIGHTS)
+        missing = matrix[kpis].isna().sum(axis=1)
+        for ticker, n in zip(tickers, missing):
+            if n >= len(kpis) / 2:
+                warnings.warn(
+                    f"Stock {ticker} has {n} missing KPI(s); score may be unreliable."
+                )
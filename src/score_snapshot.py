@@ -0,0 +1,120 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+import json
+import math
+from pathlib import Path
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from src.cache_utils import atomic_write_json, utc_now_iso
+from src.models.kpi_table import KPITable
+from src.percentile_index import PercentileIndex
+from src.score_engine import ScoringEngine
+
+
+class ScoreSnapshot:
+    """A scored universe frozen for scoring new tickers against it.
+
+    Holds the per-sector KPI distributions (a `PercentileIndex`), the KPI
+    weights and the inverse KPIs in effect when it was taken. Scoring a
+    ticker ranks its KPIs within its sector's frozen distributions, exactly
+    like `ScoringEngine` would for a member of that universe, and never
+    touches the original table. A ticker from an unknown sector scores 0.
+
+    `score_one` is the low-latency path: per sector the values are compiled
+    into plain sorted lists and ranked with `bisect`. `score_many` is the
+    vectorized path for frames of tickers.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        index: PercentileIndex,
+        weights: Dict[str, float] | None = None,
+        inverse: Iterable[str] | None = None,
+        created: str | None = None,
+    ):
+        self.index = index
+        self.weights = dict(ScoringEngine.KPI_WEIGHTS if weights is None else weights)
+        self.inverse = set(ScoringEngine.INVERSE_KPIS if inverse is None else inverse)
+        self.created = created or utc_now_iso()
+        self._compiled: Dict = {}
+        for sector in index.sectors():
+            self._compiled[sector] = [
+                (kpi, w, kpi in self.inverse, index.values(sector, kpi).tolist())
+                for kpi, w in self.weights.items()
+            ]
+
+    @classmethod
+    def freeze(
+        cls, table: KPITable, weights: Dict[str, float] | None = None
+    ) -> "ScoreSnapshot":
+        """Snapshot the KPI distributions of `table` (copied, not referenced)."""
+        return cls(PercentileIndex.from_table(table), weights)
+
+    def score_one(self, sector, kpis) -> float:
+        """Score one ticker; `kpis` is a `KPIs`-like object or a mapping."""
+        get = (
+            kpis.get if isinstance(kpis, Mapping) else lambda k: getattr(kpis, k, None)
+        )
+        score = 0.0
+        for kpi, weight, inverse, values in self._compiled.get(
+            PercentileIndex.sector_key(sector), ()
+        ):
+            value = ScoringEngine._as_float(get(kpi))
+            n = len(values)
+            if not n or math.isnan(value):
+                continue
+            left, right = bisect_left(values, value), bisect_right(values, value)
+            pct = (left + right + (right > left)) / (2.0 * n)
+            score += (1 - pct if inverse else pct) * weight
+        return score if math.isfinite(score) else 0.0
+
+    def score_many(self, frame: pd.DataFrame) -> pd.Series:
+        """Score every row of `frame` (a `sector` column plus KPI columns)."""
+        scores = np.zeros(len(frame))
+        groups = PercentileIndex._groups(frame["sector"])
+        for kpi, weight in self.weights.items():
+            if kpi not in frame:
+                continue
+            values = pd.to_numeric(frame[kpi], errors="coerce").to_numpy(dtype=float)
+            pct = np.full(len(frame), np.nan)
+            for sector, rows in groups.items():
+                pct[rows] = self.index.percentile(sector, kpi, values[rows])
+            if kpi in self.inverse:
+                pct = 1 - pct
+            scores += np.nan_to_num(pct * weight, nan=0.0)
+        scores = np.where(np.isfinite(scores), scores, 0.0)
+        return pd.Series(scores, index=frame.index, name="score")
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.VERSION,
+            "created": self.created,
+            "weights": self.weights,
+            "inverse": sorted(self.inverse),
+            "index": self.index.to_records(),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict) -> "ScoreSnapshot":
+        if payload.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported snapshot version: {payload.get('version')}")
+        weights = payload["weights"]
+        return cls(
+            PercentileIndex.from_records(payload["index"], weights),
+            weights,
+            payload["inverse"],
+            payload["created"],
+        )
+
+    def save(self, path: str) -> None:
+        atomic_write_json(Path(path), self.to_dict())
+
+    @classmethod
+    def load(cls, path: str) -> "ScoreSnapshot":
+        with Path(path).open("r", encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
@@ -0,0 +1,188 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.covariance import CovarianceEstimator
+from src.kpi_calculator import KPICalculator
+from src.models.backtest_result import BacktestResult
+from src.models.financials import Financials
+from src.portfolio_engine import PortfolioEngine
+from src.score_engine import ScoringEngine
+from src.weighting import Weighting
+
+
+class WalkForward:
+    """Walk-forward backtest that only uses data available at each rebalance.
+
+    On every rebalance date the KPIs are recomputed from the statement
+    periods published by then (period end plus `lag_days`), the universe is
+    rescored with the `ScoringEngine` percentiles and weights, and the
+    equal-weighted top-N stocks are held until the next rebalance.
+
+    The statements are aligned once into a long frame (`statement_panel`)
+    and the prices once into a dates x tickers matrix; each rebalance only
+    filters those, so the run fetches nothing per date.
+
+    `fcf_yield` needs a market cap at each date. Statements carry none, so
+    it is the close on the day before the rebalance times the share count
+    (see `shares`). The share count does not depend on `prices`, so a run
+    ending before today does not see later returns.
+    """
+
+    REPORTING_LAG_DAYS = 90
+
+    @staticmethod
+    def statement_panel(fins: Dict[str, Financials]) -> pd.DataFrame:
+        """All statement periods in `long_format` layout with a datetime `period`."""
+        long = KPICalculator.long_format(fins, periods=None)
+        long["period"] = pd.to_datetime(long["period"], errors="coerce")
+        return long[long["period"].notna()]
+
+    @staticmethod
+    def as_of(
+        panel: pd.DataFrame, date, lag_days: int = REPORTING_LAG_DAYS
+    ) -> pd.DataFrame:
+        """Rows of `panel` published by `date`; `position` 0 is the latest."""
+        cutoff = pd.Timestamp(date) - pd.Timedelta(days=lag_days)
+        available = panel[panel["period"] <= cutoff]
+        rank = available.groupby(["ticker", "statement"])["period"].rank(
+            method="dense", ascending=False
+        )
+        return available.assign(position=rank.astype(int) - 1)
+
+    @staticmethod
+    def shares(fins: Dict[str, Financials]) -> pd.Series:
+        """Shares outstanding per ticker.
+
+        `sharesOutstanding` from `info`, else `marketCap / currentPrice` (both
+        observed at the same quote). NaN when neither is available, which
+        leaves `fcf_yield` out rather than guessing.
+        """
+        tickers = list(fins)
+        infos = [getattr(fins[t], "info", None) or {} for t in tickers]
+
+        def field(name: str) -> pd.Series:
+            values = pd.Series(
+                [i.get(name) for i in infos], index=tickers, dtype=object
+            )
+            return pd.to_numeric(values, errors="coerce")
+
+        price = field("currentPrice")
+        implied = field("marketCap") / price.where(price > 0)
+        return field("sharesOutstanding").fillna(implied)
+
+    @staticmethod
+    def scores(kpis: pd.DataFrame, sectors: List) -> np.ndarray:
+        """Universe scores of a KPI frame, as `ScoringEngine.score_table`."""
+        matrix = kpis.where(np.isfinite(kpis))
+        pct = ScoringEngine.percentile_matrix(matrix, sectors)
+        scores = ScoringEngine._weighted_sum(pct)
+        return np.where(np.isfinite(scores), scores, 0.0)
+
+    @staticmethod
+    def run(
+        fins: Dict[str, Financials],
+        prices: pd.DataFrame,
+        start: str | None = None,
+        end: str | None = None,
+        rebalance: str = "Q",
+        top_n: int = 10,
+        lag_days: int = REPORTING_LAG_DAYS,
+        years: int = 3,
+        cost_bps: float = 0.0,
+        slippage_bps: float = 0.0,
+        weighting: str | Sequence[str] = "equal",
+        covariance: str = "ledoit_wolf",
+        lookback: int = 252,
+    ) -> BacktestResult:
+        """Backtest the top-`top_n` portfolio rebuilt on every rebalance.
+
+        `prices` are daily closes (dates x tickers) covering `[start, end)`.
+        A ticker is eligible on a rebalance date once it has a price and at
+        least one KPI; with no eligible ticker the portfolio stays out of the
+        market until the next rebalance. `weights` of the result holds the
+        targets chosen on each rebalance date; trading costs are charged on
+        the turnover as in `PortfolioEngine.simulate`.
+
+        `weighting` is a `Weighting` scheme for the selected stocks, or a
+        list of schemes to compare. A list gives one portfolio per scheme,
+        named after it, with `weights` columns keyed by (scheme, ticker).
+        Covariance-based schemes share one `covariance` estimate per
+        rebalance over the `lookback` trading days before it. Pass prices
+        from before `start` to have that history from the first rebalance.
+        """
+        schemes = [weighting] if isinstance(weighting, str) else list(weighting)
+        unknown = [w for w in schemes if w not in Weighting.SCHEMES]
+        if unknown:
+            raise ValueError(f"Unknown weighting scheme(s): {unknown}")
+        if len(set(schemes)) != len(schemes):
+            raise ValueError(f"Duplicate weighting scheme(s): {schemes}")
+        tickers = list(fins)
+        panel = WalkForward.statement_panel(fins)
+        info = KPICalculator.info_frame(fins)
+        shares = WalkForward.shares(fins)
+        sectors = [
+            (getattr(fins[t], "info", None) or {}).get("sector", "Unknown")
+            for t in tickers
+        ]
+
+        prices = prices.reindex(columns=tickers).astype(float)
+        all_returns = prices.pct_change(fill_method=None)
+        estimator = None
+        if Weighting.NEEDS_COVARIANCE & set(schemes):
+            estimator = CovarianceEstimator(all_returns, lookback=lookback)
+        window = np.ones(len(prices), dtype=bool)
+        if start is not None:
+            window &= prices.index >= pd.Timestamp(start)
+        if end is not None:
+            window &= prices.index < pd.Timestamp(end)
+        returns = all_returns[window]
+        # Closes known before each day: the previous session's close (the
+        # first day of `prices` has no earlier close and uses its own)
+        filled = prices.ffill()
+        known = filled.shift(1)
+        known.iloc[:1] = filled.iloc[:1]
+        known = known[window]
+
+        positions = PortfolioEngine.rebalance_positions(returns.index, rebalance)
+        targets = np.zeros((len(schemes), len(positions), len(tickers)))
+        for k, pos in enumerate(positions):
+            date = returns.index[pos]
+            close = known.iloc[pos]
+            info_at = info.assign(marketCap=shares * close)
+            available = WalkForward.as_of(panel, date, lag_days)
+            kpis = KPICalculator.from_long(available, info_at, years)
+            scores = WalkForward.scores(kpis, sectors)
+
+            eligible = close.notna().to_numpy() & kpis.notna().any(axis=1).to_numpy()
+            order = np.argsort(-scores, kind="stable")
+            top = order[eligible[order]][:top_n]
+            if not len(top):
+                continue
+            selected = [tickers[i] for i in top]
+            top_scores = pd.Series(scores[top], index=selected)
+            cov = estimator.at(date, covariance) if estimator is not None else None
+            for j, scheme in enumerate(schemes):
+                w = Weighting.weights(scheme, selected, top_scores, cov)
+                targets[j, k, top] = w.to_numpy()
+
+        names = ["walk_forward"] if isinstance(weighting, str) else schemes
+        schedules = {
+            name: pd.DataFrame(
+                targets[j], index=returns.index[positions], columns=tickers
+            )
+            for j, name in enumerate(names)
+        }
+        result = PortfolioEngine.run(
+            returns,
+            schedules,
+            rebalance=None,
+            cost_bps=cost_bps,
+            slippage_bps=slippage_bps,
+        )
+        if isinstance(weighting, str):
+            result.weights = schedules["walk_forward"]
+        else:
+            result.weights = pd.concat(schedules, axis=1)
+        return result
@@ -0,0 +1,146 @@
+from itertools import product
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from src.backtest_engine import Backtester
+from src.models.kpi_table import KPITable
+from src.score_engine import ScoringEngine
+
+KPIS = list(ScoringEngine.KPI_WEIGHTS)
+
+
+class WeightSweep:
+    """Evaluate many KPI weightings against one universe at once.
+
+    The per-sector percentile matrix `P` (stocks x KPIs, missing = 0) is
+    computed once; the scores of every weight configuration are then one
+    matrix product `P @ W.T` (stocks x configs). Optionally each
+    configuration's equal-weighted top-N portfolio is backtested from a
+    returns matrix, again with matrix products, to rank the weightings.
+    """
+
+    @staticmethod
+    def configs_frame(configs) -> pd.DataFrame:
+        """Weight configurations as a configs x KPIs float frame.
+
+        Accepts a DataFrame, a list of `{kpi: weight}` dicts or an array with
+        one column per KPI (in `ScoringEngine.KPI_WEIGHTS` order). Missing KPIs
+        get weight 0.
+        """
+        if isinstance(configs, pd.DataFrame):
+            frame = configs
+        elif isinstance(configs, np.ndarray):
+            frame = pd.DataFrame(configs, columns=KPIS)
+        else:
+            frame = pd.DataFrame(list(configs))
+        return frame.reindex(columns=KPIS).fillna(0.0).astype(float)
+
+    @staticmethod
+    def random_configs(n: int, seed: int = 0) -> pd.DataFrame:
+        """`n` random weightings summing to 1 (uniform on the simplex)."""
+        rng = np.random.default_rng(seed)
+        return pd.DataFrame(rng.dirichlet(np.ones(len(KPIS)), size=n), columns=KPIS)
+
+    @staticmethod
+    def grid_configs(steps: int = 4) -> pd.DataFrame:
+        """All weightings in increments of `1/steps` that sum to 1."""
+        rows = [
+            combo
+            for combo in product(range(steps + 1), repeat=len(KPIS))
+            if sum(combo) == steps
+        ]
+        return pd.DataFrame(np.array(rows, dtype=float) / steps, columns=KPIS)
+
+    @staticmethod
+    def percentiles(table: KPITable) -> pd.DataFrame:
+        """Per-sector KPI percentiles of `table` with missing values as 0."""
+        matrix = table.kpi_matrix()[KPIS]
+        pct = ScoringEngine.percentile_matrix(matrix, table.frame["sector"])
+        return pct.fillna(0.0)
+
+    @staticmethod
+    def scores(
+        table: KPITable, configs, percentiles: pd.DataFrame | None = None
+    ) -> pd.DataFrame:
+        """Scores of every stock under every configuration (stocks x configs).
+
+        Column `i` equals `ScoringEngine.score` run with the weights of
+        configuration `i`.
+        """
+        weights = WeightSweep.configs_frame(configs)
+        pct = WeightSweep.percentiles(table) if percentiles is None else percentiles
+        values = pct[KPIS].to_numpy() @ weights.to_numpy().T
+        values = np.where(np.isfinite(values), values, 0.0)
+        return pd.DataFrame(values, index=table.frame["ticker"], columns=weights.index)
+
+    @staticmethod
+    def top_n(scores: pd.DataFrame, n: int = 10) -> np.ndarray:
+        """Row positions of the `n` best stocks per config (n x configs).
+
+        Ties keep universe order, as in `KPITable.ranked`.
+        """
+        order = np.argsort(-scores.to_numpy(), axis=0, kind="stable")
+        return order[:n]
+
+    @staticmethod
+    def selected_tickers(scores: pd.DataFrame, n: int = 10) -> List[str]:
+        """Union of the top-`n` tickers over all configs (universe order)."""
+        positions = np.unique(WeightSweep.top_n(scores, n))
+        return [scores.index[i] for i in positions]
+
+    @staticmethod
+    def portfolio_returns(
+        scores: pd.DataFrame, returns: pd.DataFrame, n: int = 10
+    ) -> pd.DataFrame:
+        """Daily returns of each config's equal-weighted top-`n` portfolio.
+
+        Matches `Backtester.backtest`: each day averages the selected tickers
+        that have a return that day; days with none are NaN.
+        """
+        tickers = list(scores.index)
+        top = WeightSweep.top_n(scores, n)
+        selection = np.zeros((len(tickers), scores.shape[1]))
+        selection[top, np.arange(scores.shape[1])[None, :]] = 1.0
+
+        aligned = returns.reindex(columns=tickers).to_numpy(dtype=float)
+        valid = np.isfinite(aligned)
+        total = np.where(valid, aligned, 0.0) @ selection
+        count = valid.astype(float) @ selection
+        with np.errstate(invalid="ignore", divide="ignore"):
+            daily = np.where(count > 0, total / count, np.nan)
+        return pd.DataFrame(daily, index=returns.index, columns=scores.columns)
+
+    @staticmethod
+    def rank(
+        table: KPITable,
+        configs,
+        returns: pd.DataFrame | None = None,
+        top_n: int = 10,
+        by: str = "cagr",
+        ascending: bool = False,
+        scores: pd.DataFrame | None = None,
+    ) -> pd.DataFrame:
+        """One row per configuration: its weights, plus backtest metrics.
+
+        With `returns` (dates x tickers, e.g. `Backtester.returns_frame`),
+        adds `Backtester.portfolio_metrics` of each config's top-`top_n`
+        portfolio and sorts by `by` (descending unless `ascending`, e.g. for
+        `max_drawdown`). Every row lists its top-`top_n` tickers under `top`.
+        Pass `scores` already computed by `scores(table, configs)` to reuse
+        them.
+        """
+        weights = WeightSweep.configs_frame(configs)
+        if scores is None:
+            scores = WeightSweep.scores(table, weights)
+        top = WeightSweep.top_n(scores, top_n)
+        result = weights.copy()
+        result["top"] = [list(scores.index[top[:, j]]) for j in range(top.shape[1])]
+        if returns is None:
+            return result
+
+        daily = WeightSweep.portfolio_returns(scores, returns, top_n)
+        metrics = Backtester.portfolio_metrics(daily)
+        result = pd.concat([result, metrics], axis=1)
+        return result.sort_values(by, ascending=ascending, kind="stable")
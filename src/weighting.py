@@ -0,0 +1,130 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+class Weighting:
+    """Portfolio weights for a selection of tickers.
+
+    Schemes: `equal`, `score` (proportional to the positive part of the
+    scores), `inverse_vol`, `min_variance` (long-only) and `risk_parity`
+    (equal risk contributions). The last three need a covariance matrix of
+    the selection (see `CovarianceEstimator`). Tickers whose variance is not
+    finite and positive are left out of them, and if none remain the
+    weights fall back to equal. Weights are non-negative and sum to 1.
+    """
+
+    SCHEMES = ("equal", "score", "inverse_vol", "min_variance", "risk_parity")
+    NEEDS_COVARIANCE = {"inverse_vol", "min_variance", "risk_parity"}
+
+    @staticmethod
+    def weights(
+        scheme: str,
+        tickers: List[str],
+        scores: pd.Series | None = None,
+        cov: pd.DataFrame | None = None,
+    ) -> pd.Series:
+        """Weights of `tickers` under `scheme` (indexed by ticker)."""
+        if scheme not in Weighting.SCHEMES:
+            raise ValueError(f"Unknown weighting scheme: {scheme}")
+        out = pd.Series(0.0, index=list(tickers))
+        if not len(out):
+            return out
+        if scheme == "score" and scores is not None:
+            values = scores.reindex(out.index).to_numpy(dtype=float)
+            values = np.where(np.isfinite(values) & (values > 0), values, 0.0)
+            if values.sum() > 0:
+                return out + values / values.sum()
+        if scheme in Weighting.NEEDS_COVARIANCE and cov is not None:
+            sub = cov.reindex(index=out.index, columns=out.index).to_numpy(float)
+            diag = np.diag(sub)
+            usable = np.isfinite(diag) & (diag > 0)
+            if usable.any():
+                sub = sub[np.ix_(usable, usable)]
+                solve = getattr(Weighting, scheme)
+                out[usable] = solve(sub)
+                return out
+        return out + 1.0 / len(out)
+
+    @staticmethod
+    def inverse_vol(cov: np.ndarray) -> np.ndarray:
+        inv = 1 / np.sqrt(np.diag(cov))
+        return inv / inv.sum()
+
+    @staticmethod
+    def min_variance(
+        cov: np.ndarray, tol: float = 1e-12, max_iter: int | None = None
+    ) -> np.ndarray:
+        """Long-only minimum variance by a primal active-set method.
+
+        Minimizes `w'Σw` subject to `sum(w) = 1` and `w >= 0`, starting from
+        equal weights. Each step moves towards the minimum over the names
+        not held at zero, stopping at the first weight that would turn
+        negative (which joins the zero set). At a stationary point a name
+        at zero whose marginal variance `(Σw)_i` is below that of the held
+        names is released again; with none left the KKT conditions hold.
+        """
+        n = len(cov)
+        w = np.full(n, 1.0 / n)
+        zero = np.zeros(n, dtype=bool)
+        for _ in range(max_iter or 50 * n):
+            free = ~zero
+            sub = cov[np.ix_(free, free)]
+            ones = np.ones(free.sum())
+            try:
+                x = np.linalg.solve(sub, ones)
+            except np.linalg.LinAlgError:
+                x = np.linalg.lstsq(sub, ones, rcond=None)[0]
+            target = np.zeros(n)
+            if abs(x.sum()) > tol:
+                target[free] = x / x.sum()
+            else:
+                target[free] = w[free]
+            step = target - w
+            if np.abs(step).max() <= np.sqrt(tol):
+                grad = cov @ w
+                level = grad[free].mean()
+                slack = np.where(zero, grad - level, np.inf)
+                i = int(np.argmin(slack))
+                if slack[i] >= -tol * max(abs(level), 1.0):
+                    break
+                zero[i] = False
+                continue
+            # Longest step along `step` that keeps the free weights >= 0
+            shrinking = free & (step < 0)
+            ratios = np.full(n, np.inf)
+            ratios[shrinking] = w[shrinking] / -step[shrinking]
+            j = int(np.argmin(ratios))
+            if ratios[j] < 1:
+                w = w + ratios[j] * step
+                w[j] = 0.0
+                zero[j] = True
+            else:
+                w = target
+        w = np.clip(w, 0.0, None)
+        return w / w.sum()
+
+    @staticmethod
+    def risk_parity(
+        cov: np.ndarray, tol: float = 1e-10, max_iter: int = 500
+    ) -> np.ndarray:
+        """Equal risk contributions by cyclical coordinate descent.
+
+        Minimizes `y'Σy / 2 - sum(log y) / n` one coordinate at a time
+        (closed-form root per coordinate); `w = y / sum(y)`.
+        """
+        n = len(cov)
+        diag = np.diag(cov)
+        y = 1 / np.sqrt(diag)
+        budget = 1.0 / n
+        for _ in range(max_iter):
+            previous = y.copy()
+            for i in range(n):
+                others = cov[i] @ y - diag[i] * y[i]
+                y[i] = (-others + np.sqrt(others**2 + 4 * diag[i] * budget)) / (
+                    2 * diag[i]
+                )
+            if np.abs(y - previous).max() <= tol * np.abs(y).max():
+                break
+        return y / y.sum()
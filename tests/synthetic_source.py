@@ -0,0 +1,73 @@
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_source import DataSource
+from src.models.financials import Financials
+
+SECTORS = ["Technology", "Energy", "Healthcare", "Financials", "Industrials"]
+
+
+class SyntheticDataSource(DataSource):
+    """Deterministic offline source with Yahoo-sized statements and info.
+
+    Each ticker gets ~40/60/50 income/balance/cashflow rows over 4 periods
+    (including the labels the KPIs use) and an info dict with `info_keys`
+    entries, roughly the size of a real yfinance payload.
+    """
+
+    def __init__(
+        self,
+        tickers: List[str],
+        seed: int = 0,
+        statement_rows: Tuple[int, int, int] = (40, 60, 50),
+        info_keys: int = 150,
+    ):
+        self.tickers = list(tickers)
+        self.seed = seed
+        self.statement_rows = statement_rows
+        self.info_keys = info_keys
+        self.periods = pd.to_datetime(
+            ["2023-12-31", "2022-12-31", "2021-12-31", "2020-12-31"]
+        )
+
+    def _statement(self, rng, named: List[str], size: int) -> pd.DataFrame:
+        labels = named + [f"Line Item {i}" for i in range(size - len(named))]
+        values = rng.uniform(1e8, 1e10, (len(labels), len(self.periods)))
+        return pd.DataFrame(values, index=labels, columns=self.periods)
+
+    def financials(self, ticker: str) -> Financials:
+        pos = self.tickers.index(ticker)
+        rng = np.random.default_rng(self.seed + pos)
+        n_income, n_balance, n_cashflow = self.statement_rows
+        info = {f"field{i}": f"value {i} for {ticker}" for i in range(self.info_keys)}
+        info.update(
+            longName=f"{ticker} Inc.",
+            sector=SECTORS[pos % len(SECTORS)],
+            marketCap=float(rng.uniform(1e10, 1e12)),
+            taxRate=0.21,
+        )
+        return Financials(
+            income=self._statement(
+                rng,
+                ["EBIT", "Net Income", "Interest Expense", "Total Revenue"],
+                n_income,
+            ),
+            balance=self._statement(
+                rng, ["Long Term Debt", "Stockholders Equity"], n_balance
+            ),
+            cashflow=self._statement(rng, ["Free Cash Flow"], n_cashflow),
+            info=info,
+        )
+
+    def prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        dates = pd.bdate_range(start, end, inclusive="left")
+        rng = np.random.default_rng(self.seed)
+        steps = rng.normal(0.0003, 0.01, (len(dates), len(tickers)))
+        return pd.DataFrame(
+            100 * np.exp(np.cumsum(steps, axis=0)), index=dates, columns=tickers
+        )
+
+    def constituents(self, n: int | None = None) -> List[str]:
+        return self.tickers if n is None else self.tickers[:n]
@@ -11,10 +11,10 @@ def test_backtest_cagr_geometric(monkeypatch):
     n = 5
     series = pd.Series([r] * n)
 
-    def fake_returns(ticker, start, end):
-        return series.copy()
+    def fake_returns_frame(tickers, start, end, cache=None, source=None):
+        return pd.DataFrame({t: series.copy() for t in tickers})
 
-    monkeypatch.setattr(Backtester, "returns", staticmethod(fake_returns))
+    monkeypatch.setattr(Backtester, "returns_frame", staticmethod(fake_returns_frame))
 
     s = Stock(ticker="AAA", sector="S", kpis=KPIs(0, 0, 0, 0, 0), score=1.0)
     res = Backtester.backtest([s], index="^GSPC")
@@ -0,0 +1,165 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from src.backtest_engine import Backtester
+from src.data_loader import YahooFinanceLoader
+from src.price_cache import PriceCache
+from src.price_store import PriceStore
+
+
+def make_download(calls):
+    dates = pd.bdate_range("2020-01-01", "2020-12-31")
+
+    def fake_download(tickers, start, end, **kwargs):
+        calls.append((list(tickers), start, end))
+        idx = dates[(dates >= pd.Timestamp(start)) & (dates < pd.Timestamp(end))]
+        cols = pd.MultiIndex.from_product([["Close", "Open"], tickers])
+        data = {
+            (field, t): [100.0 + i + n for n in range(len(idx))]
+            for field in ["Close", "Open"]
+            for i, t in enumerate(tickers)
+        }
+        return pd.DataFrame(data, index=idx, columns=cols)
+
+    return fake_download
+
+
+def test_load_prices_uses_one_bulk_call(monkeypatch):
+    calls = []
+    monkeypatch.setattr("yfinance.download", make_download(calls))
+
+    prices = YahooFinanceLoader.load_prices(
+        ["AAA", "BBB", "^GSPC"], "2020-01-01", "2020-02-01"
+    )
+
+    assert len(calls) == 1
+    assert list(prices.columns) == ["AAA", "BBB", "^GSPC"]
+    assert prices["BBB"].iloc[0] == 101.0
+
+
+def test_price_cache_fetches_only_missing_ranges(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr("yfinance.download", make_download(calls))
+    cache = PriceCache(str(tmp_path))
+
+    YahooFinanceLoader.load_prices(["AAA", "BBB"], "2020-02-01", "2020-03-01", cache)
+    assert calls == [(["AAA", "BBB"], "2020-02-01", "2020-03-01")]
+
+    # Fully covered request: no download
+    calls.clear()
+    YahooFinanceLoader.load_prices(["AAA", "BBB"], "2020-02-03", "2020-02-20", cache)
+    assert calls == []
+
+    # Extended window plus a new ticker: only the missing pieces are fetched
+    calls.clear()
+    prices = YahooFinanceLoader.load_prices(
+        ["AAA", "BBB", "CCC"], "2020-02-01", "2020-04-01", PriceCache(str(tmp_path))
+    )
+    assert sorted(calls) == sorted(
+        [
+            (["AAA", "BBB"], "2020-03-01", "2020-04-01"),
+            (["CCC"], "2020-02-01", "2020-04-01"),
+        ]
+    )
+    assert prices.index.min() == pd.Timestamp("2020-02-03")
+    assert prices.index.max() == pd.Timestamp("2020-03-31")
+    assert prices.notna().all().all()
+
+
+def test_returns_frame_is_wide(monkeypatch):
+    monkeypatch.setattr("yfinance.download", make_download([]))
+
+    frame = Backtester.returns_frame(["AAA", "^GSPC"], "2020-01-01", "2020-01-10")
+
+    assert list(frame.columns) == ["AAA", "^GSPC"]
+    assert frame.notna().all().all()
+    assert abs(frame["AAA"].iloc[0] - (101.0 / 100.0 - 1)) < 1e-12
+
+
+def test_price_cache_writes_index_once_and_covers_pre_listing_days(
+    tmp_path, monkeypatch
+):
+    calls = []
+    download = make_download(calls)
+
+    def listed_in_march(tickers, start, end, **kwargs):
+        raw = download(tickers, start, end, **kwargs)
+        if "NEW" in tickers:
+            raw.loc[raw.index < pd.Timestamp("2020-03-02"), ("Close", "NEW")] = None
+        return raw
+
+    monkeypatch.setattr("yfinance.download", listed_in_march)
+    writes = []
+    monkeypatch.setattr(
+        "src.price_cache.atomic_write_json", lambda path, payload: writes.append(path)
+    )
+    cache = PriceCache(str(tmp_path))
+
+    tickers = ["AAA", "BBB", "NEW"]
+    YahooFinanceLoader.load_prices(tickers, "2020-02-01", "2020-04-01", cache)
+    assert len(writes) == 1
+
+    # NEW had no prices before listing; that range is not downloaded again
+    calls.clear()
+    prices = YahooFinanceLoader.load_prices(tickers, "2020-02-01", "2020-04-01", cache)
+    assert calls == []
+    assert prices["NEW"].first_valid_index() == pd.Timestamp("2020-03-02")
+
+
+def test_empty_download_is_retried(tmp_path, monkeypatch):
+    calls = []
+
+    def failing_download(tickers, start, end, **kwargs):
+        calls.append(list(tickers))
+        return pd.DataFrame()
+
+    monkeypatch.setattr("yfinance.download", failing_download)
+    cache = PriceCache(str(tmp_path))
+
+    YahooFinanceLoader.load_prices(["AAA"], "2020-02-01", "2020-03-01", cache)
+    YahooFinanceLoader.load_prices(["AAA"], "2020-02-01", "2020-03-01", cache)
+
+    assert calls == [["AAA"], ["AAA"]]
+
+
+@pytest.mark.parametrize("store", [PriceCache, PriceStore])
+def test_ticker_missing_from_a_bulk_download_is_retried(tmp_path, monkeypatch, store):
+    calls = []
+    download = make_download(calls)
+    failing = {"BAD"}
+
+    def flaky(tickers, start, end, **kwargs):
+        raw = download(tickers, start, end, **kwargs)
+        for t in failing & set(tickers):
+            raw[("Close", t)] = float("nan")
+        return raw
+
+    monkeypatch.setattr("yfinance.download", flaky)
+    cache = store(str(tmp_path))
+
+    tickers = ["AAA", "BAD"]
+    YahooFinanceLoader.load_prices(tickers, "2020-02-01", "2020-03-01", cache)
+    failing.clear()
+    calls.clear()
+    prices = YahooFinanceLoader.load_prices(tickers, "2020-02-01", "2020-03-01", cache)
+
+    assert calls == [(["BAD"], "2020-02-01", "2020-03-01")]
+    assert prices["BAD"].notna().all()
+
+
+@pytest.mark.parametrize("store", [PriceCache, PriceStore])
+def test_coverage_stops_at_today(tmp_path, monkeypatch, store):
+    calls = []
+    monkeypatch.setattr("yfinance.download", make_download(calls))
+    cache = store(str(tmp_path))
+    today = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d")
+
+    YahooFinanceLoader.load_prices(["AAA"], "2020-02-01", "2100-01-01", cache)
+    assert cache.missing("AAA", "2020-02-01", "2100-01-01") == [(today, "2100-01-01")]
+
+    # A later call fetches the days after today's date instead of skipping them
+    calls.clear()
+    YahooFinanceLoader.load_prices(["AAA"], "2020-02-01", "2100-01-01", cache)
+    assert calls == [(["AAA"], today, "2100-01-01")]
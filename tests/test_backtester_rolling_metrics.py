@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest_engine import Backtester
+
+
+def _returns(days=200, seed=5):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        rng.normal(0.0005, 0.015, (days, 3)),
+        index=pd.bdate_range("2022-01-03", periods=days),
+        columns=["A", "B", "C"],
+    )
+    frame.iloc[:30, 1] = np.nan  # late listing
+    frame.iloc[[50, 51, 90], 2] = np.nan  # gaps
+    return frame
+
+
+@pytest.mark.parametrize("window", [20, 63])
+def test_rolling_metrics_match_single_series_helpers(window):
+    returns = _returns()
+
+    vol = Backtester.rolling_volatility(returns, window, min_periods=10)
+    sharpe = Backtester.rolling_sharpe(returns, window, risk_free=0.02, min_periods=10)
+    drawdown = Backtester.rolling_max_drawdown(returns, window, min_periods=10)
+
+    for col in returns:
+        for end in [9, 25, 40, 89, 120, 199]:
+            series = returns[col].iloc[max(0, end - window + 1) : end + 1].dropna()
+            if len(series) < 10:
+                assert np.isnan(vol[col].iloc[end])
+                assert np.isnan(drawdown[col].iloc[end])
+                continue
+            assert vol[col].iloc[end] == pytest.approx(
+                Backtester.annualized_volatility(series), rel=1e-9
+            )
+            assert sharpe[col].iloc[end] == pytest.approx(
+                Backtester.sharpe_ratio(series, risk_free=0.02), rel=1e-9
+            )
+            assert drawdown[col].iloc[end] == pytest.approx(
+                Backtester.max_drawdown(series), rel=1e-9, abs=1e-12
+            )
+
+
+def test_expanding_metrics_match_whole_series():
+    returns = _returns()
+
+    vol = Backtester.rolling_volatility(returns, window=None)
+    sharpe = Backtester.rolling_sharpe(returns, window=None)
+    drawdown = Backtester.rolling_max_drawdown(returns, window=None)
+    metrics = Backtester.portfolio_metrics(returns)
+
+    np.testing.assert_allclose(vol.iloc[-1], metrics["volatility"], rtol=1e-9)
+    np.testing.assert_allclose(sharpe.iloc[-1], metrics["sharpe"], rtol=1e-9)
+    np.testing.assert_allclose(drawdown.iloc[-1], metrics["max_drawdown"], rtol=1e-9)
+    expected = returns.expanding().std(ddof=0) * 252**0.5
+    pd.testing.assert_frame_equal(vol, expected.where(returns.notna().cumsum() > 0))
+
+
+def test_flat_windows_have_zero_volatility_and_no_sharpe():
+    values = np.r_[np.random.default_rng(1).normal(0, 0.02, 100), np.full(40, 0.001)]
+    returns = pd.DataFrame({"A": values * 1e3, "B": values})
+
+    vol = Backtester.rolling_volatility(returns, window=30)
+    sharpe = Backtester.rolling_sharpe(returns, window=30)
+    drawdown = Backtester.rolling_max_drawdown(returns, window=30)
+
+    assert (vol.iloc[-5:] == 0.0).all().all()
+    assert sharpe.iloc[-5:].isna().all().all()
+    assert (drawdown.iloc[-5:] == 0.0).all().all()
+    assert vol.iloc[:29].isna().all().all()
+
+
+@pytest.mark.parametrize("window", [7, 20])
+def test_rolling_drawdown_ignores_wealth_before_a_gap(window):
+    returns = _returns(days=260)
+    returns.iloc[100:160, 0] = np.nan  # 60-day gap
+    returns.iloc[160, 0] = -0.03  # a loss on the first day after it
+
+    drawdown = Backtester.rolling_max_drawdown(returns, window, min_periods=1)
+
+    for end in range(len(returns)):
+        series = returns["A"].iloc[max(0, end - window + 1) : end + 1].dropna()
+        expected = Backtester.max_drawdown(series) if len(series) else np.nan
+        assert drawdown["A"].iloc[end] == pytest.approx(
+            expected, rel=1e-9, abs=1e-12, nan_ok=True
+        )
+    # A window opening in the gap holds a single return there: no drawdown
+    assert drawdown["A"].iloc[160] == 0.0
+
+
+@pytest.mark.parametrize("window", [0, -5])
+def test_rolling_metrics_reject_empty_windows(window):
+    returns = _returns()
+    for metric in (
+        Backtester.rolling_volatility,
+        Backtester.rolling_sharpe,
+        Backtester.rolling_max_drawdown,
+    ):
+        with pytest.raises(ValueError, match="window"):
+            metric(returns, window)
@@ -8,12 +8,11 @@ from src.models.kpis import KPIs
 
 def test_backtest_skips_empty_returns(monkeypatch):
     # ticker AAA has data, BBB returns empty
-    def fake_returns(ticker, start, end):
-        if ticker == "AAA":
-            return pd.Series([0.01, 0.02, 0.03])
-        return pd.Series([], dtype=float)
+    def fake_returns_frame(tickers, start, end, cache=None, source=None):
+        frame = pd.DataFrame({"AAA": [0.01, 0.02, 0.03]})
+        return frame.reindex(columns=tickers)
 
-    monkeypatch.setattr(Backtester, "returns", staticmethod(fake_returns))
+    monkeypatch.setattr(Backtester, "returns_frame", staticmethod(fake_returns_frame))
 
     s1 = Stock(ticker="AAA", sector="S", kpis=KPIs(0, 0, 0, 0, 0), score=1.0)
     s2 = Stock(ticker="BBB", sector="S", kpis=KPIs(0, 0, 0, 0, 0), score=0.5)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.covariance import CovarianceEstimator
+
+
+def _returns(days=400, seed=7):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(0, 0.01, (days, 1))
+    data = base + rng.normal(0, [0.005, 0.01, 0.02, 0.015], (days, 4))
+    frame = pd.DataFrame(
+        data, index=pd.bdate_range("2021-01-01", periods=days), columns=list("ABCD")
+    )
+    frame.iloc[:350, 3] = np.nan  # too short a history for most windows
+    return frame
+
+
+def test_sample_uses_only_the_window_before_the_date():
+    returns = _returns()
+    estimator = CovarianceEstimator(returns, lookback=100)
+    date = returns.index[250]
+
+    cov = estimator.at(date, "sample")
+
+    expected = returns.iloc[150:250, :3].cov(ddof=0)
+    np.testing.assert_allclose(cov.iloc[:3, :3], expected, rtol=1e-10)
+    assert cov["D"].isna().all() and cov.loc["D"].isna().all()
+
+
+def test_estimates_are_cached_per_date_and_method(monkeypatch):
+    returns = _returns()
+    estimator = CovarianceEstimator(returns)
+    calls = []
+    original = CovarianceEstimator.ledoit_wolf
+
+    def counting(x):
+        calls.append(x.shape)
+        return original(x)
+
+    monkeypatch.setattr(CovarianceEstimator, "ledoit_wolf", counting)
+    first = estimator.at("2022-01-03")
+    again = estimator.at(pd.Timestamp("2022-01-03"))
+    estimator.at("2022-01-03", "sample")
+
+    assert first is again
+    assert len(calls) == 1
+    with pytest.raises(ValueError):
+        estimator.at("2022-01-03", "robust")
+
+
+def test_ledoit_wolf_shrinks_towards_scaled_identity():
+    x = np.random.default_rng(0).normal(0, 0.01, (30, 20))
+    x = x - x.mean(axis=0)
+
+    sample = CovarianceEstimator.sample(x)
+    shrunk = CovarianceEstimator.ledoit_wolf(x)
+
+    mu = np.trace(sample) / 20
+    offdiag = ~np.eye(20, dtype=bool)
+    ratio = shrunk[offdiag] / sample[offdiag]
+    # A convex combination: the same factor on every off-diagonal entry
+    assert np.allclose(ratio, ratio[0]) and 0 < ratio[0] < 1
+    np.testing.assert_allclose(
+        np.diag(shrunk), ratio[0] * np.diag(sample) + (1 - ratio[0]) * mu
+    )
+    assert np.linalg.eigvalsh(shrunk).min() > np.linalg.eigvalsh(sample).min()
+
+
+def test_ewma_weights_recent_days_more():
+    x = np.r_[np.full((50, 2), 0.001), np.full((50, 2), 0.03)]
+    x = x * np.array([1, -1]) ** np.arange(100)[:, None]
+
+    ewma = CovarianceEstimator.ewma(x, halflife=10)
+    sample = CovarianceEstimator.sample(x)
+
+    assert ewma[0, 0] > sample[0, 0]
+    np.testing.assert_allclose(CovarianceEstimator.ewma(x, 1e12), sample, atol=1e-12)
@@ -1,3 +1,5 @@
+from types import SimpleNamespace
+
 import pandas as pd
 
 from src.data_loader import YahooFinanceLoader
@@ -8,7 +10,14 @@ class DummyTicker:
         self.info = info
 
 
-def test_get_top_n_by_marketcap(monkeypatch):
+def test_get_top_n_by_marketcap(monkeypatch, tmp_path):
+    monkeypatch.setattr(YahooFinanceLoader, "DEFAULT_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(
+        "src.http_session.HttpClient.get",
+        lambda url, timeout=10, headers=None: SimpleNamespace(
+            status_code=200, text="", headers={}, raise_for_status=lambda: None
+        ),
+    )
     # Fake the Wikipedia table
     df = pd.DataFrame({"Symbol": ["AAA", "BBB", "CCC"]})
     monkeypatch.setattr(pd, "read_html", lambda url: [df])
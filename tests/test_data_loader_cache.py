@@ -1,8 +1,10 @@
 import json
+import os
 from datetime import datetime, timedelta, timezone
 
 import pandas as pd
 
+from src.cache_utils import atomic_write_json
 from src.data_loader import YahooFinanceLoader
 
 
@@ -81,3 +83,17 @@ def test_refreshes_cache_when_expired(tmp_path, monkeypatch):
         payload = json.load(fh)
     assert payload.get("timestamp") is not None
     assert payload.get("data", {}).get("BBB") == 10
+
+
+def test_cache_rewrites_keep_the_file_mode(tmp_path):
+    existing = tmp_path / "market_caps.json"
+    existing.write_text("{}")
+    os.chmod(existing, 0o644)
+    atomic_write_json(existing, {"data": {}})
+    assert existing.stat().st_mode & 0o777 == 0o644
+
+    mask = os.umask(0)
+    os.umask(mask)
+    fresh = tmp_path / "constituents.json"
+    atomic_write_json(fresh, {})
+    assert fresh.stat().st_mode & 0o777 == 0o666 & ~mask
@@ -0,0 +1,108 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pandas as pd
+
+from src.data_loader import YahooFinanceLoader
+
+
+def write_json(path, payload):
+    path.write_text(json.dumps(payload))
+
+
+def fresh_caps(tmp_path, data):
+    write_json(
+        tmp_path / "market_caps.json",
+        {"timestamp": datetime.now(timezone.utc).isoformat(), "data": data},
+    )
+
+
+def no_network(*args, **kwargs):
+    raise AssertionError("network must not be used")
+
+
+def test_fresh_constituents_skip_the_request(tmp_path, monkeypatch):
+    write_json(
+        tmp_path / "constituents.json",
+        {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "tickers": ["AAA", "BBB", "CCC"],
+        },
+    )
+    fresh_caps(tmp_path, {"AAA": 100, "BBB": 50, "CCC": 200})
+    monkeypatch.setattr("src.http_session.HttpClient.get", no_network)
+    monkeypatch.setattr(pd, "read_html", no_network)
+
+    top = YahooFinanceLoader.get_top_n_by_marketcap(
+        2, cache_dir=str(tmp_path), constituents_ttl_days=1
+    )
+    assert top == ["CCC", "AAA"]
+
+
+def test_stale_constituents_are_revalidated(tmp_path, monkeypatch):
+    old_ts = (datetime.now(timezone.utc) - timedelta(days=3)).isoformat()
+    write_json(
+        tmp_path / "constituents.json",
+        {"timestamp": old_ts, "tickers": ["AAA", "BBB"], "etag": '"v1"'},
+    )
+    fresh_caps(tmp_path, {"AAA": 100, "BBB": 50})
+    seen = {}
+
+    def fake_get(url, timeout=10, headers=None):
+        seen.update(headers or {})
+        return SimpleNamespace(status_code=304, text="", headers={})
+
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
+    monkeypatch.setattr(pd, "read_html", no_network)
+
+    top = YahooFinanceLoader.get_top_n_by_marketcap(
+        1, cache_dir=str(tmp_path), constituents_ttl_days=1
+    )
+
+    assert top == ["AAA"]
+    assert seen["If-None-Match"] == '"v1"'
+    saved = json.loads((tmp_path / "constituents.json").read_text())
+    assert saved["timestamp"] != old_ts
+    assert saved["etag"] == '"v1"'
+
+
+def test_downloaded_list_is_stored_with_validators(tmp_path, monkeypatch):
+    def fake_get(url, timeout=10, headers=None):
+        return SimpleNamespace(
+            status_code=200,
+            text="<html></html>",
+            headers={"ETag": '"v2"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+            raise_for_status=lambda: None,
+        )
+
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
+    monkeypatch.setattr(
+        pd, "read_html", lambda html: [pd.DataFrame({"Symbol": ["AAA"]})]
+    )
+    fresh_caps(tmp_path, {"AAA": 1})
+
+    YahooFinanceLoader.get_top_n_by_marketcap(1, cache_dir=str(tmp_path))
+
+    saved = json.loads((tmp_path / "constituents.json").read_text())
+    assert saved["tickers"] == ["AAA"]
+    assert saved["etag"] == '"v2"'
+    assert saved["last_modified"].startswith("Mon")
+
+
+def test_offline_mode_never_touches_network(tmp_path, monkeypatch):
+    old_ts = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+    write_json(
+        tmp_path / "constituents.json", {"timestamp": old_ts, "tickers": ["AAA", "BBB"]}
+    )
+    write_json(
+        tmp_path / "market_caps.json",
+        {"timestamp": old_ts, "data": {"AAA": 1, "BBB": 2}},
+    )
+    monkeypatch.setattr("src.http_session.HttpClient.get", no_network)
+    monkeypatch.setattr("yfinance.Ticker", no_network)
+
+    top = YahooFinanceLoader.get_top_n_by_marketcap(
+        2, cache_dir=str(tmp_path), offline=True
+    )
+    assert top == ["BBB", "AAA"]
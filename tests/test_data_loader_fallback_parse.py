@@ -5,13 +5,15 @@ import pandas as pd
 from src.data_loader import YahooFinanceLoader
 
 
-def test_fallback_parses_html(monkeypatch):
+def test_fallback_parses_html(monkeypatch, tmp_path):
+    # Keep the default-path cache out of the repo's real `.cache/`
+    monkeypatch.setattr(YahooFinanceLoader, "DEFAULT_CACHE_DIR", tmp_path)
     # Make pd.read_html raise
     monkeypatch.setattr(
         pd, "read_html", lambda url: (_ for _ in ()).throw(RuntimeError("no html"))
     )
 
-    # Fake requests.get to return a simple HTML table
+    # Fake HttpClient.get to return a simple HTML table
     html = """
     <html>
     <body>
@@ -30,7 +32,7 @@ def test_fallback_parses_html(monkeypatch):
     def fake_get(url, timeout=10):
         return SimpleNamespace(status_code=200, text=html)
 
-    monkeypatch.setattr("requests.get", fake_get)
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
 
     # Ensure yfinance returns deterministic marketCap values for parsed tickers
     def fake_ticker(ticker):
@@ -58,11 +60,11 @@ def test_fallback_no_parser_and_no_cache_raises(monkeypatch, tmp_path):
         pd, "read_html", lambda url: (_ for _ in ()).throw(RuntimeError("no html"))
     )
 
-    # requests.get raises so fallback also fails
+    # HttpClient.get raises so fallback also fails
     def fake_get_raise(url, timeout=10):
         raise RuntimeError("no network")
 
-    monkeypatch.setattr("requests.get", fake_get_raise)
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get_raise)
 
     # Use an empty temporary cache directory to ensure no cached market caps exist
     cache_dir = tmp_path / "cache"
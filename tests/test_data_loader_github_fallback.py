@@ -10,7 +10,7 @@ def test_github_fallback(monkeypatch, tmp_path):
         pd, "read_html", lambda url: (_ for _ in ()).throw(RuntimeError("no html"))
     )
 
-    # requests.get first call returns 403 for Wikipedia
+    # HttpClient.get first call returns 403 for Wikipedia
     def fake_get(url, timeout=10, headers=None):
         if "raw.githubusercontent.com" in url:
             # return CSV data
@@ -18,7 +18,7 @@ def test_github_fallback(monkeypatch, tmp_path):
             return SimpleNamespace(status_code=200, text=csv)
         return SimpleNamespace(status_code=403, text="Forbidden")
 
-    monkeypatch.setattr("requests.get", fake_get)
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
 
     # Also patch yfinance.Ticker to provide marketCap values
     def fake_ticker(ticker):
@@ -48,7 +48,7 @@ def test_403_no_cache_raises(monkeypatch, tmp_path):
     def fake_get(url, timeout=10, headers=None):
         return SimpleNamespace(status_code=403, text="Forbidden")
 
-    monkeypatch.setattr("requests.get", fake_get)
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
 
     try:
         YahooFinanceLoader.get_top_n_by_marketcap(2, cache_dir=str(tmp_path))
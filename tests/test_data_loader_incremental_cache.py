@@ -0,0 +1,78 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pandas as pd
+
+from src.data_loader import YahooFinanceLoader
+
+
+def fake_get(url, timeout=10, headers=None):
+    return SimpleNamespace(
+        status_code=200, text="<html></html>", raise_for_status=lambda: None
+    )
+
+
+def setup_universe(monkeypatch, symbols):
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
+    monkeypatch.setattr(
+        pd, "read_html", lambda url: [pd.DataFrame({"Symbol": symbols})]
+    )
+
+
+def test_only_stale_entries_are_refreshed(tmp_path, monkeypatch):
+    setup_universe(monkeypatch, ["AAA", "BBB", "CCC"])
+    now = datetime.now(timezone.utc)
+    payload = {
+        "timestamp": now.isoformat(),
+        "data": {"AAA": 100, "BBB": 50, "CCC": 200},
+        "fetched": {
+            "AAA": (now - timedelta(hours=1)).isoformat(),
+            "BBB": (now - timedelta(days=3)).isoformat(),
+            "CCC": now.isoformat(),
+        },
+    }
+    (tmp_path / "market_caps.json").write_text(json.dumps(payload))
+
+    requested = []
+
+    def fake_fetch(ticker, fast=True):
+        requested.append(ticker)
+        return 500
+
+    monkeypatch.setattr(
+        YahooFinanceLoader, "fetch_market_cap", staticmethod(fake_fetch)
+    )
+
+    top = YahooFinanceLoader.get_top_n_by_marketcap(
+        2, cache_dir=str(tmp_path), ttl_days=1
+    )
+
+    assert requested == ["BBB"]
+    assert top == ["BBB", "CCC"]
+    saved = json.loads((tmp_path / "market_caps.json").read_text())
+    assert saved["data"]["BBB"] == 500
+    assert saved["fetched"]["AAA"] == payload["fetched"]["AAA"]
+    assert saved["fetched"]["BBB"] != payload["fetched"]["BBB"]
+
+
+def test_failed_save_keeps_previous_cache_intact(tmp_path, monkeypatch):
+    setup_universe(monkeypatch, ["AAA"])
+    old_ts = (datetime.now(timezone.utc) - timedelta(days=10)).isoformat()
+    payload = {"timestamp": old_ts, "data": {"AAA": 1}}
+    (tmp_path / "market_caps.json").write_text(json.dumps(payload))
+
+    monkeypatch.setattr(
+        YahooFinanceLoader, "fetch_market_cap", staticmethod(lambda t, fast=True: 2)
+    )
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("os.replace", crash)
+
+    top = YahooFinanceLoader.get_top_n_by_marketcap(1, cache_dir=str(tmp_path))
+
+    assert top == ["AAA"]
+    assert json.loads((tmp_path / "market_caps.json").read_text()) == payload
+    assert [p.name for p in tmp_path.iterdir()] == ["market_caps.json"]
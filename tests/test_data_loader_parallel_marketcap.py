@@ -0,0 +1,132 @@
+import json
+from types import SimpleNamespace
+import threading
+import time
+
+import pandas as pd
+
+from src.concurrency import RateLimiter
+from src.data_loader import YahooFinanceLoader
+
+
+def fake_get(url, timeout=10, headers=None):
+    return SimpleNamespace(
+        status_code=200, text="<html></html>", raise_for_status=lambda: None
+    )
+
+
+class FastTicker:
+    info_calls = 0
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+        self.fast_info = {"market_cap": {"AAA": 100, "BBB": 50, "CCC": 200}[ticker]}
+
+    @property
+    def info(self):
+        FastTicker.info_calls += 1
+        return {"marketCap": -1}
+
+
+def test_fast_info_path_skips_full_info(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        pd, "read_html", lambda url: [pd.DataFrame({"Symbol": ["AAA", "BBB", "CCC"]})]
+    )
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
+    FastTicker.info_calls = 0
+    monkeypatch.setattr("yfinance.Ticker", FastTicker)
+
+    top = YahooFinanceLoader.get_top_n_by_marketcap(
+        2, cache_dir=str(tmp_path), ttl_days=0
+    )
+
+    assert top == ["CCC", "AAA"]
+    assert FastTicker.info_calls == 0
+
+
+def test_refresh_runs_concurrently(tmp_path, monkeypatch):
+    symbols = [f"T{i}" for i in range(8)]
+    monkeypatch.setattr(
+        pd, "read_html", lambda url: [pd.DataFrame({"Symbol": symbols})]
+    )
+
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
+
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_fetch(ticker, fast=True):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return int(ticker[1:])
+
+    monkeypatch.setattr(
+        YahooFinanceLoader, "fetch_market_cap", staticmethod(fake_fetch)
+    )
+
+    top = YahooFinanceLoader.get_top_n_by_marketcap(
+        3, cache_dir=str(tmp_path), ttl_days=0, max_workers=4
+    )
+
+    assert top == ["T7", "T6", "T5"]
+    assert 1 < active["peak"] <= 4
+
+
+def test_each_lookup_is_throttled_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        pd, "read_html", lambda url: [pd.DataFrame({"Symbol": ["AAA", "BBB", "CCC"]})]
+    )
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
+    monkeypatch.setattr("yfinance.Ticker", FastTicker)
+    acquired = []
+    monkeypatch.setattr(RateLimiter, "acquire", lambda self: acquired.append(self))
+
+    YahooFinanceLoader.get_top_n_by_marketcap(2, cache_dir=str(tmp_path), ttl_days=0)
+
+    assert len(acquired) == 3
+
+
+def test_failed_refresh_keeps_the_stale_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        pd, "read_html", lambda url: [pd.DataFrame({"Symbol": ["AAA", "BBB", "CCC"]})]
+    )
+    monkeypatch.setattr("src.http_session.HttpClient.get", fake_get)
+    caps = {"AAA": 100, "BBB": 50, "CCC": 200}
+    monkeypatch.setattr(
+        YahooFinanceLoader,
+        "fetch_market_cap",
+        staticmethod(lambda t, fast=True: caps[t]),
+    )
+    YahooFinanceLoader.get_top_n_by_marketcap(3, cache_dir=str(tmp_path))
+    stale = json.loads((tmp_path / "market_caps.json").read_text())
+    stale["fetched"] = {t: "2020-01-01T00:00:00+00:00" for t in caps}
+    (tmp_path / "market_caps.json").write_text(json.dumps(stale))
+
+    def flaky(ticker, fast=True):
+        if ticker == "CCC":
+            raise RuntimeError("rate limited")
+        return {"AAA": 100, "BBB": 50}.get(ticker)
+
+    monkeypatch.setattr(YahooFinanceLoader, "fetch_market_cap", staticmethod(flaky))
+
+    top = YahooFinanceLoader.get_top_n_by_marketcap(2, cache_dir=str(tmp_path))
+
+    assert top == ["CCC", "AAA"]
+    saved = json.loads((tmp_path / "market_caps.json").read_text())
+    assert saved["data"]["CCC"] == 200
+    # Still stale, so the next call retries it
+    assert saved["fetched"]["CCC"] == "2020-01-01T00:00:00+00:00"
+    assert saved["fetched"]["AAA"] != "2020-01-01T00:00:00+00:00"
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    # first token is immediate, the remaining four wait ~1/20s each
+    assert time.monotonic() - start >= 0.18
@@ -36,11 +36,11 @@ def test_requests_timeout_uses_cache(tmp_path, monkeypatch):
     data = {"AAA": 100, "BBB": 50, "CCC": 200}
     make_cache(cache_dir, data)
 
-    # Simulate requests.get raising a timeout
+    # Simulate HttpClient.get raising a timeout
     def _timeout(*args, **kwargs):
         raise requests.exceptions.Timeout("timed out")
 
-    monkeypatch.setattr("requests.get", _timeout)
+    monkeypatch.setattr("src.http_session.HttpClient.get", _timeout)
 
     top2 = YahooFinanceLoader.get_top_n_by_marketcap(
         2, cache_dir=str(cache_dir), ttl_days=7
@@ -1,5 +1,6 @@
 import json
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
 import pandas as pd
 import warnings
@@ -31,7 +32,14 @@ def test_small_universe_warns_and_uses_cache(tmp_path, monkeypatch):
     assert len(top) == 10
 
 
-def test_verbose_reports_cache_path(monkeypatch):
+def test_verbose_reports_cache_path(monkeypatch, tmp_path):
+    monkeypatch.setattr(YahooFinanceLoader, "DEFAULT_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(
+        "src.http_session.HttpClient.get",
+        lambda url, timeout=10, headers=None: SimpleNamespace(
+            status_code=200, text="", headers={}, raise_for_status=lambda: None
+        ),
+    )
     # Mock pd.read_html to return normal set
     monkeypatch.setattr(
         pd, "read_html", lambda url: [pd.DataFrame({"Symbol": ["AAA", "BBB", "CCC"]})]
@@ -0,0 +1,90 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from src.data_source import FileDataSource
+from src.research_tool import ResearchTool
+
+
+def write_fixture(root, tickers):
+    periods = ["2023-12-31", "2022-12-31", "2021-12-31", "2020-12-31"]
+    for i, t in enumerate(tickers):
+        folder = root / "financials" / t
+        folder.mkdir(parents=True)
+        pd.DataFrame(
+            [[100.0 + i, 90.0, 80.0, 70.0], [20.0 + i, 18.0, 15.0, 12.0]],
+            index=["Total Revenue", "Net Income"],
+            columns=periods,
+        ).to_csv(folder / "income.csv")
+        pd.DataFrame(
+            [[50.0, 45.0, 40.0, 35.0], [100.0 + 10 * i, 95.0, 90.0, 80.0]],
+            index=["Long Term Debt", "Stockholders Equity"],
+            columns=periods,
+        ).to_csv(folder / "balance.csv")
+        pd.DataFrame(
+            [[10.0 + i, 9.0, 8.0, 7.0]], index=["Free Cash Flow"], columns=periods
+        ).to_csv(folder / "cashflow.csv")
+        info = {"longName": f"Company {t}", "sector": "Tech", "marketCap": 1000.0}
+        (folder / "info.json").write_text(json.dumps(info))
+
+    dates = pd.bdate_range("2019-01-01", "2023-12-29")
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(
+        100
+        * np.cumprod(
+            1 + rng.normal(0.0003, 0.01, (len(dates), len(tickers) + 1)), axis=0
+        ),
+        index=dates,
+        columns=tickers + ["^GSPC"],
+    )
+    prices.index.name = "Date"
+    prices.to_csv(root / "prices.csv")
+    pd.DataFrame({"Symbol": tickers, "marketCap": [1, 3, 2]}).to_csv(
+        root / "constituents.csv", index=False
+    )
+
+
+def no_network(*args, **kwargs):
+    raise AssertionError("network must not be used")
+
+
+def test_pipeline_runs_offline_from_fixtures(tmp_path, monkeypatch):
+    tickers = ["AAA", "BBB", "CCC"]
+    write_fixture(tmp_path, tickers)
+    monkeypatch.setattr("yfinance.Ticker", no_network)
+    monkeypatch.setattr("yfinance.download", no_network)
+    monkeypatch.setattr("src.http_session.HttpClient.get", no_network)
+
+    source = FileDataSource(str(tmp_path))
+    assert source.constituents() == ["BBB", "CCC", "AAA"]
+
+    tool = ResearchTool(tickers, source=source)
+    tool.load()
+    tool.evaluate()
+    result = tool.backtest()
+
+    assert [s.name for s in tool.stocks] == [f"Company {t}" for t in tickers]
+    assert tool.stocks[0].kpis.debt_to_equity == 0.5
+    assert math.isfinite(result["portfolio_cagr"])
+    assert math.isfinite(result["index_cagr"])
+
+
+def test_export_round_trips_statements(tmp_path):
+    write_fixture(tmp_path / "src", ["AAA", "BBB", "CCC"])
+    original = FileDataSource(str(tmp_path / "src"))
+
+    copy = FileDataSource.export(
+        str(tmp_path / "copy"), original, ["AAA"], "2019-01-01", "2020-01-01"
+    )
+
+    a = original.financials("AAA")
+    b = copy.financials("AAA")
+    pd.testing.assert_frame_equal(a.income, b.income)
+    assert isinstance(b.income.columns[0], pd.Timestamp)
+    assert b.info == a.info
+    assert list(copy.prices(["AAA", "^GSPC"], "2019-01-01", "2020-01-01").columns) == [
+        "AAA",
+        "^GSPC",
+    ]
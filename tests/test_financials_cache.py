@@ -0,0 +1,118 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from src.data_loader import YahooFinanceLoader
+from src.financials_cache import FinancialsCache
+
+
+class CountingTicker:
+    calls = []
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def _record(self, name, value):
+        CountingTicker.calls.append((self.ticker, name))
+        return value
+
+    @property
+    def financials(self):
+        return self._record(
+            "financials", pd.DataFrame({"2020": [10.0]}, index=["Net Income"])
+        )
+
+    @property
+    def balance_sheet(self):
+        return self._record(
+            "balance_sheet",
+            pd.DataFrame({"2020": [100.0]}, index=["Stockholders Equity"]),
+        )
+
+    @property
+    def cashflow(self):
+        return self._record(
+            "cashflow", pd.DataFrame({"2020": [5.0]}, index=["Free Cash Flow"])
+        )
+
+    @property
+    def info(self):
+        return self._record("info", {"longName": self.ticker, "marketCap": 1000})
+
+
+def test_warm_cache_does_no_network_io(tmp_path, monkeypatch):
+    CountingTicker.calls = []
+    monkeypatch.setattr("yfinance.Ticker", CountingTicker)
+
+    cache = FinancialsCache(str(tmp_path))
+    fin = YahooFinanceLoader.load_financials("AAA", cache=cache)
+    cache.flush()
+    assert len(CountingTicker.calls) == 4
+    assert fin.income.loc["Net Income"].iloc[0] == 10.0
+
+    # A new cache instance reads the persisted index and serves everything
+    CountingTicker.calls = []
+    warm = FinancialsCache(str(tmp_path))
+    fin2 = YahooFinanceLoader.load_financials("AAA", cache=warm)
+    assert CountingTicker.calls == []
+    pd.testing.assert_frame_equal(fin2.balance, fin.balance)
+    assert fin2.info["marketCap"] == 1000
+
+
+def test_expired_statement_is_refetched_alone(tmp_path, monkeypatch):
+    CountingTicker.calls = []
+    monkeypatch.setattr("yfinance.Ticker", CountingTicker)
+
+    cache = FinancialsCache(str(tmp_path))
+    YahooFinanceLoader.load_financials("AAA", cache=cache)
+    cache.flush()
+
+    # Age the info entry past its (1 day) TTL
+    index_file = tmp_path / "financials" / "index.json"
+    index = json.loads(index_file.read_text())
+    old = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    index["AAA"]["info"]["fetched"] = old
+    index_file.write_text(json.dumps(index))
+
+    CountingTicker.calls = []
+    YahooFinanceLoader.load_financials("AAA", cache=FinancialsCache(str(tmp_path)))
+    assert CountingTicker.calls == [("AAA", "info")]
+
+
+def test_corrupted_file_is_a_cache_miss(tmp_path):
+    cache = FinancialsCache(str(tmp_path))
+    cache.put("AAA", "info", {"sector": "Tech"})
+    cache.flush()
+    assert FinancialsCache(str(tmp_path)).get("AAA") == {"info": {"sector": "Tech"}}
+
+    (tmp_path / "financials" / "AAA" / "info.pkl").write_bytes(b"garbage")
+    assert FinancialsCache(str(tmp_path)).get("AAA") == {}
+
+
+def test_empty_responses_are_not_cached(tmp_path, monkeypatch):
+    class ThrottledTicker(CountingTicker):
+        @property
+        def financials(self):
+            return self._record("financials", pd.DataFrame())
+
+        @property
+        def info(self):
+            return self._record("info", {})
+
+    CountingTicker.calls = []
+    monkeypatch.setattr("yfinance.Ticker", ThrottledTicker)
+
+    cache = FinancialsCache(str(tmp_path))
+    YahooFinanceLoader.load_financials("AAA", cache=cache)
+    cache.flush()
+    assert set(FinancialsCache(str(tmp_path)).get("AAA")) == {"balance", "cashflow"}
+
+    # The next load asks Yahoo again for the empty statements only
+    CountingTicker.calls = []
+    monkeypatch.setattr("yfinance.Ticker", CountingTicker)
+    fin = YahooFinanceLoader.load_financials(
+        "AAA", cache=FinancialsCache(str(tmp_path))
+    )
+    assert sorted(CountingTicker.calls) == [("AAA", "financials"), ("AAA", "info")]
+    assert fin.info["marketCap"] == 1000
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from src.backtest_engine import Backtester
+from src.grid_runner import GridRunner
+from src.research_tool import ResearchTool
+from src.score_engine import ScoringEngine
+from src.weight_sweep import KPIS, WeightSweep
+from tests.test_weight_sweep import _returns, _table
+
+WINDOWS = [("2020-01-01", "2021-01-01"), ("2020-06-01", "2021-02-01")]
+
+
+def _grid():
+    return GridRunner.grid(WeightSweep.random_configs(6, seed=3), (3, 5), WINDOWS)
+
+
+def test_grid_is_the_cartesian_product():
+    grid = _grid()
+
+    assert len(grid) == 6 * 2 * 2
+    assert list(grid.columns) == [*KPIS, "top_n", "start", "end"]
+    default = GridRunner.grid()
+    assert default[KPIS].iloc[0].to_dict() == ScoringEngine.KPI_WEIGHTS
+    assert default[["top_n", "start", "end"]].iloc[0].tolist() == [
+        10,
+        "2019-01-01",
+        "2024-01-01",
+    ]
+
+
+def test_results_match_weight_sweep_per_window(tmp_path):
+    table = _table()
+    returns = _returns(list(table.frame["ticker"]))
+    grid = _grid()
+
+    result = GridRunner.run(table, returns, grid, max_workers=1, tmp_dir=str(tmp_path))
+
+    assert list(result.columns[: len(grid.columns)]) == list(grid.columns)
+    for (n, start, end), rows in result.groupby(["top_n", "start", "end"]):
+        window = returns[(returns.index >= start) & (returns.index < end)]
+        expected = WeightSweep.rank(table, rows[KPIS], window, top_n=n).sort_index()
+        for col in ["cagr", "volatility", "sharpe", "max_drawdown"]:
+            np.testing.assert_allclose(
+                rows[col].to_numpy(), expected[col].to_numpy(), rtol=1e-12
+            )
+    assert list(tmp_path.iterdir()) == []  # shared matrix removed
+
+
+def test_process_pool_matches_in_process_run():
+    table = _table()
+    returns = _returns(list(table.frame["ticker"]))
+    grid = _grid()
+
+    serial = GridRunner.run(table, returns, grid, max_workers=1)
+    parallel = GridRunner.run(table, returns, grid, max_workers=2, chunk_size=5)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_research_tool_loads_returns_once(monkeypatch):
+    table = _table()
+    tickers = list(table.frame["ticker"])
+    calls = []
+
+    def fake_returns(tickers, start, end, cache=None, source=None):
+        calls.append((tuple(tickers), start, end))
+        return _returns(list(tickers))
+
+    monkeypatch.setattr(Backtester, "returns_frame", fake_returns)
+    tool = ResearchTool(tickers)
+    tool.table = table
+
+    result = tool.grid(WeightSweep.random_configs(4), (3, 5), WINDOWS, max_workers=1)
+
+    assert calls == [(tuple(tickers), "2020-01-01", "2021-02-01")]
+    assert len(result) == 16
+    assert result["cagr"].notna().all()
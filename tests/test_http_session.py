@@ -0,0 +1,61 @@
+import pytest
+
+from src.http_session import HttpClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Isolate class-level settings and lazily built state per test
+    monkeypatch.setattr(HttpClient, "_session", None)
+    monkeypatch.setattr(HttpClient, "_limiter", None)
+    monkeypatch.setattr(HttpClient, "backoff_factor", 0.001)
+    monkeypatch.setattr(HttpClient, "retries", 3)
+    monkeypatch.setattr(HttpClient, "rate_limit", None)
+    yield HttpClient
+    if HttpClient._session is not None:
+        HttpClient._session.close()
+
+
+def test_session_is_shared_and_pooled(client):
+    client.pool_size = 4
+    s1 = client.session()
+    s2 = client.session()
+    assert s1 is s2
+
+    adapter = s1.get_adapter("https://en.wikipedia.org")
+    assert adapter._pool_maxsize == 4
+    assert 429 in adapter.max_retries.status_forcelist
+    assert adapter.max_retries.backoff_factor == 0.001
+
+
+def test_yf_call_retries_rate_limit_errors(client):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("Too Many Requests. Rate limited.")
+        return "ok"
+
+    assert client.yf_call(flaky) == "ok"
+    assert len(attempts) == 3
+
+
+def test_yf_call_does_not_retry_other_errors(client):
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise KeyError("missing")
+
+    with pytest.raises(KeyError):
+        client.yf_call(broken)
+    assert len(attempts) == 1
+
+
+def test_global_limiter_is_built_from_settings(client):
+    client.rate_limit = 100.0
+    client.burst = 5
+    client.throttle()
+    assert client._limiter is not None
+    assert client._limiter.capacity == 5
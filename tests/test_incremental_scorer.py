@@ -0,0 +1,147 @@
+import random
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.incremental_scorer import IncrementalScorer
+from src.models.financials import Financials
+from src.models.kpi_table import KPI_COLUMNS, KPITable
+from src.research_tool import ResearchTool
+from src.score_engine import ScoringEngine
+
+SECTORS = ["Tech", "Energy", "Health", None]
+
+
+def _value(rng):
+    roll = rng.random()
+    if roll < 0.1:
+        return None
+    if roll < 0.13:
+        return float("inf")
+    return rng.choice([-0.2, 0.0, 0.1, 0.1, 0.3, rng.random()])
+
+
+def _table(rng, n=120):
+    return KPITable.from_columns(
+        {
+            "ticker": [f"T{i}" for i in range(n)],
+            "name": [f"T{i}" for i in range(n)],
+            "sector": [rng.choice(SECTORS) for _ in range(n)],
+            **{k: [_value(rng) for _ in range(n)] for k in KPI_COLUMNS},
+            "score": [0.0] * n,
+        }
+    )
+
+
+def _full_scores(table):
+    copy = KPITable(table.frame.copy())
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ScoringEngine.score_table(copy)
+    return copy.frame["score"].to_numpy()
+
+
+def test_initial_scores_match_full_scoring():
+    table = _table(random.Random(7))
+    expected = _full_scores(table)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        IncrementalScorer(table)
+
+    np.testing.assert_allclose(table.frame["score"].to_numpy(), expected)
+
+
+def test_random_updates_match_full_rescoring():
+    rng = random.Random(11)
+    table = _table(rng)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        scorer = IncrementalScorer(table)
+
+        for step in range(40):
+            changes = {}
+            for _ in range(rng.randint(1, 4)):
+                ticker = f"T{rng.randrange(130)}"  # some are new tickers
+                values = {k: _value(rng) for k in rng.sample(KPI_COLUMNS, 2)}
+                if rng.random() < 0.3:
+                    values["sector"] = rng.choice(SECTORS)
+                changes[ticker] = values
+            scorer.update(changes)
+
+            np.testing.assert_allclose(
+                table.frame["score"].to_numpy(), _full_scores(table), err_msg=str(step)
+            )
+
+
+def test_update_only_touches_affected_sectors():
+    table = KPITable.from_columns(
+        {
+            "ticker": ["A", "B", "C", "D"],
+            "name": ["A", "B", "C", "D"],
+            "sector": ["Tech", "Tech", "Energy", "Energy"],
+            "roic": [0.1, 0.2, 0.3, 0.4],
+        }
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        scorer = IncrementalScorer(table)
+        # Corrupt Energy scores; an update in Tech must not rewrite them
+        table.frame.loc[table.frame["sector"] == "Energy", "score"] = -1.0
+        affected = scorer.update({"A": {"roic": 0.5}})
+
+    assert affected == {"Tech"}
+    assert table.frame["score"].tolist()[2:] == [-1.0, -1.0]
+    assert table.frame["score"].iat[0] > table.frame["score"].iat[1]
+
+
+def test_research_tool_refresh_rescores_changed_tickers():
+    roe = {"AAA": 0.1, "BBB": 0.2, "CCC": 0.3}
+
+    class Source:
+        def financials(self, ticker):
+            return Financials(
+                income=pd.DataFrame(
+                    {"2023": [roe[ticker] * 100]}, index=["Net Income"]
+                ),
+                balance=pd.DataFrame({"2023": [100.0]}, index=["Stockholders Equity"]),
+                cashflow=pd.DataFrame(),
+                info={"sector": "Tech"},
+            )
+
+    tool = ResearchTool(list(roe), source=Source())
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        tool.load()
+        tool.evaluate()
+        assert tool.ranking()[0].ticker == "CCC"
+
+        roe["AAA"] = 0.9
+        assert tool.refresh(["AAA"]) == {"Tech"}
+
+    assert tool.ranking()[0].ticker == "AAA"
+    assert tool.table.frame["roe"].iat[0] == pytest.approx(0.9)
+
+
+def test_update_warns_about_missing_kpis_like_full_scoring():
+    table = _table(random.Random(3), n=10)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        scorer = IncrementalScorer(table)
+    inf = float("inf")
+    kpis = list(ScoringEngine.KPI_WEIGHTS)
+    values = dict(zip(kpis, [inf, -inf, None, 0.1, 0.2]))
+
+    with warnings.catch_warnings(record=True) as incremental:
+        warnings.simplefilter("always")
+        scorer.update({"T0": values})
+    with warnings.catch_warnings(record=True) as full:
+        warnings.simplefilter("always")
+        row = {"ticker": ["T0"], "name": ["T0"], "sector": ["Tech"], "score": [0.0]}
+        row.update({k: [v] for k, v in values.items()})
+        ScoringEngine.score_table(KPITable.from_columns(row))
+
+    assert [str(w.message) for w in incremental] == [str(w.message) for w in full]
+    assert "3 missing" in str(incremental[0].message)
@@ -0,0 +1,127 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from src.kpi_calculator import KPICalculator
+from src.models.financials import Financials
+from src.models.kpi_table import KPI_COLUMNS
+from src.research_tool import ResearchTool
+
+PERIODS = ["2023", "2022", "2021", "2020"]
+
+
+def _fin(income=None, balance=None, cashflow=None, info=None, periods=PERIODS):
+    def frame(rows):
+        if rows is None:
+            return pd.DataFrame()
+        series = {k: pd.Series(v, index=periods[: len(v)]) for k, v in rows.items()}
+        n = max(len(v) for v in rows.values())
+        return pd.DataFrame(series).reindex(periods[:n]).T
+
+    return Financials(
+        income=frame(income),
+        balance=frame(balance),
+        cashflow=frame(cashflow),
+        info=info if info is not None else {},
+    )
+
+
+def _universe():
+    bal = {"Long Term Debt": [50.0], "Stockholders Equity": [150.0]}
+    return {
+        "EBIT": _fin(
+            {"Ebit": [100.0], "Total Revenue": [133.1, 121.0, 110.0, 100.0]},
+            bal,
+            {"Free Cash Flow": [30.0]},
+            {"taxRate": 0.2, "marketCap": 600.0},
+        ),
+        "OPINC": _fin(
+            {"Operating Income": [200.0], "Net Income": [120.0]},
+            {"Long Term Debt": [40.0], "Stockholders Equity": [160.0]},
+        ),
+        "NI": _fin(
+            {"Net Income": [80.0], "Interest Expense": [10.0]},
+            bal,
+            info={"taxRate": 0.2},
+        ),
+        "NI_NO_INTEREST": _fin({"Net Income": [80.0]}, bal),
+        "NAN_EBIT": _fin({"Ebit": [np.nan], "Operating Income": [5.0]}, bal),
+        "ZERO_EQUITY": _fin(
+            {"Net Income": [10.0]},
+            {"Long Term Debt": [0.0], "Stockholders Equity": [0.0]},
+        ),
+        "NAN_DEBT": _fin(
+            {"Ebit": [10.0]},
+            {"Long Term Debt": [np.nan], "Stockholders Equity": [20.0]},
+        ),
+        "SHORT_REVENUE": _fin({"Total Revenue": [120.0, 100.0]}, None),
+        "NO_MCAP": _fin(None, None, {"Free Cash Flow": [30.0]}, {"marketCap": None}),
+        "EMPTY": Financials(
+            income=pd.DataFrame(),
+            balance=pd.DataFrame(),
+            cashflow=pd.DataFrame(),
+            info={},
+        ),
+        "STRINGS": _fin(
+            {"Net Income": ["12"]},
+            {"Long Term Debt": ["n/a"], "Stockholders Equity": ["48"]},
+        ),
+    }
+
+
+def _same(a, b):
+    if a is None or (isinstance(a, float) and math.isnan(a)):
+        return math.isnan(b)
+    return math.isclose(a, b, rel_tol=1e-12, abs_tol=1e-15)
+
+
+def test_batch_matches_per_ticker_methods():
+    fins = _universe()
+    batch = KPICalculator.batch(fins)
+
+    assert list(batch.index) == list(fins)
+    assert list(batch.columns) == KPI_COLUMNS
+    for t, fin in fins.items():
+        for k in KPI_COLUMNS:
+            expected = getattr(KPICalculator, k)(fin)
+            assert _same(expected, batch.at[t, k]), (t, k, expected, batch.at[t, k])
+
+
+def test_batch_known_values():
+    batch = KPICalculator.batch(_universe())
+
+    assert abs(batch.at["EBIT", "roic"] - 0.4) < 1e-12
+    assert abs(batch.at["EBIT", "revenue_cagr"] - 0.1) < 1e-12
+    assert abs(batch.at["EBIT", "fcf_yield"] - 0.05) < 1e-12
+    assert math.isnan(batch.at["ZERO_EQUITY", "roe"])
+
+
+def test_batch_empty_universe():
+    batch = KPICalculator.batch({})
+    assert batch.empty
+    assert list(batch.columns) == KPI_COLUMNS
+
+
+def test_long_format_layout():
+    long = KPICalculator.long_format({"EBIT": _universe()["EBIT"]})
+
+    rev = long[long["item"] == "Total Revenue"].sort_values("position")
+    assert rev["position"].tolist() == [0, 1, 2, 3]
+    assert rev["period"].tolist() == PERIODS
+    assert set(long["statement"]) == {"income", "balance", "cashflow"}
+
+
+def test_load_with_batch_kpis_matches_default():
+    fins = _universe()
+
+    class Source:
+        def financials(self, ticker):
+            return fins[ticker]
+
+    default = ResearchTool(list(fins), source=Source())
+    default.load()
+    batched = ResearchTool(list(fins), source=Source())
+    batched.load(batch_kpis=True)
+
+    pd.testing.assert_frame_equal(default.table.frame, batched.table.frame)
@@ -0,0 +1,88 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from src.models.kpi_table import KPITable
+from src.models.kpis import KPIs
+from src.models.stock import Stock
+from src.research_tool import ResearchTool
+from src.score_engine import ScoringEngine
+
+
+def make_stocks():
+    return [
+        Stock(ticker="AAA", name="A", sector="S", kpis=KPIs(0.1, 0.2, None, 0.1, 0.5)),
+        Stock(ticker="BBB", name="B", sector="S", kpis=KPIs(0.3, 0.1, 0.02, 0.2, 1.0)),
+        Stock(ticker="CCC", name="C", sector="T", kpis=KPIs(0.2, 0.3, 0.01, 0.0, 0.2)),
+    ]
+
+
+def test_table_scores_match_stock_list_scores():
+    stocks = make_stocks()
+    table = KPITable.from_stocks(stocks)
+
+    ScoringEngine.score(stocks)
+    ScoringEngine.score(table)
+
+    assert table.frame["score"].tolist() == [s.score for s in stocks]
+
+
+def test_views_read_and_write_through_to_columns():
+    table = KPITable.from_stocks(make_stocks())
+    view = list(table)[0]
+
+    assert view.ticker == "AAA"
+    assert view.kpis.fcf_yield is None
+    assert view.kpis.roic == 0.1
+
+    view.score = 0.75
+    assert table.frame.loc[0, "score"] == 0.75
+
+
+def test_ranking_is_stable_for_ties():
+    table = KPITable.from_stocks(make_stocks())
+    table.frame["score"] = [0.5, 0.9, 0.5]
+    assert [v.ticker for v in table.ranked_views()] == ["BBB", "AAA", "CCC"]
+
+
+def test_research_tool_stocks_setter_builds_table(tmp_path):
+    tool = ResearchTool([])
+    tool.stocks = make_stocks()
+    tool.evaluate()
+
+    out = tmp_path / "out.csv"
+    tool.export_csv(str(out))
+    df = pd.read_csv(out)
+
+    assert len(tool.table) == 3
+    assert df["ticker"].tolist() == [v.ticker for v in tool.ranking()]
+
+
+def test_research_tool_stocks_is_read_only():
+    tool = ResearchTool([])
+    tool.stocks = make_stocks()
+
+    with pytest.raises(AttributeError):
+        tool.stocks.append(make_stocks()[0])
+    tool.stocks[0].score = 0.5
+    assert tool.table.frame.loc[0, "score"] == 0.5
+
+
+def test_missing_kpi_warnings_agree_between_list_and_table():
+    nan, inf = float("nan"), float("inf")
+    stocks = [
+        Stock(ticker="NAN", sector="S", kpis=KPIs(nan, nan, nan, 0.1, 0.5)),
+        Stock(ticker="INF", sector="S", kpis=KPIs(inf, None, -inf, 0.2, 0.4)),
+        *make_stocks(),
+    ]
+
+    def warned(universe):
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            ScoringEngine.score(universe)
+        return [str(x.message) for x in w]
+
+    from_list = warned(stocks)
+    assert from_list == warned(KPITable.from_stocks(stocks))
+    assert [m.split()[1] for m in from_list] == ["NAN", "INF"]
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from src.kpi_calculator import KPICalculator
+from src.memory_report import MemoryReport
+from src.models.lean_financials import LEAN_INFO_KEYS, LeanFinancials
+from src.research_tool import ResearchTool
+from tests.synthetic_source import SyntheticDataSource
+
+UNIVERSE = [f"T{i:02d}" for i in range(20)]
+
+
+def test_lean_record_keeps_only_pipeline_fields():
+    fin = SyntheticDataSource(UNIVERSE).financials("T03")
+    lean = LeanFinancials.from_financials(fin, KPICalculator.BATCH_ITEMS)
+
+    assert not hasattr(lean, "__dict__")
+    assert set(lean.info) <= set(LEAN_INFO_KEYS)
+    assert lean.info["sector"] == fin.info["sector"]
+    assert lean.income.index.tolist() == [
+        "EBIT",
+        "Net Income",
+        "Interest Expense",
+        "Total Revenue",
+    ]
+    assert lean.balance.shape == (2, 4)
+    assert lean.cashflow.loc["Free Cash Flow"].iloc[0] == fin.cashflow.iloc[0, 0]
+
+    for k in ["roic", "roe", "fcf_yield", "revenue_cagr", "debt_to_equity"]:
+        assert getattr(KPICalculator, k)(lean) == getattr(KPICalculator, k)(fin)
+
+
+def test_lean_load_matches_full_load():
+    source = SyntheticDataSource(UNIVERSE)
+    full = ResearchTool(UNIVERSE, source=source)
+    full.load()
+
+    for kwargs in ({}, {"batch_kpis": True}, {"streaming": True}):
+        lean = ResearchTool(UNIVERSE, source=source)
+        lean.load(lean=True, **kwargs)
+        pd.testing.assert_frame_equal(full.table.frame, lean.table.frame)
+
+
+def test_memory_report_shows_lean_records_are_smaller():
+    report = MemoryReport.compare(SyntheticDataSource(UNIVERSE), UNIVERSE)
+
+    assert list(report.index) == ["full", "lean"]
+    assert report.loc["lean", "held_mb"] < report.loc["full", "held_mb"] / 4
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from src.data_source import FileDataSource
+from src.kpi_calculator import KPICalculator
+from src.line_items import LABEL_INDEX, LINE_ITEM_SYNONYMS, LineItems
+from src.models.financials import Financials
+
+
+def test_synonym_index_maps_every_label_to_its_canonical_item():
+    for canonical, labels in LINE_ITEM_SYNONYMS.items():
+        assert labels[0] == canonical
+        for rank, label in enumerate(labels):
+            assert LABEL_INDEX[label] == (canonical, rank)
+
+
+def test_normalize_renames_highest_priority_label_and_is_idempotent():
+    df = pd.DataFrame(
+        {"2023": [5.0, 7.0, 100.0, 1.0]},
+        index=["Operating Income", "Ebit", "TotalRevenue", "Some Other Metric"],
+    )
+
+    out = LineItems.normalize(df)
+    assert out.loc["EBIT", "2023"] == 7.0
+    assert out.loc["Operating Income", "2023"] == 5.0
+    assert out.loc["Total Revenue", "2023"] == 100.0
+    assert "Some Other Metric" in out.index
+    assert df.index.tolist()[1] == "Ebit"  # input untouched
+
+    again = LineItems.normalize(out)
+    pd.testing.assert_frame_equal(out, again)
+
+
+def test_find_and_get_on_raw_frames():
+    df = pd.DataFrame({"2023": [3.0]}, index=["Common Stock Equity"])
+
+    assert LineItems.find(df, "Stockholders Equity").iloc[0] == 3.0
+    assert LineItems.find(df, "Net Income") is None
+    with pytest.raises(KeyError):
+        LineItems.get(df, "Net Income")
+
+
+def test_kpis_accept_alternative_labels():
+    fin = Financials(
+        income=pd.DataFrame({"2023": [30.0]}, index=["Net Income Common Stockholders"]),
+        balance=pd.DataFrame(
+            {"2023": [20.0, 60.0]},
+            index=[
+                "Long Term Debt And Capital Lease Obligation",
+                "Common Stock Equity",
+            ],
+        ),
+        cashflow=pd.DataFrame({"2023": [10.0]}, index=["FreeCashFlow"]),
+        info={"marketCap": 200.0},
+    )
+
+    assert KPICalculator.roe(fin) == 0.5
+    assert abs(KPICalculator.debt_to_equity(fin) - 1 / 3) < 1e-12
+    assert KPICalculator.fcf_yield(fin) == 0.05
+
+    batch = KPICalculator.batch({"X": fin})
+    normalized = KPICalculator.batch({"X": LineItems.normalize_financials(fin)})
+    pd.testing.assert_frame_equal(batch, normalized)
+    assert batch.at["X", "roe"] == 0.5
+
+
+def test_file_source_normalizes_statements(tmp_path):
+    folder = tmp_path / "financials" / "AAA"
+    folder.mkdir(parents=True)
+    pd.DataFrame({"2023-12-31": [9.0]}, index=["OperatingIncome"]).to_csv(
+        folder / "income.csv"
+    )
+
+    fin = FileDataSource(str(tmp_path)).financials("AAA")
+
+    assert fin.income.index.tolist() == ["EBIT"]
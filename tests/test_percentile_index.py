@@ -0,0 +1,84 @@
+import random
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import percentileofscore
+
+from src.models.kpi_table import KPITable
+from src.percentile_index import PercentileIndex
+from src.score_engine import ScoringEngine
+
+
+def _table(n=80, seed=3):
+    rng = random.Random(seed)
+    kpis = list(ScoringEngine.KPI_WEIGHTS)
+    return KPITable.from_columns(
+        {
+            "ticker": [f"T{i}" for i in range(n)],
+            "name": [f"T{i}" for i in range(n)],
+            "sector": [rng.choice(["Tech", "Energy", None]) for _ in range(n)],
+            **{
+                k: [rng.choice([None, 0.1, 0.1, 0.5, rng.random()]) for _ in range(n)]
+                for k in kpis
+            },
+            "score": [0.0] * n,
+        }
+    )
+
+
+def test_rank_matches_percentileofscore():
+    rng = random.Random(1)
+    values = [rng.choice([1.0, 2.0, 2.0, 3.5, rng.random()]) for _ in range(50)]
+    queries = values + [0.0, 2.0, 10.0, float("nan")]
+
+    got = PercentileIndex.rank(np.sort(values), np.array(queries))
+
+    for q, p in zip(queries, got):
+        if np.isnan(q):
+            assert np.isnan(p)
+        else:
+            assert p == pytest.approx(percentileofscore(values, q) / 100)
+
+
+def test_percentile_matrix_of_indexed_rows_matches_scoring_engine():
+    table = _table()
+    matrix = table.kpi_matrix()[list(ScoringEngine.KPI_WEIGHTS)]
+    index = PercentileIndex.from_table(table)
+
+    got = index.percentile_matrix(matrix, table.frame["sector"])
+    expected = ScoringEngine.percentile_matrix(matrix, table.frame["sector"])
+
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ScoringEngine.score_table(table)
+    np.testing.assert_allclose(
+        index.score(matrix, table.frame["sector"]), table.frame["score"]
+    )
+
+
+def test_hypothetical_rows_are_ranked_against_the_index():
+    index = PercentileIndex.build(
+        pd.DataFrame({"roic": [0.1, 0.2, 0.3, 0.4]}), ["Tech", "Tech", "Tech", None]
+    )
+    before = index.values("Tech", "roic").copy()
+
+    pct = index.percentile_matrix(
+        pd.DataFrame({"roic": [0.25, 0.3, 0.05, 1.0]}), ["Tech", "Tech", None, "Gas"]
+    )
+
+    np.testing.assert_allclose(pct["roic"][:3], [2 / 3, 1.0, 0.0])
+    assert np.isnan(pct["roic"][3])  # unknown sector
+    np.testing.assert_array_equal(index.values("Tech", "roic"), before)
+
+
+def test_insert_and_remove_keep_arrays_sorted():
+    index = PercentileIndex(["roic"])
+    for v in [0.3, 0.1, float("nan"), 0.2, 0.1]:
+        index.insert("Tech", "roic", v)
+    index.remove("Tech", "roic", 0.1)
+
+    np.testing.assert_array_equal(index.values("Tech", "roic"), [0.1, 0.2, 0.3])
+    assert index.sectors() == {"Tech"}
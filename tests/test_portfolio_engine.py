@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest_engine import Backtester
+from src.portfolio_engine import PortfolioEngine
+
+
+def _returns(days=130, tickers=("A", "B", "C", "D"), seed=1):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        rng.normal(0.0005, 0.01, (days, len(tickers))),
+        index=pd.bdate_range("2021-01-01", periods=days),
+        columns=list(tickers),
+    )
+    frame.iloc[:10, 0] = np.nan  # late listing
+    return frame
+
+
+def test_daily_rebalance_matches_equal_weight_mean():
+    returns = _returns()
+    weights = PortfolioEngine.equal_weights({"p": ["A", "B", "C"]})
+
+    result = PortfolioEngine.run(returns, weights, rebalance="D")
+
+    expected = returns[["A", "B", "C"]].mean(axis=1)
+    pd.testing.assert_series_equal(
+        result.returns["p"], expected, check_names=False, rtol=1e-12
+    )
+
+
+def test_buy_and_hold_drifts_with_prices():
+    returns = _returns()[["B", "C"]]
+    weights = pd.DataFrame({"B": [0.25], "C": [0.75]}, index=["bh"])
+
+    result = PortfolioEngine.run(returns, weights, rebalance=None)
+
+    growth = (1 + returns).cumprod()
+    value = 0.25 * growth["B"] + 0.75 * growth["C"]
+    np.testing.assert_allclose(result.cumulative["bh"], value - 1, rtol=1e-12)
+
+
+def test_rebalance_positions_monthly_and_quarterly():
+    index = pd.bdate_range("2021-01-01", "2021-06-30")
+
+    monthly = PortfolioEngine.rebalance_positions(index, "M")
+    quarterly = PortfolioEngine.rebalance_positions(index, "Q")
+
+    assert [index[i].month for i in monthly] == [1, 2, 3, 4, 5, 6]
+    assert all(index[i] == index[index.month == index[i].month][0] for i in monthly)
+    assert list(index[quarterly]) == [pd.Timestamp("2021-01-01"), index[monthly[3]]]
+    with pytest.raises(ValueError):
+        PortfolioEngine.rebalance_positions(pd.RangeIndex(5), "M")
+
+
+def test_monthly_rebalance_resets_weights_each_month():
+    returns = _returns()[["B", "C"]]
+    weights = pd.Series({"B": 0.5, "C": 0.5}, name="half")
+
+    daily = PortfolioEngine.run(returns, weights, rebalance="M").returns["half"]
+
+    for _, month in returns.groupby(returns.index.to_period("M")):
+        growth = (1 + month).cumprod().mean(axis=1)
+        expected = growth.pct_change().fillna(growth.iloc[0] - 1)
+        np.testing.assert_allclose(daily.loc[month.index], expected, rtol=1e-10)
+
+
+def test_many_portfolios_match_single_runs():
+    returns = _returns()
+    weights = PortfolioEngine.equal_weights(
+        {"ab": ["A", "B"], "cd": ["C", "D"], "all": ["A", "B", "C", "D"]}
+    )
+
+    together = PortfolioEngine.run(returns, weights, rebalance="Q")
+
+    for name in weights.index:
+        alone = PortfolioEngine.run(returns, weights.loc[[name]], rebalance="Q")
+        pd.testing.assert_frame_equal(alone.returns, together.returns[[name]])
+        pd.testing.assert_frame_equal(alone.metrics, together.metrics.loc[[name]])
+
+
+def test_metrics_match_single_series_helpers():
+    returns = _returns()
+    weights = PortfolioEngine.equal_weights({"p": ["B", "C", "D"]})
+
+    result = PortfolioEngine.run(returns, weights, rebalance="M")
+    series = result.returns["p"]
+    metrics = result.metrics.loc["p"]
+
+    assert metrics["volatility"] == pytest.approx(
+        Backtester.annualized_volatility(series)
+    )
+    assert metrics["sharpe"] == pytest.approx(Backtester.sharpe_ratio(series))
+    assert metrics["max_drawdown"] == pytest.approx(Backtester.max_drawdown(series))
+    pd.testing.assert_series_equal(
+        result.cumulative["p"], Backtester.cumulative_returns(series)
+    )
+
+
+def test_weight_schedule_switches_holdings_from_its_dates():
+    returns = _returns()[["B", "C"]]
+    switch = returns.index[40] + pd.Timedelta(hours=1)  # not a trading day
+    schedule = pd.DataFrame(
+        {"B": [1.0, 0.0], "C": [0.0, 1.0]},
+        index=pd.DatetimeIndex([returns.index[5], switch]),
+    )
+
+    daily = PortfolioEngine.run(returns, {"s": schedule}, rebalance=None).returns["s"]
+
+    assert daily.iloc[:5].isna().all()
+    np.testing.assert_allclose(daily.iloc[5:41], returns["B"].iloc[5:41])
+    np.testing.assert_allclose(daily.iloc[41:], returns["C"].iloc[41:])
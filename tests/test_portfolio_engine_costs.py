@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio_engine import PortfolioEngine
+from tests.test_portfolio_engine import _returns
+
+
+def test_buy_and_hold_pays_entry_cost_once():
+    returns = _returns()[["B", "C"]]
+    weights = pd.DataFrame({"B": [0.25], "C": [0.75]}, index=["bh"])
+
+    free = PortfolioEngine.run(returns, weights, rebalance=None)
+    costly = PortfolioEngine.run(
+        returns, weights, rebalance=None, cost_bps=10, slippage_bps=5
+    )
+
+    assert costly.turnover["bh"].tolist() == [1.0]
+    assert costly.metrics.loc["bh", "turnover"] == 0.0
+    np.testing.assert_allclose(
+        1 + costly.cumulative["bh"], (1 + free.cumulative["bh"]) * (1 - 0.0015)
+    )
+    pd.testing.assert_series_equal(
+        costly.returns["bh"].iloc[1:], free.returns["bh"].iloc[1:]
+    )
+
+
+def test_turnover_is_the_trade_back_from_drifted_weights():
+    returns = _returns()[["B", "C"]]
+    weights = pd.Series({"B": 0.5, "C": 0.5}, name="half")
+
+    result = PortfolioEngine.run(returns, weights, rebalance="M", cost_bps=20)
+
+    months = list(returns.groupby(returns.index.to_period("M")))
+    first = (1 + months[0][1]).prod()
+    drifted = 0.5 * first / (0.5 * first).sum()
+    expected = np.abs(0.5 - drifted).sum()
+    second_day = months[1][1].index[0]
+    assert result.turnover.loc[second_day, "half"] == pytest.approx(expected)
+
+    gross = 0.5 * (1 + months[1][1].iloc[0]).sum()
+    assert result.returns.loc[second_day, "half"] == pytest.approx(
+        gross * (1 - 0.002 * expected) - 1
+    )
+    assert result.metrics.loc["half", "turnover"] == pytest.approx(
+        result.turnover["half"].iloc[1:].sum() / (len(returns) / 252)
+    )
+
+
+def test_costs_match_free_run_when_zero():
+    returns = _returns()
+    weights = PortfolioEngine.equal_weights({"ab": ["A", "B"], "cd": ["C", "D"]})
+
+    free = PortfolioEngine.portfolio_returns(returns, weights, rebalance="W")
+    daily, turnover = PortfolioEngine.simulate(returns, weights, rebalance="W")
+
+    pd.testing.assert_frame_equal(daily, free)
+    assert (turnover.iloc[0] == 1.0).all()
+    assert (turnover["cd"].iloc[1:] < 0.2).all()
+    # A lists on day 10: "ab" moves from all-B to half/half at the next rebalance
+    listed = turnover.index[turnover.index >= returns.index[10]][0]
+    assert turnover.loc[listed, "ab"] == pytest.approx(1.0)
+
+
+def test_leaving_the_market_charges_the_last_invested_day():
+    returns = _returns()[["B", "C"]]
+    exit_day = returns.index[30]
+    schedule = pd.DataFrame(
+        {"B": [1.0, 0.0], "C": [0.0, 0.0]},
+        index=pd.DatetimeIndex([returns.index[0], exit_day]),
+    )
+
+    result = PortfolioEngine.run(returns, {"s": schedule}, rebalance=None, cost_bps=50)
+    daily = result.returns["s"]
+
+    assert result.turnover["s"].tolist() == [1.0, 1.0]
+    assert daily.iloc[30:].isna().all()
+    assert daily.iloc[29] == pytest.approx(
+        (1 + returns["B"].iloc[29]) * (1 - 0.005) - 1
+    )
+    assert daily.iloc[0] == pytest.approx((1 + returns["B"].iloc[0]) * 0.995 - 1)
@@ -0,0 +1,132 @@
+import mmap
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest_engine import Backtester
+from src.data_loader import YahooFinanceLoader
+from src.price_store import PriceStore
+from tests.test_backtest_batched_prices import make_download
+
+
+def _prices(tickers, start, periods, offset=0.0):
+    dates = pd.bdate_range(start, periods=periods)
+    return pd.DataFrame(
+        {t: 100.0 + i + offset + np.arange(periods) for i, t in enumerate(tickers)},
+        index=dates,
+    )
+
+
+def test_write_and_read_round_trip(tmp_path):
+    store = PriceStore(str(tmp_path))
+    prices = _prices(["AAA", "BBB", "CCC"], "2020-01-01", 30)
+    store.write(prices)
+
+    reopened = PriceStore(str(tmp_path))
+    frame = reopened.frame(["BBB", "CCC"], "2020-01-06", "2020-01-20")
+
+    pd.testing.assert_frame_equal(
+        frame, prices.loc["2020-01-06":"2020-01-17", ["BBB", "CCC"]], check_freq=False
+    )
+    # Consecutive ticker slots are served straight from the mapped file
+    base = frame.values
+    while getattr(base, "base", None) is not None:
+        base = base.base
+    assert isinstance(base, mmap.mmap)
+
+
+def test_appending_days_does_not_rewrite_existing_rows(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.write(_prices(["AAA", "BBB"], "2020-01-01", 20))
+    close = tmp_path / "price_store" / "close.f64"
+    inode = close.stat().st_ino
+
+    later = _prices(["AAA", "BBB"], "2020-01-29", 10, offset=50.0)
+    store.write(later)
+
+    assert close.stat().st_ino == inode  # appended in place, not replaced
+    assert close.stat().st_size == 30 * store.capacity * 8
+    frame = store.frame(["AAA", "BBB"], "2020-01-01", "2021-01-01")
+    assert len(frame) == 30
+    assert frame["BBB"].iloc[-1] == later["BBB"].iloc[-1]
+
+
+def test_new_tickers_and_out_of_order_dates(tmp_path):
+    store = PriceStore(str(tmp_path), capacity=2)
+    store.write(_prices(["AAA", "BBB"], "2020-02-03", 5))
+    store.write(_prices(["CCC", "DDD", "EEE"], "2020-01-27", 10))
+
+    assert store.capacity == 8
+    frame = store.frame(["EEE", "AAA", "ZZZ"], "2020-01-01", "2020-03-01")
+    assert frame.index[0] == pd.Timestamp("2020-01-27")
+    assert frame["AAA"].first_valid_index() == pd.Timestamp("2020-02-03")
+    assert frame["EEE"].iloc[0] == 102.0
+    assert frame["ZZZ"].isna().all()
+
+
+def test_nan_does_not_overwrite_prices(tmp_path):
+    store = PriceStore(str(tmp_path))
+    prices = _prices(["AAA"], "2020-01-01", 5)
+    store.write(prices)
+    store.write(prices * np.nan)
+
+    assert store.get("AAA", "2020-01-01", "2020-02-01").tolist() == list(prices["AAA"])
+
+
+def test_store_works_as_price_cache_for_backtests(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr("yfinance.download", make_download(calls))
+    store = PriceStore(str(tmp_path))
+    saves = []
+    save = PriceStore.write
+    monkeypatch.setattr(
+        PriceStore,
+        "write",
+        lambda self, *a, **k: saves.append(1) or save(self, *a, **k),
+    )
+
+    first = YahooFinanceLoader.load_prices(
+        ["AAA", "BBB"], "2020-02-01", "2020-03-01", store
+    )
+    assert len(saves) == 1  # one write (and index save) per download
+    calls.clear()
+    returns = Backtester.returns_frame(
+        ["AAA", "BBB"], "2020-02-01", "2020-03-01", cache=PriceStore(str(tmp_path))
+    )
+
+    assert calls == []
+    assert first["BBB"].iloc[0] == 101.0
+    pd.testing.assert_frame_equal(
+        returns, first.pct_change(fill_method=None).dropna(how="all")
+    )
+
+
+def test_crash_before_index_save_keeps_the_old_generation(tmp_path, monkeypatch):
+    store = PriceStore(str(tmp_path), capacity=2)
+    prices = _prices(["AAA", "BBB"], "2020-01-01", 5)
+    store.write(prices)
+
+    def crash(path, payload):
+        raise OSError("disk full")
+
+    # Growing past two slots rewrites the files, then fails to save the index
+    with monkeypatch.context() as m:
+        m.setattr("src.price_store.atomic_write_json", crash)
+        with pytest.raises(OSError):
+            store.write(_prices(["CCC"], "2020-01-01", 5))
+
+    reopened = PriceStore(str(tmp_path))
+    assert reopened.capacity == 2
+    pd.testing.assert_frame_equal(
+        reopened.frame(["AAA", "BBB"], "2020-01-01", "2020-02-01"),
+        prices,
+        check_freq=False,
+    )
+
+    reopened.write(_prices(["CCC"], "2020-01-01", 5))
+    files = sorted(p.name for p in (tmp_path / "price_store").iterdir())
+    assert files == ["close.1.f64", "dates.1.i8", "index.json"]
+    assert PriceStore(str(tmp_path)).frame(["CCC"], "2020-01-01", "2020-02-01")[
+        "CCC"
+    ].tolist() == list(_prices(["CCC"], "2020-01-01", 5)["CCC"])
@@ -0,0 +1,89 @@
+import threading
+import time
+import warnings
+
+import pandas as pd
+
+from src.models.financials import Financials
+from src.research_tool import ResearchTool
+
+
+def _make_fin(ticker):
+    return Financials(
+        income=pd.DataFrame(),
+        balance=pd.DataFrame(),
+        cashflow=pd.DataFrame(),
+        info={"longName": f"Company {ticker}", "sector": "Tech"},
+    )
+
+
+def test_concurrent_load_keeps_universe_order(monkeypatch):
+    tickers = ["AAA", "BBB", "CCC", "DDD"]
+    delays = {"AAA": 0.05, "BBB": 0.0, "CCC": 0.03, "DDD": 0.0}
+
+    def _load_financials(ticker):
+        time.sleep(delays[ticker])
+        return _make_fin(ticker)
+
+    monkeypatch.setattr(
+        "src.data_loader.YahooFinanceLoader.load_financials", _load_financials
+    )
+
+    tool = ResearchTool(tickers)
+    tool.load(max_workers=4)
+
+    assert [s.ticker for s in tool.stocks] == tickers
+    assert tool.stocks[0].name == "Company AAA"
+
+
+def test_failing_and_slow_tickers_are_skipped(monkeypatch):
+    tickers = ["AAA", "BAD", "SLOW", "DDD"]
+
+    def _load_financials(ticker):
+        if ticker == "BAD":
+            raise RuntimeError("boom")
+        if ticker == "SLOW":
+            time.sleep(1.0)
+        return _make_fin(ticker)
+
+    monkeypatch.setattr(
+        "src.data_loader.YahooFinanceLoader.load_financials", _load_financials
+    )
+
+    tool = ResearchTool(tickers)
+    start = time.monotonic()
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        tool.load(max_workers=2, timeout=0.2)
+    elapsed = time.monotonic() - start
+
+    assert [s.ticker for s in tool.stocks] == ["AAA", "DDD"]
+    assert elapsed < 0.9
+    messages = " ".join(str(x.message) for x in w)
+    assert "BAD" in messages and "SLOW" in messages
+
+
+def test_hung_calls_do_not_stall_the_batch(monkeypatch):
+    # As many hanging tickers as workers: the queued tickers must still run
+    tickers = ["HANG1", "HANG2", "AAA", "BBB", "CCC"]
+    release = threading.Event()
+
+    def _load_financials(ticker):
+        if ticker.startswith("HANG"):
+            release.wait(5.0)
+        return _make_fin(ticker)
+
+    monkeypatch.setattr(
+        "src.data_loader.YahooFinanceLoader.load_financials", _load_financials
+    )
+
+    tool = ResearchTool(tickers)
+    start = time.monotonic()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        tool.load(max_workers=2, timeout=0.2)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    assert [s.ticker for s in tool.stocks] == ["AAA", "BBB", "CCC"]
+    assert elapsed < 1.0
@@ -0,0 +1,81 @@
+import gc
+import time
+import warnings
+import weakref
+
+import pandas as pd
+
+from src.models.financials import Financials
+from src.research_tool import ResearchTool
+
+TICKERS = [f"T{i}" for i in range(12)]
+
+
+class _Source:
+    """Fake source that returns a fresh statement set per call."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.issued = []
+
+    def financials(self, ticker):
+        time.sleep(0.01 * (int(ticker[1:]) % 3))
+        if ticker in self.fail:
+            raise RuntimeError("boom")
+        i = int(ticker[1:])
+        fin = Financials(
+            income=pd.DataFrame({"2023": [10.0 + i]}, index=["Net Income"]),
+            balance=pd.DataFrame(
+                {"2023": [5.0, 50.0 + i]},
+                index=["Long Term Debt", "Stockholders Equity"],
+            ),
+            cashflow=pd.DataFrame(),
+            info={"sector": "Tech" if i % 2 else "Energy"},
+        )
+        self.issued.append(weakref.ref(fin))
+        return fin
+
+    def alive(self):
+        gc.collect()
+        return sum(ref() is not None for ref in self.issued)
+
+
+def test_streaming_load_matches_default_load():
+    default = ResearchTool(TICKERS, source=_Source())
+    default.load()
+    streamed = ResearchTool(TICKERS, source=_Source())
+    streamed.load(max_workers=4, streaming=True)
+
+    pd.testing.assert_frame_equal(default.table.frame, streamed.table.frame)
+
+    default.evaluate()
+    streamed.evaluate()
+    assert [s.ticker for s in streamed.ranking()] == [
+        s.ticker for s in default.ranking()
+    ]
+
+
+def test_stream_releases_statements_after_kpi_extraction():
+    source = _Source()
+    tool = ResearchTool(TICKERS, source=source)
+
+    peak = 0
+    positions = []
+    for pos, row in tool.stream(max_workers=2):
+        positions.append(pos)
+        assert set(row) == set(tool.table.COLUMNS)
+        peak = max(peak, source.alive())
+
+    assert sorted(positions) == list(range(len(TICKERS)))
+    assert peak <= 4
+    assert source.alive() == 0
+
+
+def test_streaming_skips_failing_tickers():
+    tool = ResearchTool(TICKERS, source=_Source(fail={"T3"}))
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        tool.load(max_workers=3, streaming=True)
+
+    assert [s.ticker for s in tool.stocks] == [t for t in TICKERS if t != "T3"]
+    assert any("T3" in str(x.message) for x in w)
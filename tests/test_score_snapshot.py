@@ -0,0 +1,91 @@
+import random
+from types import MappingProxyType
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.kpi_table import KPI_COLUMNS, KPITable
+from src.models.kpis import KPIs
+from src.score_engine import ScoringEngine
+from src.score_snapshot import ScoreSnapshot
+
+
+def _scored_table(n=60, seed=5):
+    rng = random.Random(seed)
+    table = KPITable.from_columns(
+        {
+            "ticker": [f"T{i}" for i in range(n)],
+            "name": [f"T{i}" for i in range(n)],
+            "sector": [rng.choice(["Tech", "Energy", None]) for _ in range(n)],
+            **{
+                k: [rng.choice([None, 0.1, 0.2, rng.random()]) for _ in range(n)]
+                for k in KPI_COLUMNS
+            },
+        }
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ScoringEngine.score_table(table)
+    return table
+
+
+def test_members_score_as_in_the_frozen_universe():
+    table = _scored_table()
+    snapshot = ScoreSnapshot.freeze(table)
+
+    for view in table:
+        assert snapshot.score_one(view.sector, view.kpis) == pytest.approx(view.score)
+    np.testing.assert_allclose(snapshot.score_many(table.frame), table.frame["score"])
+
+
+def test_scoring_new_tickers_does_not_mutate_the_universe():
+    table = _scored_table()
+    before = table.frame.copy()
+    snapshot = ScoreSnapshot.freeze(table)
+
+    new = KPIs(roic=5.0, roe=5.0, fcf_yield=5.0, revenue_cagr=5.0, debt_to_equity=-1.0)
+    score = snapshot.score_one("Tech", new)
+    assert score == pytest.approx(1.0)
+    assert snapshot.score_one("Unknown sector", new) == 0.0
+    assert snapshot.score_one("Tech", {"roic": float("inf")}) == 0.0
+
+    table.frame.loc[0, "roic"] = 123.0  # later edits do not leak in
+    assert snapshot.score_one("Tech", new) == score
+    mapping = MappingProxyType({k: getattr(new, k) for k in KPI_COLUMNS})
+    assert snapshot.score_one("Tech", mapping) == score
+    pd.testing.assert_frame_equal(table.frame.drop(index=0), before.drop(index=0))
+
+
+def test_score_many_matches_score_one():
+    snapshot = ScoreSnapshot.freeze(_scored_table())
+    frame = pd.DataFrame(
+        {
+            "sector": ["Tech", "Energy", None, "Gas"],
+            "roic": [0.15, 0.5, None, 0.3],
+            "roe": [0.2, np.nan, 0.1, 0.3],
+            "debt_to_equity": [0.05, 0.9, 0.2, 0.1],
+        }
+    )
+
+    got = snapshot.score_many(frame)
+
+    for i, row in frame.iterrows():
+        kpis = {k: row[k] for k in ["roic", "roe", "debt_to_equity"]}
+        assert got[i] == pytest.approx(snapshot.score_one(row["sector"], kpis))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    table = _scored_table()
+    snapshot = ScoreSnapshot.freeze(table, weights={"roic": 0.5, "roe": 0.5})
+    path = tmp_path / "snapshot.json"
+    snapshot.save(str(path))
+
+    loaded = ScoreSnapshot.load(str(path))
+
+    assert loaded.weights == {"roic": 0.5, "roe": 0.5}
+    assert loaded.created == snapshot.created
+    np.testing.assert_allclose(
+        loaded.score_many(table.frame), snapshot.score_many(table.frame)
+    )
@@ -0,0 +1,79 @@
+from collections import defaultdict
+import math
+import random
+
+from scipy.stats import percentileofscore
+
+from src.models.kpis import KPIs
+from src.models.stock import Stock
+from src.score_engine import ScoringEngine
+
+
+def reference_scores(stocks):
+    """The original loop-based scoring, kept here as an oracle."""
+    scores = {id(s): 0.0 for s in stocks}
+    grouped = defaultdict(list)
+    for s in stocks:
+        grouped[s.sector].append(s)
+
+    def ok(v):
+        return v is not None and isinstance(v, (int, float)) and math.isfinite(v)
+
+    for kpi, weight in ScoringEngine.KPI_WEIGHTS.items():
+        for sector_stocks in grouped.values():
+            values = [getattr(s.kpis, kpi) for s in sector_stocks]
+            values = [v for v in values if ok(v)]
+            if not values:
+                continue
+            for s in sector_stocks:
+                value = getattr(s.kpis, kpi)
+                if not ok(value):
+                    continue
+                pct = percentileofscore(values, value) / 100
+                if kpi in ScoringEngine.INVERSE_KPIS:
+                    pct = 1 - pct
+                scores[id(s)] += pct * weight
+    return [scores[id(s)] for s in stocks]
+
+
+def random_value(rng):
+    roll = rng.random()
+    if roll < 0.1:
+        return None
+    if roll < 0.15:
+        return float("nan")
+    if roll < 0.18:
+        return float("inf")
+    # Few distinct values so ties are common
+    return rng.choice([-0.2, 0.0, 0.05, 0.1, 0.1, 0.3, 1.5, rng.random()])
+
+
+def test_vectorized_matches_percentileofscore_semantics():
+    rng = random.Random(42)
+    sectors = ["Tech", "Energy", "Health", None]
+    stocks = [
+        Stock(
+            ticker=f"T{i}",
+            sector=rng.choice(sectors),
+            kpis=KPIs(*(random_value(rng) for _ in range(5))),
+        )
+        for i in range(300)
+    ]
+
+    expected = reference_scores(stocks)
+    ScoringEngine.score(stocks)
+
+    for s, e in zip(stocks, expected):
+        assert math.isclose(s.score, e, rel_tol=1e-12, abs_tol=1e-12)
+
+
+def test_percentile_matrix_flips_inverse_kpis():
+    stocks = [
+        Stock(ticker="A", sector="S", kpis=KPIs(1, 1, 1, 1, 1)),
+        Stock(ticker="B", sector="S", kpis=KPIs(2, 2, 2, 2, 2)),
+    ]
+    pct = ScoringEngine.percentile_matrix(
+        ScoringEngine.kpi_matrix(stocks), [s.sector for s in stocks]
+    )
+    assert pct["roic"].tolist() == [0.5, 1.0]
+    assert pct["debt_to_equity"].tolist() == [0.5, 0.0]
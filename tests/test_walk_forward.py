@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+
+from src.data_source import DataSource
+from src.kpi_calculator import KPICalculator
+from src.models.financials import Financials
+from src.research_tool import ResearchTool
+from src.walk_forward import WalkForward
+
+PERIODS = pd.to_datetime(["2022-12-31", "2021-12-31", "2020-12-31", "2019-12-31"])
+
+
+def _fin(net_income, sector="Tech", info=None):
+    equity = [100.0] * len(PERIODS)
+    return Financials(
+        income=pd.DataFrame(
+            [net_income, [500.0, 400.0, 300.0, 200.0]],
+            index=["Net Income", "Total Revenue"],
+            columns=PERIODS,
+        ),
+        balance=pd.DataFrame(
+            [equity, [20.0] * len(PERIODS)],
+            index=["Stockholders Equity", "Long Term Debt"],
+            columns=PERIODS,
+        ),
+        cashflow=pd.DataFrame(
+            [[30.0, 20.0, 10.0, 5.0]], index=["Free Cash Flow"], columns=PERIODS
+        ),
+        info={
+            "sector": sector,
+            "marketCap": 1000.0,
+            "sharesOutstanding": 10.0,
+            **(info or {}),
+        },
+    )
+
+
+def _universe():
+    # A earns more in 2019/2020, B from 2021 on; C never reports
+    return {
+        "A": _fin([1.0, 2.0, 30.0, 30.0]),
+        "B": _fin([40.0, 40.0, 3.0, 3.0]),
+        "C": Financials(pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), {}),
+    }
+
+
+def _prices(tickers=("A", "B", "C")):
+    dates = pd.bdate_range("2020-06-01", "2023-12-29")
+    growth = {"A": 0.001, "B": -0.0005, "C": 0.002}
+    return pd.DataFrame(
+        {t: 100.0 * (1 + growth[t]) ** np.arange(len(dates)) for t in tickers},
+        index=dates,
+    )
+
+
+def test_as_of_respects_reporting_lag():
+    panel = WalkForward.statement_panel(_universe())
+
+    early = WalkForward.as_of(panel, "2021-03-15", lag_days=90)
+    later = WalkForward.as_of(panel, "2021-04-01", lag_days=90)
+
+    assert early["period"].max() == pd.Timestamp("2019-12-31")
+    latest = later[later["position"] == 0]
+    assert set(latest["period"]) == {pd.Timestamp("2020-12-31")}
+
+
+def test_latest_snapshot_matches_batch_kpis():
+    fins = _universe()
+    panel = WalkForward.statement_panel(fins)
+
+    kpis = KPICalculator.from_long(
+        WalkForward.as_of(panel, "2030-01-01"), KPICalculator.info_frame(fins)
+    )
+
+    pd.testing.assert_frame_equal(kpis, KPICalculator.batch(fins))
+
+
+def test_holdings_follow_published_statements():
+    result = WalkForward.run(
+        _universe(), _prices(), "2021-01-01", "2024-01-01", rebalance="Q", top_n=1
+    )
+
+    held = result.weights.idxmax(axis=1)
+    assert (result.weights.sum(axis=1) == 1.0).all()
+    # FY2021 statements (B ahead) become usable from the Q2 2022 rebalance
+    assert set(held[:"2022-03-31"]) == {"A"}
+    assert set(held["2022-04-01":]) == {"B"}
+    assert "C" not in set(held)
+
+    returns = _prices().pct_change()
+    daily = result.returns["walk_forward"]
+    np.testing.assert_allclose(
+        daily["2021-06-01":"2021-06-30"], returns.loc["2021-06-01":"2021-06-30", "A"]
+    )
+
+
+def test_later_statements_do_not_change_earlier_decisions():
+    base = WalkForward.run(_universe(), _prices(), "2021-01-01", "2024-01-01", top_n=1)
+    fins = _universe()
+    fins["B"].income.loc["Net Income", PERIODS[0]] = -1000.0
+    changed = WalkForward.run(fins, _prices(), "2021-01-01", "2024-01-01", top_n=1)
+
+    before = slice(None, "2023-03-31")
+    pd.testing.assert_frame_equal(base.weights[before], changed.weights[before])
+    pd.testing.assert_series_equal(
+        base.returns["walk_forward"][before], changed.returns["walk_forward"][before]
+    )
+    # FY2022 is published for the Q2 2023 rebalance and then matters
+    assert changed.weights.loc["2023-04-03", "A"] == 1.0
+    assert base.weights.loc["2023-04-03", "B"] == 1.0
+
+
+def test_market_caps_do_not_see_prices_after_end():
+    # Identical statements: only fcf_yield separates A and B, and B's lower
+    # close gives it the higher yield
+    def universe():
+        return {t: _fin([30.0] * 4) for t in "AB"}
+
+    prices = _prices(("A", "B"))[:"2022-12-30"]
+    consistent = WalkForward.run(universe(), prices, "2021-01-01", top_n=1)
+    # `marketCap` observed after a crash in A that the prices do not reach
+    fins = universe()
+    for t, price in {"A": 1.0, "B": 80.0}.items():
+        fins[t].info.pop("sharesOutstanding")
+        fins[t].info.update(marketCap=10.0 * price, currentPrice=price)
+    later = WalkForward.run(fins, prices, "2021-01-01", top_n=1)
+
+    assert set(consistent.weights.idxmax(axis=1)) == {"B"}
+    pd.testing.assert_series_equal(
+        WalkForward.shares(fins), WalkForward.shares(universe())
+    )
+    pd.testing.assert_frame_equal(consistent.weights, later.weights)
+    # Without a share count or quote there is no market cap to scale
+    fins["A"].info.pop("currentPrice")
+    assert np.isnan(WalkForward.shares(fins)["A"])
+
+
+def test_research_tool_fetches_each_ticker_once():
+    calls = []
+
+    class Source(DataSource):
+        def financials(self, ticker):
+            calls.append(ticker)
+            return _universe()[ticker]
+
+        def prices(self, tickers, start, end):
+            calls.append(tuple(tickers))
+            return _prices()
+
+        def constituents(self, n=None):
+            return ["A", "B", "C"]
+
+    tool = ResearchTool(["A", "B", "C"], source=Source())
+    result = tool.walk_forward("2021-01-01", "2024-01-01", rebalance="M", top_n=1)
+
+    assert calls == ["A", "B", "C", ("A", "B", "C")]
+    assert len(result.weights) == 36
+    assert np.isfinite(result.metrics.loc["walk_forward", "cagr"])
+
+
+def test_research_tool_keeps_statements_older_than_four_periods():
+    periods = pd.date_range("2017-12-31", "2022-12-31", freq="YE")[::-1]
+
+    def fin(net_income):
+        ones = [1.0] * len(periods)
+        return Financials(
+            income=pd.DataFrame(
+                [net_income, [500.0 * x for x in ones]],
+                index=["Net Income", "Total Revenue"],
+                columns=periods,
+            ),
+            balance=pd.DataFrame(
+                [[100.0 * x for x in ones], [20.0 * x for x in ones]],
+                index=["Stockholders Equity", "Long Term Debt"],
+                columns=periods,
+            ),
+            cashflow=pd.DataFrame(
+                [[10.0 * x for x in ones]], index=["Free Cash Flow"], columns=periods
+            ),
+            info={"sector": "Tech", "marketCap": 1000.0, "sharesOutstanding": 10.0},
+        )
+
+    fins = {"A": fin([5.0] * 6), "B": fin([1.0] * 6)}
+    dates = pd.bdate_range("2018-06-01", "2021-12-31")
+    prices = pd.DataFrame(
+        {t: 100.0 * 1.001 ** np.arange(len(dates)) for t in fins}, index=dates
+    )
+
+    class Source(DataSource):
+        def financials(self, ticker):
+            return fins[ticker]
+
+        def prices(self, tickers, start, end):
+            return prices
+
+        def constituents(self, n=None):
+            return list(fins)
+
+    args = ("2018-06-01", "2021-12-31")
+    tool = ResearchTool(list(fins), source=Source())
+    result = tool.walk_forward(*args, rebalance="M", top_n=1)
+    full = WalkForward.run(fins, prices, *args, rebalance="M", top_n=1)
+
+    pd.testing.assert_frame_equal(result.weights, full.weights)
+    assert result.returns.first_valid_index() < pd.Timestamp("2019-01-01")
@@ -0,0 +1,152 @@
+import math
+import random
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest_engine import Backtester
+from src.models.kpi_table import KPI_COLUMNS, KPITable
+from src.research_tool import ResearchTool
+from src.score_engine import ScoringEngine
+from src.weight_sweep import KPIS, WeightSweep
+
+
+def _table(n=40, seed=2):
+    rng = random.Random(seed)
+    return KPITable.from_columns(
+        {
+            "ticker": [f"T{i}" for i in range(n)],
+            "name": [f"T{i}" for i in range(n)],
+            "sector": [rng.choice(["Tech", "Energy"]) for _ in range(n)],
+            **{
+                k: [rng.choice([None, 0.1, rng.random()]) for _ in range(n)]
+                for k in KPI_COLUMNS
+            },
+        }
+    )
+
+
+def _returns(tickers, days=300, seed=4):
+    rng = np.random.default_rng(seed)
+    data = rng.normal(0.0005, 0.01, (days, len(tickers)))
+    data[:20, 0] = np.nan  # late listing
+    frame = pd.DataFrame(
+        data, index=pd.bdate_range("2020-01-01", periods=days), columns=tickers
+    )
+    frame[tickers[1]] = np.nan  # no data at all
+    return frame
+
+
+def test_sweep_scores_match_scoring_engine_per_config(monkeypatch):
+    table = _table()
+    configs = WeightSweep.random_configs(5, seed=1)
+
+    scores = WeightSweep.scores(table, configs)
+
+    for i, row in configs.iterrows():
+        monkeypatch.setattr(ScoringEngine, "KPI_WEIGHTS", row.to_dict())
+        copy = KPITable(table.frame.copy())
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            ScoringEngine.score_table(copy)
+        np.testing.assert_allclose(scores[i].to_numpy(), copy.frame["score"])
+
+
+def test_config_builders():
+    grid = WeightSweep.grid_configs(steps=4)
+    assert len(grid) == math.comb(4 + len(KPIS) - 1, len(KPIS) - 1)
+    np.testing.assert_allclose(grid.sum(axis=1), 1.0)
+
+    frame = WeightSweep.configs_frame([{"roic": 1.0}, {"roe": 0.5, "roic": 0.5}])
+    assert list(frame.columns) == KPIS
+    assert frame.loc[0].tolist() == [1.0, 0.0, 0.0, 0.0, 0.0]
+
+
+def test_portfolio_metrics_match_single_series_helpers():
+    rng = np.random.default_rng(0)
+    r = pd.Series(rng.normal(0.001, 0.02, 250))
+    frame = pd.DataFrame({"a": r, "b": r.where(r.index >= 10)})
+
+    metrics = Backtester.portfolio_metrics(frame)
+
+    for col in frame:
+        series = frame[col].dropna()
+        row = metrics.loc[col]
+        cagr = (1 + series).prod() ** (252 / len(series)) - 1
+        assert row["cagr"] == pytest.approx(cagr)
+        assert row["volatility"] == pytest.approx(
+            Backtester.annualized_volatility(series)
+        )
+        assert row["sharpe"] == pytest.approx(Backtester.sharpe_ratio(series))
+        assert row["max_drawdown"] == pytest.approx(Backtester.max_drawdown(series))
+
+
+def test_ranked_backtest_matches_backtester_for_each_config(monkeypatch):
+    table = _table()
+    returns = _returns(list(table.frame["ticker"]))
+    configs = WeightSweep.random_configs(4, seed=3)
+
+    ranked = WeightSweep.rank(table, configs, returns=returns, top_n=10)
+
+    monkeypatch.setattr(
+        Backtester, "returns_frame", lambda tickers, *a, **k: returns.copy()
+    )
+    for i, row in configs.iterrows():
+        monkeypatch.setattr(ScoringEngine, "KPI_WEIGHTS", row.to_dict())
+        copy = KPITable(table.frame.copy())
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            ScoringEngine.score_table(copy)
+            result = Backtester.backtest(copy.ranked_views(), index="T2")
+        assert ranked.loc[i, "cagr"] == pytest.approx(result["portfolio_cagr"])
+    assert ranked["cagr"].is_monotonic_decreasing
+
+
+def test_research_tool_sweep_loads_only_selected_tickers():
+    table = _table()
+    returns = _returns(list(table.frame["ticker"]))
+    requested = []
+
+    class Source:
+        def prices(self, tickers, start, end):
+            requested.extend(tickers)
+            return (1 + returns.fillna(0.0)).cumprod()[tickers]
+
+    tool = ResearchTool([], source=Source())
+    tool.table = table
+    configs = WeightSweep.random_configs(3, seed=5)
+    ranked = tool.sweep(configs, backtest=True, top_n=5)
+
+    assert len(ranked) == 3
+    assert set(requested) == set().union(*ranked["top"])
+    assert len(requested) < len(table)
+
+
+def test_research_tool_sweep_scores_once_and_accepts_generators(monkeypatch):
+    table = _table()
+    returns = _returns(list(table.frame["ticker"]))
+
+    class Source:
+        def prices(self, tickers, start, end):
+            return (1 + returns.fillna(0.0)).cumprod()[tickers]
+
+    calls = []
+    original = WeightSweep.percentiles
+    monkeypatch.setattr(
+        WeightSweep,
+        "percentiles",
+        staticmethod(lambda t: calls.append(1) or original(t)),
+    )
+    tool = ResearchTool([], source=Source())
+    tool.table = table
+    configs = WeightSweep.random_configs(3, seed=5)
+
+    ranked = tool.sweep(
+        (row.to_dict() for _, row in configs.iterrows()), backtest=True, top_n=5
+    )
+
+    assert len(calls) == 1
+    expected = tool.sweep(configs, backtest=True, top_n=5)
+    pd.testing.assert_frame_equal(ranked, expected)
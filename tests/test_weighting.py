@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+from src.covariance import CovarianceEstimator
+from src.data_source import DataSource
+from src.research_tool import ResearchTool
+from src.walk_forward import WalkForward
+from src.weighting import Weighting
+from tests.test_walk_forward import _prices, _universe
+
+COV = pd.DataFrame(
+    [[0.04, 0.006, 0.0], [0.006, 0.01, 0.002], [0.0, 0.002, 0.0225]],
+    index=list("ABC"),
+    columns=list("ABC"),
+)
+
+
+def test_equal_and_score_weights():
+    scores = pd.Series({"A": 0.6, "B": 0.3, "C": -0.1})
+
+    equal = Weighting.weights("equal", list("ABC"))
+    score = Weighting.weights("score", list("ABC"), scores)
+
+    assert equal.tolist() == pytest.approx([1 / 3] * 3)
+    assert score.tolist() == pytest.approx([2 / 3, 1 / 3, 0.0])
+    zero = Weighting.weights("score", list("AB"), pd.Series({"A": 0.0, "B": 0.0}))
+    assert zero.tolist() == [0.5, 0.5]
+
+
+def test_inverse_vol_weights():
+    w = Weighting.weights("inverse_vol", list("ABC"), cov=COV)
+
+    inv = np.array([1 / 0.2, 1 / 0.1, 1 / 0.15])
+    np.testing.assert_allclose(w, inv / inv.sum())
+
+
+def test_min_variance_is_long_only_and_minimal():
+    w = Weighting.weights("min_variance", list("ABC"), cov=COV).to_numpy()
+
+    assert (w >= 0).all() and w.sum() == pytest.approx(1.0)
+    variance = w @ COV.to_numpy() @ w
+    rng = np.random.default_rng(0)
+    for other in rng.dirichlet(np.ones(3), 500):
+        assert variance <= other @ COV.to_numpy() @ other + 1e-12
+
+    # A hedge asset with negative unconstrained weight is dropped
+    cov = np.array([[0.01, 0.012], [0.012, 0.04]])
+    assert Weighting.min_variance(cov).tolist() == pytest.approx([1.0, 0.0])
+
+
+def test_min_variance_readmits_names_dropped_along_the_way():
+    # Vols 50/50/20%, corr(A,B) = -0.1, corr(A,C) = 0.2, corr(B,C) = 0.8.
+    # Unconstrained, A and B are short; the long-only optimum holds A and C:
+    # w_AC ∝ [0.04 - 0.02, 0.25 - 0.02] = [0.08, 0.92]
+    vol = np.array([0.5, 0.5, 0.2])
+    corr = np.array([[1.0, -0.1, 0.2], [-0.1, 1.0, 0.8], [0.2, 0.8, 1.0]])
+    cov = corr * np.outer(vol, vol)
+
+    w = Weighting.min_variance(cov)
+
+    np.testing.assert_allclose(w, [0.08, 0.0, 0.92], atol=1e-12)
+    # KKT: B's marginal variance is above that of the held names
+    grad = cov @ w
+    assert grad[1] > grad[0] == pytest.approx(grad[2])
+
+
+def test_min_variance_matches_support_enumeration():
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        a = rng.normal(size=(6, 8))
+        cov = a @ a.T / 8 + np.diag(rng.uniform(0, 0.5, 6))
+        best = np.inf
+        for mask in range(1, 2**6):
+            held = [i for i in range(6) if mask >> i & 1]
+            x = np.linalg.solve(cov[np.ix_(held, held)], np.ones(len(held)))
+            if (x >= 0).all():
+                w = np.zeros(6)
+                w[held] = x / x.sum()
+                best = min(best, w @ cov @ w)
+
+        w = Weighting.min_variance(cov)
+
+        assert (w >= 0).all() and w.sum() == pytest.approx(1.0)
+        assert w @ cov @ w == pytest.approx(best, rel=1e-10)
+
+
+def test_risk_parity_equalizes_risk_contributions():
+    w = Weighting.weights("risk_parity", list("ABC"), cov=COV).to_numpy()
+
+    contributions = w * (COV.to_numpy() @ w)
+    np.testing.assert_allclose(contributions, contributions.mean(), rtol=1e-8)
+
+
+def test_covariance_schemes_skip_tickers_without_history():
+    cov = COV.copy()
+    cov.loc["C"] = np.nan
+    cov["C"] = np.nan
+
+    w = Weighting.weights("inverse_vol", list("ABC"), cov=cov)
+
+    assert w["C"] == 0.0 and w.sum() == pytest.approx(1.0)
+    nothing = cov * np.nan
+    assert Weighting.weights("risk_parity", list("AB"), cov=nothing).tolist() == [
+        0.5,
+        0.5,
+    ]
+    with pytest.raises(ValueError):
+        Weighting.weights("max_sharpe", list("AB"))
+
+
+def _noisy_prices():
+    prices = _prices()
+    vols = {"A": 0.02, "B": 0.01, "C": 0.015}
+    rng = np.random.default_rng(3)
+    noise = rng.normal(0, [vols[t] for t in prices.columns], prices.shape)
+    return prices * np.exp(np.cumsum(noise, axis=0))
+
+
+def test_walk_forward_sweeps_schemes_with_one_covariance_per_rebalance(monkeypatch):
+    calls = []
+    original = CovarianceEstimator._estimate
+
+    def counting(self, pos, method):
+        calls.append((pos, method))
+        return original(self, pos, method)
+
+    monkeypatch.setattr(CovarianceEstimator, "_estimate", counting)
+    schemes = ["equal", "inverse_vol", "min_variance", "risk_parity"]
+
+    result = WalkForward.run(
+        _universe(), _noisy_prices(), "2021-06-01", "2024-01-01", weighting=schemes
+    )
+
+    rebalances = len(result.turnover)
+    assert len(calls) == rebalances == len(set(calls))
+    assert list(result.returns.columns) == schemes
+    weights = result.weights
+    np.testing.assert_allclose(weights.T.groupby(level=0).sum().T, 1.0)
+    # A and B are held; equal weights differ from the risk-based ones
+    last = weights.iloc[-1]
+    assert last["equal"][["A", "B"]].tolist() == [0.5, 0.5]
+    assert last["inverse_vol"]["B"] > last["inverse_vol"]["A"]
+
+    single = WalkForward.run(
+        _universe(),
+        _noisy_prices(),
+        "2021-06-01",
+        "2024-01-01",
+        weighting="inverse_vol",
+    )
+    pd.testing.assert_series_equal(
+        single.returns["walk_forward"],
+        result.returns["inverse_vol"],
+        check_names=False,
+    )
+
+
+def test_research_tool_loads_history_for_covariance_schemes():
+    requests = []
+
+    class Source(DataSource):
+        def financials(self, ticker):
+            return _universe()[ticker]
+
+        def prices(self, tickers, start, end):
+            requests.append((start, end))
+            return _noisy_prices()
+
+        def constituents(self, n=None):
+            return ["A", "B", "C"]
+
+    tool = ResearchTool(["A", "B", "C"], source=Source())
+    tool.walk_forward("2022-01-03", "2023-01-01", weighting="equal")
+    result = tool.walk_forward(
+        "2022-01-03", "2023-01-01", weighting=["equal", "risk_parity"], lookback=100
+    )
+    tool.walk_forward("2022-01-03", "2023-01-01", weighting="min_variance")
+
+    assert requests[0] == ("2022-01-03", "2023-01-01")
+    assert result.returns.index[0] == pd.Timestamp("2022-01-03")
+    assert list(result.metrics.index) == ["equal", "risk_parity"]
+    # Enough trading days even with exchange holidays on business days
+    sessions = pd.offsets.CustomBusinessDay(calendar=USFederalHolidayCalendar())
+    for (start, _), lookback in zip(requests[1:], [100, 252]):
+        days = pd.date_range(start, "2022-01-02", freq=sessions)
+        assert len(days) >= lookback
+    with pytest.raises(ValueError):
+        tool.walk_forward(weighting=["equal", "equal"])